@@ -0,0 +1,64 @@
+from atomc.lexer.lexer import scan, lexeme_token
+from atomc.lexer.symbol_pool import SymbolPool
+
+
+# index of the first token whose lexeme ends at or after offset, the tokens being sorted by offset
+def first_token_ending_after(tokens: list, offset: int):
+    low, high = 0, len(tokens)
+    while low < high:
+        middle = (low + high) // 2
+        if tokens[middle].end < offset:
+            low = middle + 1
+        else:
+            high = middle
+
+    return low
+
+
+# lexes the text again after an edit, in which deleted chars were removed at offset and inserted was put in their place
+# tokens are the tokens of old_text, as returned by tokenize() (they must know the span of their lexeme)
+# pool should be the symbol pool used for the old tokens, so the new tokens get consistent symbol ids
+# returns the tokens of the new text and the new text
+#
+# only a small part of the text is lexed again:
+# - the lexer restarts right after the last token which ends before the edit; the automaton was in state 0 there, and
+#   nothing it looked at to get there was changed (a token is generated when the char after its lexeme is seen)
+# - it stops at the first new token after the edit which starts at the same place as an old token did; from there on
+#   the text is the same as before, so the remaining tokens are the old ones, with their offsets and lines shifted
+# the remaining old tokens are shifted copies, the tokens given are left as they are, so they still are the tokens of
+# old_text
+def relex(tokens: list, old_text: str, offset: int, deleted: int, inserted: str, pool: SymbolPool = None):
+    if pool is None:
+        pool = SymbolPool()
+
+    new_text = old_text[:offset] + inserted + old_text[offset + deleted:]
+    shift = len(inserted) - deleted
+    edit_end = offset + len(inserted)  # in the new text
+
+    index = first_token_ending_after(tokens, offset)
+    if index == 0:
+        restart, line = 0, 1
+    else:
+        restart, line = tokens[index - 1].end, tokens[index - 1].line
+
+    relexed = []
+    old_index = index
+    for code, start, end, line in scan(new_text, restart, line):
+        if start >= edit_end:
+            # look for an old token which started at the same place
+            while old_index < len(tokens) and tokens[old_index].start < start - shift:
+                old_index += 1
+
+            if old_index < len(tokens) and tokens[old_index].start == start - shift:
+                break
+
+        relexed.append(lexeme_token(code, new_text, start, end, line, pool))
+
+    else:
+        # the END token was reached before the new tokens lined up with the old ones
+        return tokens[:index] + relexed, new_text
+
+    line_shift = line - tokens[old_index].line
+    remaining = [token.shifted(new_text, shift, line_shift) for token in tokens[old_index:]]
+
+    return tokens[:index] + relexed + remaining, new_text
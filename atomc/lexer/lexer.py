@@ -1,6 +1,20 @@
+import contextlib
+import io
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
 from atomc.lexer.lexical_error_exception import *
+from atomc.lexer.regex_lexer import scan_regex
+from atomc.lexer.source import read_source
+from atomc.lexer.symbol_pool import SymbolPool
 from atomc.lexer.token import Code
 from atomc.lexer.token import Token
+from atomc.lexer.token_stream import TokenStream, codes_by_value
+
+# bump when the tokens generated for a source change, so the tokens cached by an older lexer are not used
+lexer_version = 1
 
 
 # RULE OF THUMB:
@@ -312,138 +326,411 @@ def state_46(char: str):
 
 
 def state_47(char: str):
-    if char == '\n' or char == '\r' or char == '\0':
+    # eof also ends the comment, otherwise a comment on the last line would be read forever
+    if char == '\n' or char == '\r' or char == '\0' or char == '':
         return None, 0, False
     else:
         return Code.LINECOMMENT, 47, True
 
 
+# the state functions, indexed by state number
+state_functions = [
+    state_0,
+    state_1,
+    state_2,
+    state_3,
+    state_4,
+    state_5,
+    state_6,
+    state_7,
+    state_8,
+    state_9,
+    state_10,
+    state_11,
+    state_12,
+    state_13,
+    state_14,
+    state_15,
+    state_16,
+    state_17,
+    state_18,
+    state_19,
+    state_20,
+    state_21,
+    state_22,
+    state_23,
+    state_24,
+    state_25,
+    state_26,
+    state_27,
+    state_28,
+    state_29,
+    state_30,
+    state_31,
+    state_32,
+    state_33,
+    state_34,
+    state_35,
+    state_36,
+    state_37,
+    state_38,
+    state_39,
+    state_40,
+    state_41,
+    state_42,
+    state_43,
+    state_44,
+    state_45,
+    state_46,
+    state_47
+]
+
+
 def find_next_state(state: int, char: str):
-    state_dict = {
-        0: state_0,
-        1: state_1,
-        2: state_2,
-        3: state_3,
-        4: state_4,
-        5: state_5,
-        6: state_6,
-        7: state_7,
-        8: state_8,
-        9: state_9,
-        10: state_10,
-        11: state_11,
-        12: state_12,
-        13: state_13,
-        14: state_14,
-        15: state_15,
-        16: state_16,
-        17: state_17,
-        18: state_18,
-        19: state_19,
-        20: state_20,
-        21: state_21,
-        22: state_22,
-        23: state_23,
-        24: state_24,
-        25: state_25,
-        26: state_26,
-        27: state_27,
-        28: state_28,
-        29: state_29,
-        30: state_30,
-        31: state_31,
-        32: state_32,
-        33: state_33,
-        34: state_34,
-        35: state_35,
-        36: state_36,
-        37: state_37,
-        38: state_38,
-        39: state_39,
-        40: state_40,
-        41: state_41,
-        42: state_42,
-        43: state_43,
-        44: state_44,
-        45: state_45,
-        46: state_46,
-        47: state_47
-    }
-
-    new_token_code, new_state, consume = state_dict[state](char)
+    new_token_code, new_state, consume = state_functions[state](char)
     return new_token_code, new_state, consume
 
 
-def generate_new_token(code: Code, buf: str, line: int):
-    keywords = {
-        "void": Code.VOID,
-        "int": Code.INT,
-        "char": Code.CHAR,
-        "double": Code.DOUBLE,
-        "struct": Code.STRUCT,
-        "if": Code.IF,
-        "else": Code.ELSE,
-        "for": Code.FOR,
-        "while": Code.WHILE,
-        "break": Code.BREAK,
-        "return": Code.RETURN
-    }
-
-    if code == Code.ID:
-        if buf in keywords:
-            return Token(keywords[buf], None, line)
-        else:
-            return Token(code, buf, line)
-    elif code == Code.CT_INT:
-        return Token(code, int(buf), line)
-    elif code == Code.CT_REAL:
-        return Token(code, float(buf), line)
-    elif code == Code.CT_CHAR:
-        return Token(code, buf, line)
-    elif code == Code.CT_STRING:
-        return Token(code, buf, line)
-    else:
-        return Token(code, None, line)
+# RUN SCANNERS:
+# some states loop on themselves for whole runs of chars: whitespace (0), identifiers (1), digits (3, 5, 8), the inside
+# of strings (14) and comments (47)
+# once the automaton loops in one of them, the rest of the run is skipped in one step by a precompiled regex, instead
+# of going through the table once per char; a run stops at the first char with another transition (non-ascii letters
+# and digits included, those are left to the state functions)
+# the scanner is only tried when the state loops on itself, so one-char identifiers / numbers never pay for it; the
+# same goes for a single space between tokens, so in state 0 only the newlines start a run (e.g. of indentation)
+run_scanners = {
+    0: re.compile(r'[ \t\r\n]*').match,
+    1: re.compile(r'[A-Za-z0-9_]*').match,
+    3: re.compile(r'[0-9]*').match,
+    5: re.compile(r'[0-9]*').match,
+    8: re.compile(r'[0-9]*').match,
+    14: re.compile(r'[^"]*').match,
+    47: re.compile(r'[^\n\r\0]*').match,
+}
+
+
+# TRANSITION TABLES:
+# the automaton above is compiled once, at import time, into a table indexed by state and character class
+# every ascii character and eof are run through every state function; characters which behave the same way in all
+# the states share a character class
+# transitions which neither consume the char nor generate a token are followed right away, so every table entry
+# either consumes the char or generates a token (e.g. state 1 generates ID directly on a space, without going through
+# state 2)
+# entries are (type of new token: Code), (next state: int), (consume char?: boolean), same as find_next_state(),
+# plus the run scanner to apply after the transition (or None), or None for lexical errors and for characters outside
+# the table, which are left to the state functions
+
+# follows the transitions of the automaton until the char is consumed or a token is generated
+def compile_transition(state: int, char: str):
+    new_token_code, new_state, consume = find_next_state(state, char)
+    while new_token_code is None and not consume:
+        new_token_code, new_state, consume = find_next_state(new_state, char)
+
+    return new_token_code, new_state, consume
+
+
+def build_transition_table():
+    classes = {}
+    char_classes = {}
+
+    for char in [chr(c) for c in range(128)] + ['']:
+        column = []
+        for state in range(len(state_functions)):
+            try:
+                column.append(compile_transition(state, char))
+            except LexicalErrorException:
+                column.append(None)
+
+        char_classes[char] = classes.setdefault(tuple(column), len(classes))
+        if char == ' ':
+            space_column = tuple(column)
+
+    # the last class holds the characters outside the table
+    table = [[None] * (len(classes) + 1) for _ in state_functions]
+    for column, char_class in classes.items():
+        for state, transition in enumerate(column):
+            if transition is not None:
+                run = None
+                if transition[1] == state and transition[2] and state in run_scanners and \
+                        (state != 0 or column != space_column):
+                    run = run_scanners[state]
+
+                transition = transition + (run,)
+
+            table[state][char_class] = transition
+
+    return char_classes, len(classes), table
+
 
+char_classes, other_char_class, transition_table = build_transition_table()
 
-def tokenize(file):
+
+# runs the automaton over the source text, generating one (code, start, end, line) tuple per token
+# start and end are the offsets of the lexeme in the text
+# the code of keywords is still ID, they are told apart by SymbolPool.intern_lexeme()
+# the scan can also start in the middle of the text, at an offset where the automaton is in state 0 (e.g. right after
+# a token), if the line at that offset is known
+# lexical errors are printed and raised, unless an errors list is given: then they are appended to it, with the line
+# and column where they were found, and the scan goes on
+def scan(text: str, start: int = 0, line: int = 1, errors: list = None):
     state: int = 0
-    line: int = 1
-    buf: str = ''
-    tokens: list = []
+    # start: offset of the first char of the current lexeme
 
-    char = file.read(1)
+    # local names are faster to look up inside the loop
+    table = transition_table
+    char_class = char_classes.get
+    length = len(text)
 
+    position = start
     while True:
-        try:
-            # compute next state
-            new_token_type, state, consume = find_next_state(state, char)
+        # after the last char of the source, the automaton keeps reading eof (read() == "")
+        char = text[position] if position < length else ''
+
+        # non-consuming transitions see the same char again
+        while True:
+            # compute next state, through the transition table
+            transition = table[state][char_class(char, other_char_class)]
+            if transition is None:
+                # lexical error or char outside the table, the state functions will raise / decide
+                try:
+                    transition = compile_transition(state, char) + (None,)
+
+                except LexicalErrorException as exc:
+                    if errors is None:
+                        print(exc.__str__(), "while parsing at line", line)
+                        raise LexicalErrorException()
+
+                    exc.line = line
+                    exc.column = position - text.rfind('\n', 0, position)
+                    errors.append(exc)
+
+                    # resynchronize in state 0: a char which cannot start a token is skipped, a token which cannot
+                    # go on is dropped and the lexer starts again at the char which broke it
+                    if state == 0:
+                        start = position + 1
+                        run = None
+                        break
 
-            if consume:
-                buf = buf + char
+                    state = 0
+                    start = position
+                    continue
+
+            new_token_type, state, consume, run = transition
 
             # generate token if necessary
             if new_token_type is not None:
-                if new_token_type == Code.SPACE or new_token_type == Code.LINECOMMENT:
-                    buf = ''
+                if new_token_type is Code.SPACE or new_token_type is Code.LINECOMMENT:
+                    start = position + 1
                     if char == '\n':
                         line = line + 1
 
-                else:
-                    new_token = generate_new_token(new_token_type, buf, line)
-                    tokens.append(new_token)
-                    buf = ''
+                elif new_token_type is Code.END:
+                    # the END token has an empty lexeme, right after the source (even after an unfinished comment)
+                    # end the parsing when it is generated
+                    yield new_token_type, length, length + 1, line
+                    return
 
-                    # end the parsing if the END token was generated
-                    if new_token_type == Code.END:
-                        break
+                else:
+                    end = position + 1 if consume else position
+                    yield new_token_type, start, end, line
+                    start = end
 
             # consume character
             if consume:
-                char = file.read(1)
+                break
+
+        position += 1
+
+        # skip the rest of the run, if the state just looped on itself
+        if run is not None:
+            end = run(text, position).end()
+            if end != position:
+                # whitespace and comments are not part of any lexeme
+                if state == 0:
+                    line += text.count('\n', position, end)
+                    start = end
+                elif state == 47:
+                    start = end
+
+                position = end
+
+
+# the lexer backends, which can be selected in iter_tokens() / tokenize() / tokenize_packed(); all give the same tokens
+# - "automaton": the automaton above, through scan()
+# - "regex": one compiled regex for all the token patterns, through scan_regex()
+# the regex backend only handles ascii sources, the other ones (and the recovering mode) still go through the automaton
+backends = ("automaton", "regex")
+
+# the backends of tokenize_packed(), which can also build the whole TokenStream at once:
+# - "numpy": a vectorized classification of the chars, which leaves only the ambiguous spots to the automaton, and
+#   fills the columns of the TokenStream from whole arrays (tokenize_numpy()); for ascii sources too, it needs numpy,
+#   which is imported only when this backend is used
+packed_backends = backends + ("numpy",)
+
+
+# generates the tokens one at a time, as the lexer reaches them, without keeping a list of all of them
+# the source can be a path, a file object, or the source code itself as str / bytes (see read_source())
+# the whole source is read at once and walked through by offsets
+def iter_tokens(source, pool: SymbolPool = None, errors: list = None, backend: str = "automaton"):
+    if backend not in backends:
+        raise ValueError("unknown lexer backend: " + str(backend))
+
+    text: str = read_source(source)
+    if pool is None:
+        pool = SymbolPool()
+
+    if backend == "regex" and errors is None and text.isascii():
+        scanned = scan_regex(text)
+    else:
+        scanned = scan(text, errors=errors)
+
+    for code, start, end, line in scanned:
+        yield lexeme_token(code, text, start, end, line, pool)
+
+
+# builds the token made of text[start:end]
+# the value of the token is computed only when accessed, from the span of its lexeme, except for identifiers and
+# strings, which are interned in the symbol pool
+def lexeme_token(code: Code, text: str, start: int, end: int, line: int, pool: SymbolPool):
+    if code is Code.ID or code is Code.CT_STRING:
+        code, symbol = pool.intern_lexeme(code, text[start:end])
+
+        token = Token.from_lexeme(code, text, start, end, line)
+        if symbol is not None:
+            token.symbol = symbol
+            token.value = pool.texts[symbol]
+
+        return token
+
+    return Token.from_lexeme(code, text, start, end, line)
+
+
+def tokenize(source, pool: SymbolPool = None, backend: str = "automaton"):
+    return list(iter_tokens(source, pool, backend=backend))
+
+
+# same as tokenize(), but the lexer does not stop at the first lexical error: it records every error and goes on
+# returns the tokens and the list of errors (LexicalErrorException objects, with their line and column set)
+def tokenize_recovering(source, pool: SymbolPool = None):
+    errors = []
+    tokens = list(iter_tokens(source, pool, errors))
+
+    return tokens, errors
+
+
+# same as tokenize(), but the tokens are packed in a TokenStream instead of a list of Token objects
+def tokenize_packed(source, pool: SymbolPool = None, backend: str = "automaton"):
+    if backend not in packed_backends:
+        raise ValueError("unknown lexer backend: " + str(backend))
+
+    text: str = read_source(source)
+    if pool is None:
+        pool = SymbolPool()
+
+    if backend == "numpy" and text.isascii():
+        from atomc.lexer.numpy_lexer import tokenize_numpy
+        return tokenize_numpy(text, pool)
+
+    tokens = TokenStream(text, pool)
+    scanned = scan_regex(text) if backend == "regex" and text.isascii() else scan(text)
+
+    for code, start, end, line in scanned:
+        if code is Code.ID or code is Code.CT_STRING:
+            code, symbol = pool.intern_lexeme(code, text[start:end])
+            tokens.append(code, None if symbol is None else pool.texts[symbol], line, start, end)
+
+        else:
+            tokens.append_lexeme(code, line, start, end)
+
+    return tokens
+
+
+# PARALLEL LEXING:
+# the source is split in chunks at newlines where the automaton is always back in state 0, so every chunk can be lexed
+# on its own, in a separate process; a newline is such a point unless it is inside a string / char literal or a comment
+# finding the split points only needs the constructs which can hide a newline from the automaton
+split_scanner = re.compile(r'//[^\n\r\0]*|"[^"]*"|\'[^\']\'|(?P<newline>\n)|(?P<quote>["\'])')
+
+# the chunks lexed in parallel are at least this long, smaller sources are not worth sending to other processes
+parallel_chunk_size = 1 << 16
+
+
+# returns the offsets at which text can be split in (at most) count chunks of at least min_size chars
+def find_split_points(text: str, count: int, min_size: int):
+    points = []
+    size = max(len(text) // count, min_size)
+    target = size
+
+    for match in split_scanner.finditer(text):
+        if match.lastgroup == "quote":
+            # a quote which does not start a valid literal: the lexer fails there anyway, so stop splitting
+            break
+
+        if match.lastgroup == "newline" and match.end() >= target:
+            if match.end() + min_size > len(text):
+                break
+
+            points.append(match.end())
+            target = match.end() + size
+
+    return points
+
+
+# lexes one chunk in a worker process
+# returns the codes, spans and lines of its tokens in arrays, which are much cheaper to send back than Token objects,
+# or None if the chunk has a lexical error
+def scan_chunk(chunk: str):
+    codes, starts, ends, lines = array('B'), array('I'), array('I'), array('I')
+
+    try:
+        # the error is reported by the sequential lexer, see tokenize_parallel()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for code, start, end, line in scan(chunk):
+                codes.append(code.value)
+                starts.append(start)
+                ends.append(end)
+                lines.append(line)
+
+    except LexicalErrorException:
+        return None
+
+    return codes, starts, ends, lines
+
+
+# same as tokenize(), but large sources are split in chunks lexed in parallel, by up to workers processes
+# the tokens of the chunks are stitched back in order, with their offsets and lines moved after the previous chunks,
+# the Token objects are built (and the names interned) in this process, so the symbol ids are the same as tokenize()'s
+def tokenize_parallel(source, pool: SymbolPool = None, workers: int = None, min_chunk_size: int = parallel_chunk_size):
+    text: str = read_source(source)
+    if pool is None:
+        pool = SymbolPool()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    points = find_split_points(text, workers, min_chunk_size)
+    if not points:
+        return tokenize(text, pool)
+
+    bounds = [0] + points + [len(text)]
+    with ProcessPoolExecutor(len(bounds) - 1) as executor:
+        results = list(executor.map(scan_chunk, [text[start:end] for start, end in zip(bounds, bounds[1:])]))
+
+    if None in results:
+        # lex the whole source again, so the error is reported (and raised) exactly as tokenize() does it
+        return tokenize(text, pool)
+
+    tokens = []
+    line_offset = 0
+    for chunk_start, (codes, starts, ends, lines) in zip(bounds, results):
+        # the END token is kept only for the last chunk
+        count = len(codes) if chunk_start == bounds[-2] else len(codes) - 1
+
+        for index in range(count):
+            tokens.append(lexeme_token(codes_by_value[codes[index]], text, chunk_start + starts[index],
+                                       chunk_start + ends[index], line_offset + lines[index], pool))
 
-        except LexicalErrorException as exc:
-            print(exc.__str__(), "while parsing at line", line)
-            raise LexicalErrorException()
+        # the chunk ends right after a newline, so its END token is on the first line of the next chunk
+        line_offset += lines[-1] - 1
 
     return tokens
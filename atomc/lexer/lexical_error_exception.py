@@ -1,4 +1,7 @@
 class LexicalErrorException(Exception):
+    # where the error was found, set by the lexer when it recovers from the error (see tokenize_recovering())
+    line = None
+    column = None
 
     def __str__(self):
         return "Lexical Error"
@@ -0,0 +1,219 @@
+from array import array
+
+import numpy as np
+
+from atomc.lexer.lexer import scan
+from atomc.lexer.symbol_pool import SymbolPool, keyword_codes
+from atomc.lexer.token import Code, lexeme_converters, unset
+from atomc.lexer.token_stream import TokenStream
+
+# NUMPY BACKEND:
+# for huge ascii sources: every byte of the source is classified at once, through a lookup table, and the offsets where
+# the class changes are the candidate token boundaries
+# - runs of whitespace and identifier chars are taken whole, from one boundary to the next; so are the runs of digits
+#   which are not followed by a dot (integers)
+# - the one-char tokens (punctuation, arithmetic operators, dot) are their own runs
+# - "=", "!", "<" and ">" are their own runs too, the next char tells the one-char token from the one with "="; three
+#   or more of them in a row are left to the automaton
+# - all the other spots are ambiguous (real numbers, "&&", "||", "/" / "//", strings, chars, invalid chars): there
+#   the automaton takes over, until it gets past the spot, and the runs it went over are dropped
+# the tokens are never built one by one: their codes, spans and lines are computed as whole arrays and copied into the
+# columns of a TokenStream, only the names are interned one by one
+# numpy is an optional dependency, this module is only imported when the backend is selected
+
+ambiguous_class = 0
+space_class = 1
+word_class = 2
+
+# the tokens made of a char, or of the same char followed by "=", each with its own class after the ones above
+comparison_codes = {
+    '=': (Code.ASSIGN, Code.EQUAL),
+    '!': (Code.NOT, Code.NOTEQ),
+    '<': (Code.LESS, Code.LESSEQ),
+    '>': (Code.GREATER, Code.GREATEREQ),
+}
+
+# the one-char tokens, each with its own class after the ones above
+single_char_codes = {
+    ',': Code.COMMA,
+    ';': Code.SEMICOLON,
+    '(': Code.LPAR,
+    ')': Code.RPAR,
+    '[': Code.LBRACKET,
+    ']': Code.RBRACKET,
+    '{': Code.LACC,
+    '}': Code.RACC,
+    '+': Code.ADD,
+    '-': Code.SUB,
+    '*': Code.MUL,
+    '.': Code.DOT,
+}
+
+first_comparison_class = 3
+first_single_class = first_comparison_class + len(comparison_codes)
+assign_class = first_comparison_class + list(comparison_codes).index('=')
+class_count = first_single_class + len(single_char_codes)
+
+class_table = np.full(256, ambiguous_class, dtype=np.uint8)
+for char in " \t\r\n":
+    class_table[ord(char)] = space_class
+for char in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_0123456789":
+    class_table[ord(char)] = word_class
+for index, char in enumerate(comparison_codes):
+    class_table[ord(char)] = first_comparison_class + index
+for index, char in enumerate(single_char_codes):
+    class_table[ord(char)] = first_single_class + index
+
+# the code value of the token of a run, by class: alone, and followed by "="
+class_code_values = np.zeros(class_count, dtype=np.uint8)
+class_pair_code_values = np.zeros(class_count, dtype=np.uint8)
+for index, (single_code, pair_code) in enumerate(comparison_codes.values()):
+    class_code_values[first_comparison_class + index] = single_code.value
+    class_pair_code_values[first_comparison_class + index] = pair_code.value
+for index, code in enumerate(single_char_codes.values()):
+    class_code_values[first_single_class + index] = code.value
+
+# the code value of the keywords, by symbol id
+keyword_code_values = np.array([code.value for code in keyword_codes], dtype=np.uint8)
+
+# the code values of the tokens whose value is computed from their lexeme, when first accessed
+lexeme_code_values = np.array([code.value for code in lexeme_converters], dtype=np.uint8)
+
+digits = np.zeros(256, dtype=bool)
+digits[ord('0'):ord('9') + 1] = True
+
+
+# returns the offsets where a run of chars of the same class starts, and the class of every run
+# whitespace and identifier chars make runs, all the other chars are runs of one char
+def find_runs(classes):
+    boundaries = np.diff(classes) != 0
+    boundaries |= (classes[1:] != space_class) & (classes[1:] != word_class)
+    starts = np.concatenate(([0], np.flatnonzero(boundaries) + 1))
+
+    return starts, classes[starts]
+
+
+# the u32 column of a TokenStream with the values of a numpy array
+def packed_column(values):
+    column = array('I')
+    column.frombytes(values.astype(np.uintc).tobytes())
+    return column
+
+
+# same as lexer.tokenize_packed(), for ascii sources
+def tokenize_numpy(text: str, pool: SymbolPool):
+    length = len(text)
+    tokens = TokenStream(text, pool)
+    if not length:
+        tokens.append_lexeme(Code.END, 1, 0, 1)
+        return tokens
+
+    data = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    newlines_before = np.concatenate(([0], np.cumsum(data == ord('\n'))))
+    run_starts, run_classes = find_runs(class_table[data])
+    run_ends = np.append(run_starts[1:], length)
+
+    # identifier chars: an identifier, an integer, or (starting with a digit) the start of a real number or an error
+    words = run_classes == word_class
+    digit_words = words & digits[data[run_starts]]
+    digits_before = np.concatenate(([0], np.cumsum(digits[data])))
+    followed_by_dot = np.append(data[run_ends[:-1]] == ord('.'), False)
+    integers = digit_words & (digits_before[run_ends] - digits_before[run_starts] == run_ends - run_starts) \
+        & ~followed_by_dot
+
+    # "=", "!", "<", ">": a pair of them is one token if the second one is "=", a longer chain goes to the automaton
+    comparisons = (run_classes >= first_comparison_class) & (run_classes < first_single_class)
+    after_comparison = np.append(False, comparisons[:-1])
+    before_comparison = np.append(comparisons[1:], False)
+    chains = comparisons & after_comparison & before_comparison
+    chains |= comparisons & (np.append(False, chains[:-1]) | np.append(chains[1:], False))
+    pairs = comparisons & ~chains & before_comparison & (np.append(run_classes[1:], 0) == assign_class)
+    paired = np.append(False, pairs[:-1])
+
+    ambiguous = (run_classes == ambiguous_class) | (digit_words & ~integers) | chains
+
+    # the automaton lexes from every ambiguous spot until a token gets past its run, the spans it goes over are
+    # dropped from the runs; a spot already gone over is skipped, one partly gone over is lexed from where it stopped
+    # the newlines inside string and char literals do not count as lines
+    codes, starts, ends = [], [], []
+    spans_starts, spans_ends = [], []
+    hidden_ends, hidden_counts = [], []
+    hidden = 0
+    position = 0
+    for start, end in zip(run_starts[ambiguous].tolist(), run_ends[ambiguous].tolist()):
+        if end <= position:
+            continue
+        start = max(start, position)
+
+        token_end = length + 1
+        for code, token_start, token_end, _ in scan(text, start, 1 + int(newlines_before[start]) - hidden):
+            if code is Code.END:
+                token_end = length + 1
+                break
+
+            codes.append(code.value)
+            starts.append(token_start)
+            ends.append(token_end)
+            if code is Code.CT_STRING or code is Code.CT_CHAR:
+                count = text.count('\n', token_start, token_end)
+                if count:
+                    hidden += count
+                    hidden_ends.append(token_end)
+                    hidden_counts.append(hidden)
+
+            if token_end >= end:
+                break
+
+        spans_starts.append(start)
+        spans_ends.append(token_end)
+        position = token_end
+        if position > length:
+            break
+
+    # the runs which make tokens on their own, outside of the spans of the automaton
+    kept = ~(ambiguous | paired | (run_classes == space_class))
+    kept_starts = run_starts[kept]
+    if spans_starts:
+        span = np.searchsorted(np.array(spans_starts), kept_starts, side="right") - 1
+        inside = (span >= 0) & (kept_starts < np.array(spans_ends)[np.maximum(span, 0)])
+        kept[np.flatnonzero(kept)[inside]] = False
+        kept_starts = run_starts[kept]
+
+    kept_classes = run_classes[kept]
+    kept_pairs = pairs[kept]
+    kept_codes = np.where(kept_pairs, class_pair_code_values[kept_classes], class_code_values[kept_classes])
+    kept_codes[words[kept]] = Code.ID.value
+    kept_codes[integers[kept]] = Code.CT_INT.value
+
+    # both sets of tokens, in the order of the source, and END
+    token_starts = np.concatenate((kept_starts, np.array(starts, dtype=np.intp), [length]))
+    order = np.argsort(token_starts, kind="stable")
+    token_starts = token_starts[order]
+    token_ends = np.concatenate((run_ends[kept] + kept_pairs, np.array(ends, dtype=np.intp), [length + 1]))[order]
+    token_codes = np.concatenate((kept_codes, np.array(codes, dtype=np.uint8), [Code.END.value])).astype(np.uint8)
+    token_codes = token_codes[order]
+
+    lines = 1 + newlines_before[np.minimum(token_starts, length)]
+    if hidden_ends:
+        hidden_before = np.concatenate(([0], hidden_counts))
+        lines -= hidden_before[np.searchsorted(np.array(hidden_ends), token_starts, side="right")]
+
+    # the names and strings are interned in the order of the source, as the other backends do; keywords get their code
+    values = np.full(len(token_codes), None, dtype=object)
+    values[np.isin(token_codes, lexeme_code_values)] = unset
+    named = np.flatnonzero((token_codes == Code.ID.value) | (token_codes == Code.CT_STRING.value))
+    if len(named):
+        symbols = np.array(list(map(pool.intern, map(text.__getitem__, map(slice, token_starts[named].tolist(),
+                                                                           token_ends[named].tolist())))))
+        keywords = (symbols < len(keyword_codes)) & (token_codes[named] == Code.ID.value)
+        token_codes[named[keywords]] = keyword_code_values[symbols[keywords]]
+        values[named[keywords]] = None
+        values[named[~keywords]] = np.array(list(map(pool.texts.__getitem__, symbols[~keywords].tolist())),
+                                            dtype=object)
+
+    tokens.codes = array('B', token_codes.tobytes())
+    tokens.lines = packed_column(lines)
+    tokens.offsets = packed_column(token_starts)
+    tokens.ends = packed_column(token_ends)
+    tokens.values = values.tolist()
+    return tokens
@@ -0,0 +1,98 @@
+import re
+
+from atomc.lexer.lexical_error_exception import LexicalErrorException, InvalidRealNumberException
+from atomc.lexer.token import Code
+
+# REGEX BACKEND:
+# a second lexer, which cuts the lexemes with one compiled alternation of the token patterns instead of the automaton
+# it works on ascii sources only: the automaton tells letters and digits apart with str.isalpha() / str.isnumeric(),
+# which the ascii classes below do not follow for other chars (tokenize() falls back to the automaton for those)
+# the alternatives are tried in order, so the two-char operators come before their one-char prefixes
+# numbers are matched with an optional, possibly incomplete fraction and exponent, and checked afterwards, so the same
+# errors as in the automaton are raised for "1." or "1e+"
+master_pattern = re.compile(r"""
+    (?P<SPACE>[ \t\r\n]+)
+  | (?P<LINECOMMENT>//[^\n\r\0]*)
+  | (?P<ID>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<NUMBER>[0-9]+(?P<FRACTION>\.[0-9]*)?(?P<EXPONENT>[eE][+-]?[0-9]*)?)
+  | (?P<CT_CHAR>'[^']')
+  | (?P<CT_STRING>"[^"]*")
+  | (?P<AND>&&)
+  | (?P<OR>\|\|)
+  | (?P<EQUAL>==)
+  | (?P<NOTEQ>!=)
+  | (?P<LESSEQ><=)
+  | (?P<GREATEREQ>>=)
+  | (?P<COMMA>,)
+  | (?P<SEMICOLON>;)
+  | (?P<LPAR>\()
+  | (?P<RPAR>\))
+  | (?P<LBRACKET>\[)
+  | (?P<RBRACKET>])
+  | (?P<LACC>{)
+  | (?P<RACC>})
+  | (?P<ADD>\+)
+  | (?P<SUB>-)
+  | (?P<MUL>\*)
+  | (?P<DOT>\.)
+  | (?P<DIV>/)
+  | (?P<ASSIGN>=)
+  | (?P<NOT>!)
+  | (?P<LESS><)
+  | (?P<GREATER>>)
+""", re.VERBOSE)
+
+# the token code of every group, by group index; None for the groups handled separately
+group_codes = [None] * (master_pattern.groups + 1)
+for name, index in master_pattern.groupindex.items():
+    if name not in ("SPACE", "LINECOMMENT", "NUMBER", "FRACTION", "EXPONENT"):
+        group_codes[index] = Code[name]
+
+space_group = master_pattern.groupindex["SPACE"]
+number_group = master_pattern.groupindex["NUMBER"]
+
+
+# reports a lexical error the same way as the automaton
+def lexical_error(exc: LexicalErrorException, line: int):
+    print(exc.__str__(), "while parsing at line", line)
+    raise LexicalErrorException()
+
+
+# same as lexer.scan(), for ascii sources: generates one (code, start, end, line) tuple per token, keywords still coded
+# as ID, and the END token at the end
+def scan_regex(text: str):
+    line = 1
+    position = 0
+    length = len(text)
+
+    # local names are faster to look up inside the loop
+    match_token = master_pattern.match
+    codes = group_codes
+
+    while position < length:
+        match = match_token(text, position)
+        if match is None:
+            lexical_error(LexicalErrorException(), line)
+
+        kind = match.lastindex
+        end = match.end()
+
+        code = codes[kind]
+        if code is not None:
+            yield code, position, end, line
+
+        elif kind == space_group:
+            line += text.count('\n', position, end)
+
+        elif kind == number_group:
+            fraction, exponent = match.group("FRACTION", "EXPONENT")
+            if fraction == '.':
+                lexical_error(InvalidRealNumberException(), line)
+            if exponent is not None and not exponent[-1].isdigit():
+                lexical_error(LexicalErrorException(), line)
+
+            yield Code.CT_INT if fraction is None and exponent is None else Code.CT_REAL, position, end, line
+
+        position = end
+
+    yield Code.END, length, length + 1, line
@@ -0,0 +1,47 @@
+import os
+
+# files are read in blocks of this many characters (or bytes), instead of one character at a time
+chunk_size = 1 << 20
+
+
+# decodes raw source bytes, with the newlines translated the same way as a file opened in text mode
+def decode_source(data: bytes):
+    text = data.decode("utf-8")
+    if '\r' in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    return text
+
+
+# reads a whole file object in large chunks
+def read_file(file):
+    chunks = []
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+
+    if chunks and isinstance(chunks[0], bytes):
+        return decode_source(b''.join(chunks))
+
+    return ''.join(chunks)
+
+
+# returns the whole source code as a string, which the lexer then walks through by offsets
+# the source can be:
+# - a path (os.PathLike, e.g. pathlib.Path) to the source file
+# - an open file object, in text or binary mode
+# - the source code itself, as str or bytes
+def read_source(source):
+    if isinstance(source, str):
+        return source
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return decode_source(bytes(source))
+
+    if isinstance(source, os.PathLike):
+        with open(source, "r") as file:
+            return read_file(file)
+
+    return read_file(source)
@@ -0,0 +1,57 @@
+from atomc.lexer.token import Code
+
+keywords = {
+    "void": Code.VOID,
+    "int": Code.INT,
+    "char": Code.CHAR,
+    "double": Code.DOUBLE,
+    "struct": Code.STRUCT,
+    "if": Code.IF,
+    "else": Code.ELSE,
+    "for": Code.FOR,
+    "while": Code.WHILE,
+    "break": Code.BREAK,
+    "return": Code.RETURN
+}
+
+# the keywords take the first symbol ids, in the order above
+keyword_codes = list(keywords.values())
+keyword_symbols = {keyword: symbol for symbol, keyword in enumerate(keywords)}
+
+
+class SymbolPool:
+    # interning table for the texts of the ID and CT_STRING tokens
+    # every distinct text gets a small integer symbol id, kept by the tokens instead of their own copy of the text,
+    # so comparing two names is comparing two ints
+    # - symbols: text -> symbol id
+    # - texts: symbol id -> text (the reverse table)
+    # the keywords are interned first, so the same lookup both recognizes keywords and interns identifiers
+
+    def __init__(self):
+        self.symbols = dict(keyword_symbols)
+        self.texts = list(keywords)
+
+    def intern(self, text: str):
+        symbol = self.symbols.get(text)
+        if symbol is None:
+            symbol = len(self.texts)
+            self.symbols[text] = symbol
+            self.texts.append(text)
+
+        return symbol
+
+    # returns the code and the symbol id of an ID / CT_STRING lexeme
+    # keywords get their own code and no symbol id
+    def intern_lexeme(self, code: Code, text: str):
+        symbol = self.intern(text)
+
+        if code is Code.ID and symbol < len(keyword_codes):
+            return keyword_codes[symbol], None
+
+        return code, symbol
+
+    def text(self, symbol: int):
+        return self.texts[symbol]
+
+    def __len__(self):
+        return len(self.texts)
@@ -47,12 +47,80 @@ class Code(Enum):
     VOID = 40
     WHILE = 41
 
+    # the members are singletons, compared by identity, so they can be hashed by identity too; the hash of Enum is
+    # computed in Python, and the codes are looked up in dicts for nearly every token by the lexer and the analyzer
+    __hash__ = object.__hash__
+
+
+class Unset:
+    # pickled by name, so the tokens sent to other processes are still unset there (see parallel.py)
+    def __reduce__(self):
+        return "unset"
+
+
+# marks a token value which was not computed from its lexeme yet
+unset = Unset()
+
+# convert the lexemes of the tokens which have a value into that value
+lexeme_converters = {
+    Code.ID: str,
+    Code.CT_INT: int,
+    Code.CT_REAL: float,
+    Code.CT_CHAR: str,
+    Code.CT_STRING: str
+}
+
 
 class Token:
+    # no per-token __dict__, there can be millions of tokens
+    # ID and CT_STRING tokens from the lexer also carry the symbol id of their text (see SymbolPool)
+    __slots__ = ("code", "line", "source", "start", "end", "symbol", "_value")
+
     def __init__(self, code, value, line):
         self.code = code
-        self.value = value
+        self._value = value
         self.line = line
+        self.source = None
+        self.start = None
+        self.end = None
+        self.symbol = None
+
+    # a token which knows the span of its lexeme in the source text (source[start:end])
+    # the value is computed from the lexeme only when it is first accessed, and then cached
+    @classmethod
+    def from_lexeme(cls, code, source: str, start: int, end: int, line: int):
+        token = cls.__new__(cls)
+        token.code = code
+        token._value = unset if code in lexeme_converters else None
+        token.line = line
+        token.source = source
+        token.start = start
+        token.end = end
+        token.symbol = None
+        return token
+
+    # a copy of the token with its lexeme moved by shift chars and line_shift lines, in the text source
+    def shifted(self, source: str, shift: int, line_shift: int):
+        token = self.__class__.__new__(self.__class__)
+        token.code = self.code
+        token._value = self._value
+        token.line = self.line + line_shift
+        token.source = source
+        token.start = self.start + shift
+        token.end = self.end + shift
+        token.symbol = self.symbol
+        return token
+
+    @property
+    def value(self):
+        if self._value is unset:
+            self._value = lexeme_converters[self.code](self.source[self.start:self.end])
+
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
@@ -0,0 +1,225 @@
+import hashlib
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from atomc.lexer.lexer import lexer_version, tokenize_packed
+from atomc.lexer.source import read_source
+from atomc.lexer.symbol_pool import SymbolPool
+from atomc.lexer.token import unset
+from atomc.lexer.token_stream import TokenStream, codes_by_value
+
+# the cache directory used when none is given, next to the source file, like __pycache__; the sources given as text
+# have no file, they are cached in this directory under the current directory
+default_cache_directory = "__atomccache__"
+
+# the cache directory is kept under this many bytes
+default_max_size = 64 << 20
+
+# FILE FORMAT:
+# a header (magic, format version, token count, name count, crc32 of the rest), followed by the columns of the
+# TokenStream, little endian and compressed together with zlib (at the fastest level, the lines and codes shrink a lot):
+# - codes (1 byte per token), lines, offsets, ends (4 bytes per token)
+# - the index of the value of every token (4 bytes per token): 0 for None, 1 for a value computed lazily from the
+#   lexeme, 2 + n for the n-th distinct ID / CT_STRING name
+# - the offsets of the first lexeme of every distinct name, start and end (4 bytes each); the names themselves are
+#   cut from the source again, which is needed anyway to compute the lazy values
+# the file name is a hash of the source text and of the lexer version, so a changed source or lexer is a miss
+magic = b"ATKC"
+format_version = 1
+header = struct.Struct("<4sBIII")
+
+
+# the columns of the file, in order
+def columns(stream: TokenStream, value_indexes: array, name_starts: array, name_ends: array):
+    return [stream.codes, stream.lines, stream.offsets, stream.ends, value_indexes, name_starts, name_ends]
+
+
+# rebuilds the token stream of text from the contents of its cache file, returns None if they do not fit
+def decode_tokens(data: bytes, text: str, pool: SymbolPool):
+    file_magic, version, count, name_count, checksum = header.unpack_from(data)
+    if file_magic != magic or version != format_version:
+        return None
+
+    payload = zlib.decompress(memoryview(data)[header.size:])
+    if zlib.crc32(payload) != checksum:
+        return None
+
+    stream = TokenStream(text, pool)
+    value_indexes, name_starts, name_ends = array('I'), array('I'), array('I')
+
+    position = 0
+    for column, length in zip(columns(stream, value_indexes, name_starts, name_ends),
+                              [count] * 5 + [name_count] * 2):
+        size = length * column.itemsize
+        if position + size > len(payload):
+            return None
+
+        column.frombytes(payload[position:position + size])
+        if sys.byteorder == "big" and column.itemsize > 1:
+            column.byteswap()
+        position += size
+
+    if position != len(payload):
+        return None
+
+    # the file must fit the source it was found for
+    if count and (max(stream.codes) >= len(codes_by_value) or max(stream.ends) > len(text) + 1
+                  or max(value_indexes) >= name_count + 2):
+        return None
+    if name_count and max(name_ends) > len(text):
+        return None
+
+    # the names are interned in the order of their first token, same as the lexer does
+    values = [None, unset]
+    for start, end in zip(name_starts, name_ends):
+        values.append(pool.texts[pool.intern(text[start:end])])
+
+    stream.values = list(map(values.__getitem__, value_indexes))
+    return stream
+
+
+# deletes a file, if it is still there
+def remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class TokenCache:
+    # a directory with the token streams of already lexed sources, in a compact binary form
+    # a hit loads the packed columns of the TokenStream straight from the file, so no token is lexed or built again
+    # the least recently used files are evicted when the directory grows over max_size bytes
+    # without a directory, every source is cached in the default_cache_directory next to its file
+    # a file which cannot be read back (truncated, corrupt, from another format version) is deleted and the source is
+    # lexed again, so the cache can never change the tokens
+
+    def __init__(self, directory: str = None, max_size: int = default_max_size):
+        self.directory = directory
+        self.max_size = max_size
+
+    # the cache directory of a source (a path, a file object or the source code, see read_source())
+    def source_directory(self, source):
+        if self.directory is not None:
+            return self.directory
+
+        path = source if isinstance(source, os.PathLike) else getattr(source, "name", None)
+        if isinstance(path, (str, os.PathLike)):
+            return os.path.join(os.path.dirname(os.path.abspath(path)), default_cache_directory)
+
+        return os.path.abspath(default_cache_directory)
+
+    # the path of the cache file of a source text, in directory (by default, the directory of the cache)
+    def path(self, text: str, directory: str = None):
+        digest = hashlib.sha256(("%d:%d:" % (lexer_version, format_version)).encode())
+        digest.update(text.encode("utf-8", "surrogatepass"))
+
+        return os.path.join(self.source_directory(text) if directory is None else directory,
+                            digest.hexdigest() + ".tok")
+
+    # same tokens as tokenize_packed(), from the cache when the source was already lexed
+    def tokenize(self, source, pool: SymbolPool = None):
+        text: str = read_source(source)
+        if pool is None:
+            pool = SymbolPool()
+
+        path = self.path(text, self.source_directory(source))
+        stream = self.load(path, text, pool)
+        if stream is None:
+            stream = tokenize_packed(text, pool)
+            self.store(path, stream)
+
+        return stream
+
+    # reads a cache file, returns None on a miss or on a file which cannot be used
+    def load(self, path: str, text: str, pool: SymbolPool):
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+
+        try:
+            stream = decode_tokens(data, text, pool)
+        except (ValueError, IndexError, KeyError, struct.error, zlib.error):
+            stream = None
+
+        if stream is None:
+            remove_file(path)
+            return None
+
+        # mark the file as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return stream
+
+    # writes the cache file of a token stream, then evicts the old files if needed
+    def store(self, path: str, stream: TokenStream):
+        value_indexes, name_starts, name_ends = array('I'), array('I'), array('I')
+        name_indexes = {}
+
+        for index, value in enumerate(stream.values):
+            if value is None:
+                value_indexes.append(0)
+            elif value is unset:
+                value_indexes.append(1)
+            else:
+                name_index = name_indexes.get(value)
+                if name_index is None:
+                    name_index = name_indexes[value] = len(name_indexes)
+                    name_starts.append(stream.offsets[index])
+                    name_ends.append(stream.ends[index])
+
+                value_indexes.append(2 + name_index)
+
+        payload = []
+        for column in columns(stream, value_indexes, name_starts, name_ends):
+            if sys.byteorder == "big" and column.itemsize > 1:
+                column = array(column.typecode, column)
+                column.byteswap()
+            payload.append(column.tobytes())
+        payload = b"".join(payload)
+
+        # written to a temporary file first, so a concurrent reader never sees half a file
+        temporary_path = "%s.%d.tmp" % (path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temporary_path, "wb") as file:
+                file.write(header.pack(magic, format_version, len(stream), len(name_indexes), zlib.crc32(payload)))
+                file.write(zlib.compress(payload, 1))
+            os.replace(temporary_path, path)
+        except OSError:
+            # the cache is only an optimization, a read-only or full disk must not break the lexing
+            remove_file(temporary_path)
+            return
+
+        self.evict(os.path.dirname(path))
+
+    # removes the least recently used files until a cache directory is under max_size bytes
+    def evict(self, directory: str):
+        files = []
+        total_size = 0
+
+        for entry in os.scandir(directory):
+            if entry.name.endswith(".tok"):
+                try:
+                    status = entry.stat()
+                except OSError:
+                    continue
+
+                files.append((status.st_mtime, entry.path, status.st_size))
+                total_size += status.st_size
+
+        files.sort()
+        for _, path, size in files:
+            if total_size <= self.max_size:
+                break
+
+            remove_file(path)
+            total_size -= size
@@ -0,0 +1,208 @@
+import struct
+import sys
+from array import array
+
+from atomc.lexer.symbol_pool import SymbolPool
+from atomc.lexer.token import Code, Token
+from atomc.lexer.token_stream import codes_by_value
+
+# BINARY TOKEN FORMAT:
+# a compact alternative to pickling Token objects, to pass the tokens between processes (e.g. through a pipe)
+# a stream is a header (magic, format version) followed by blocks of tokens, and ends with an empty block
+# every block starts with the counts of what it holds, then, little endian:
+# - the code of every token, 1 byte each; bit 0x80 marks a CT_INT too big for 64 bits, sent as text
+# - the line of every token, 4 bytes each
+# - the strings new in this block: their lengths (4 bytes each) and their utf-8 bytes; the strings make up one table
+#   for the whole stream, so a name is sent only once
+# - the values, by type: the string table index of the ID, CT_CHAR and CT_STRING values (and big CT_INT values),
+#   4 bytes each; the CT_INT values, 8 bytes each; the CT_REAL values, 8 bytes each
+# tokens are written in blocks of block_size, so a reader can start on the first tokens before the last ones are lexed
+magic = b"ATKS"
+format_version = 1
+header = struct.Struct("<4sB")
+
+# token count, new string count, size of the new strings, string value count, int value count, real value count
+block_header = struct.Struct("<IIIIII")
+
+default_block_size = 4096
+
+big_int_flag = 0x80
+int_min, int_max = -(1 << 63), (1 << 63) - 1
+
+string_codes = (Code.ID, Code.CT_CHAR, Code.CT_STRING)
+
+
+# converts arrays to / from little endian
+def little_endian(column: array):
+    if sys.byteorder == "big" and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+
+    return column
+
+
+# reads exactly size bytes, a pipe can return less at a time
+def read_exactly(file, size: int):
+    data = file.read(size)
+    while len(data) < size:
+        chunk = file.read(size - len(data))
+        if not chunk:
+            raise ValueError("truncated token stream")
+        data += chunk
+
+    return data
+
+
+class TokenWriter:
+    # writes tokens to a binary file object, in the format above
+    # close() must be called to end the stream; it does not close the file
+
+    def __init__(self, file, block_size: int = default_block_size):
+        self.file = file
+        self.block_size = block_size
+        self.strings = {}  # string -> index in the string table
+        self.tokens = []
+
+        file.write(header.pack(magic, format_version))
+
+    def write(self, token: Token):
+        self.tokens.append(token)
+        if len(self.tokens) >= self.block_size:
+            self.flush()
+
+    # writes the pending tokens as a block
+    def flush(self):
+        if not self.tokens:
+            return
+
+        codes, lines = array('B'), array('I')
+        string_values, int_values, real_values = array('I'), array('q'), array('d')
+        new_strings = []
+
+        for token in self.tokens:
+            code = token.code
+            value = token.value
+            code_byte = code.value
+
+            if code is Code.CT_INT and int_min <= value <= int_max:
+                int_values.append(value)
+            elif code is Code.CT_REAL:
+                real_values.append(value)
+            elif code in string_codes or code is Code.CT_INT:
+                if code is Code.CT_INT:
+                    code_byte |= big_int_flag
+                    value = str(value)
+
+                index = self.strings.get(value)
+                if index is None:
+                    index = self.strings[value] = len(self.strings)
+                    new_strings.append(value.encode("utf-8", "surrogatepass"))
+                string_values.append(index)
+
+            codes.append(code_byte)
+            lines.append(token.line)
+
+        self.tokens = []
+
+        string_lengths = array('I', map(len, new_strings))
+        string_data = b"".join(new_strings)
+
+        self.file.write(block_header.pack(len(codes), len(new_strings), len(string_data), len(string_values),
+                                          len(int_values), len(real_values)))
+        for column in (codes, lines, string_lengths):
+            self.file.write(little_endian(column).tobytes())
+        self.file.write(string_data)
+        for column in (string_values, int_values, real_values):
+            self.file.write(little_endian(column).tobytes())
+
+    # writes the pending tokens and the end of the stream
+    def close(self):
+        self.flush()
+        self.file.write(block_header.pack(0, 0, 0, 0, 0, 0))
+        self.file.flush()
+
+
+class TokenReader:
+    # reads the tokens written by a TokenWriter from a binary file object, one block at a time
+    # iterating the reader gives the tokens; if a pool is given, the ID / CT_STRING tokens get their symbol ids in it
+
+    def __init__(self, file, pool: SymbolPool = None):
+        self.file = file
+        self.pool = pool
+        self.strings = []  # the string table
+
+        file_magic, version = header.unpack(read_exactly(file, header.size))
+        if file_magic != magic:
+            raise ValueError("not a token stream")
+        if version != format_version:
+            raise ValueError("unsupported token stream version: " + str(version))
+
+    def __iter__(self):
+        while True:
+            block = self.read_block()
+            if not block:
+                return
+
+            yield from block
+
+    # returns the tokens of the next block, an empty list at the end of the stream
+    def read_block(self):
+        count, string_count, string_size, string_value_count, int_count, real_count = \
+            block_header.unpack(read_exactly(self.file, block_header.size))
+
+        columns = []
+        for typecode, length in (('B', count), ('I', count), ('I', string_count)):
+            column = array(typecode)
+            column.frombytes(read_exactly(self.file, length * column.itemsize))
+            columns.append(little_endian(column))
+        codes, lines, string_lengths = columns
+
+        string_data = read_exactly(self.file, string_size)
+        position = 0
+        for length in string_lengths:
+            self.strings.append(string_data[position:position + length].decode("utf-8", "surrogatepass"))
+            position += length
+
+        columns = []
+        for typecode, length in (('I', string_value_count), ('q', int_count), ('d', real_count)):
+            column = array(typecode)
+            column.frombytes(read_exactly(self.file, length * column.itemsize))
+            columns.append(iter(little_endian(column)))
+        string_values, int_values, real_values = columns
+
+        strings = self.strings
+        pool = self.pool
+        tokens = []
+        for code_byte, line in zip(codes, lines):
+            code = codes_by_value[code_byte & ~big_int_flag]
+
+            if code_byte & big_int_flag:
+                value = int(strings[next(string_values)])
+            elif code is Code.CT_INT:
+                value = next(int_values)
+            elif code is Code.CT_REAL:
+                value = next(real_values)
+            elif code in string_codes:
+                value = strings[next(string_values)]
+            else:
+                value = None
+
+            token = Token(code, value, line)
+            if pool is not None and (code is Code.ID or code is Code.CT_STRING):
+                token.symbol = pool.intern(value)
+            tokens.append(token)
+
+        return tokens
+
+
+# writes a whole token list (or TokenStream) to a binary file object
+def dump_tokens(tokens, file, block_size: int = default_block_size):
+    writer = TokenWriter(file, block_size)
+    for token in tokens:
+        writer.write(token)
+    writer.close()
+
+
+# reads all the tokens from a binary file object written by dump_tokens() / TokenWriter
+def load_tokens(file, pool: SymbolPool = None):
+    return list(TokenReader(file, pool))
@@ -0,0 +1,98 @@
+from array import array
+
+from atomc.lexer.token import Code, Token, lexeme_converters, unset
+
+# the token codes, indexed by their value
+codes_by_value = list(Code)
+
+
+class TokenStream:
+    # a packed list of tokens, stored column by column instead of as one Token object per token:
+    # - codes: the value of the Code of every token, 1 byte each
+    # - lines: the line of every token, 4 bytes each
+    # - offsets, ends: the span of the lexeme of every token in the source text, 4 bytes each
+    # - values: side table with the value of every token (None for the tokens without one)
+    # - pool: the SymbolPool in which the lexer interned the ID / CT_STRING values
+    # the values of tokens appended as lexemes are computed from the source text only when first accessed
+    # indexing the stream returns Token objects built on demand, so it can be used wherever a token list is expected
+
+    def __init__(self, source: str = None, pool=None):
+        self.source = source
+        self.pool = pool
+        self.codes = array('B')
+        self.lines = array('I')
+        self.offsets = array('I')
+        self.ends = array('I')
+        self.values = []
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        stream = cls()
+        for tk in tokens:
+            stream.append(tk.code, tk.value, tk.line)
+
+        return stream
+
+    def append(self, code: Code, value, line: int, offset: int = 0, end: int = 0):
+        self.codes.append(code.value)
+        self.lines.append(line)
+        self.offsets.append(offset)
+        self.ends.append(end)
+        self.values.append(value)
+
+    # appends the token made of source[start:end], without computing its value
+    def append_lexeme(self, code: Code, line: int, start: int, end: int):
+        self.codes.append(code.value)
+        self.lines.append(line)
+        self.offsets.append(start)
+        self.ends.append(end)
+        self.values.append(unset if code in lexeme_converters else None)
+
+    # the code of the token at index, without building the Token
+    def code(self, index: int):
+        return codes_by_value[self.codes[index]]
+
+    # the value of the token at index, computed from its lexeme and cached on first access
+    def value(self, index: int):
+        value = self.values[index]
+        if value is unset:
+            value = lexeme_converters[codes_by_value[self.codes[index]]](
+                self.source[self.offsets[index]:self.ends[index]])
+            self.values[index] = value
+
+        return value
+
+    # the symbol id of an ID / CT_STRING token, None for the other tokens
+    def symbol(self, index: int):
+        if self.pool is None or self.codes[index] not in (Code.ID.value, Code.CT_STRING.value):
+            return None
+
+        return self.pool.symbols[self.values[index]]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index: int):
+        code = codes_by_value[self.codes[index]]
+
+        if self.source is None:
+            return Token(code, self.values[index], self.lines[index])
+
+        token = Token.from_lexeme(code, self.source, self.offsets[index], self.ends[index], self.lines[index])
+        if self.values[index] is not unset:
+            token.value = self.values[index]
+            token.symbol = self.symbol(index)
+
+        return token
+
+    def __iter__(self):
+        for index in range(len(self.codes)):
+            yield self[index]
+
+    def __eq__(self, other):
+        if isinstance(other, TokenStream):
+            return (self.codes == other.codes and self.lines == other.lines and self.offsets == other.offsets
+                    and [self.value(index) for index in range(len(self))] ==
+                    [other.value(index) for index in range(len(other))])
+        else:
+            return False
@@ -1,27 +1,83 @@
-import copy
-
 from atomc.lexer.token import Code
+from atomc.lexer.token_stream import TokenStream
+from atomc.syntactic_analyzer.grammar import first_sets, ll1_table, token_names
+from atomc.syntactic_analyzer.packrat import PackratMemo, memoized_rules
+from atomc.syntactic_analyzer.profiler import ParserProfile, profiled_rules
+from atomc.syntactic_analyzer.recovery import recover, default_max_errors
 from atomc.syntactic_analyzer.syntax_error_exception import SyntaxErrorException
+from atomc.syntactic_analyzer.syntax_tree import Type, VarDef, StructDef, FnDef, Unit, CompoundStm, IfStm, WhileStm, \
+    ForStm, BreakStm, ReturnStm, ExprStm, Id, Call, Constant, Index, Field, Unary, Cast, Binary, Assign
+from atomc.syntactic_analyzer.token_cursor import TokenCursor, StreamingTokenCursor, PackedTokenCursor
 
 
 # rule of thumb:
 # any rule function and also the consume function returns a tuple:
-# - boolean: if the rule satisfied, token was consumed
-# - iterator: the iterator at the new position in the list (after consuming all the tokens of that rule)
-#             if the rule was not satisfied / token was not consumed, an iterator object with the initial state of the
-#             main iterator is returned, so the iteration does not advance
+# - cursor: the token cursor at the new position in the list (after consuming all the tokens of that rule)
+#           if the rule was not satisfied / token was not consumed, the cursor is reset to the position it had when
+#           the rule was entered, so the iteration does not advance
+# - result: the node of the syntax tree built by the rule (see syntax_tree.py) if the rule was satisfied, False if not
+#           a node is never false, so the result tells whether the rule was satisfied; consume() returns a boolean
+#
+# backtracking works by remembering the cursor position with mark() when entering a rule and restoring it with
+# reset(), both are O(1), so the analysis stays linear in the number of tokens
+#
+# the rules do not try their alternatives in turn: they pick one from the code of the next token, through the LL(1)
+# prediction tables built from the FIRST / FOLLOW sets of the grammar (see grammar.py): code -> index of the
+# alternative, in the order the alternatives are written above the rule
+# a code missing from a table starts no alternative, so the rule is not satisfied (or matches e, for the aux rules)
+# the rules which are not LL(1) look at a few more tokens instead:
+# - unit: structDef has LACC after STRUCT ID, fnDef has LPAR after typeBase ID, varDef has neither
+# - exprCast: a cast has a typeBase after LPAR, a parenthesized expression has not
+# - exprAssign: exprUnary is parsed once, the ASSIGN after it tells an assignment from an exprOr
+expr_primary_table = ll1_table("exprPrimary")
+stm_table = ll1_table("stm")
+type_base_table = ll1_table("typeBase")
+
+type_base_first = first_sets["typeBase"]
+var_def_first = first_sets["varDef"]
+
+# OPERATORS:
+# the binary operators by precedence, the higher binds tighter; all of them are left associative
+binary_precedences = {
+    Code.OR: 1,
+    Code.AND: 2,
+    Code.EQUAL: 3,
+    Code.NOTEQ: 3,
+    Code.LESS: 4,
+    Code.LESSEQ: 4,
+    Code.GREATER: 4,
+    Code.GREATEREQ: 4,
+    Code.ADD: 5,
+    Code.SUB: 5,
+    Code.MUL: 6,
+    Code.DIV: 6,
+}
+lowest_precedence = 1
+
+# the prefix operators, they bind tighter than all the binary ones, casts bind between the two
+# the postfix ones ([] and .) bind the tightest
+unary_operators = (Code.SUB, Code.NOT)
+
+# the operators, as the error messages name them (the %name lines of atomc.grammar)
+operator_names = token_names
 
 
 # for consuming terminal symbols/tokens from the grammar rules
-def consume(token_iterator: iter, code: Code):
-    # do not forget to deep copy the token_iterator, lest you will end up with an alias
-    initial_iterator = copy.deepcopy(token_iterator)
-
-    tk = next(token_iterator)
-    if tk.code == code:
+def consume(token_iterator: TokenCursor, code: Code):
+    if token_iterator.peek_code() == code:
+        token_iterator.advance()
         return token_iterator, True
 
-    return initial_iterator, False
+    return token_iterator, False
+
+
+# same as consume(), for the terminals the syntax tree keeps (names, constants): returns the token, None if the token
+# was not consumed
+def consume_token(token_iterator: TokenCursor, code: Code):
+    if token_iterator.peek_code() == code:
+        return token_iterator, next(token_iterator)
+
+    return token_iterator, None
 
 
 # grammar rule:
@@ -31,20 +87,23 @@ def consume(token_iterator: iter, code: Code):
 # | CT_CHAR
 # | CT_STRING
 # | LPAR expr RPAR
-def rule_expr_primary(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+def rule_expr_primary(token_iterator: TokenCursor):
+    fallback_position = token_iterator.mark()
+    production = expr_primary_table.get(token_iterator.peek_code())
 
     # ID
-    token_iterator, rule_result = consume(token_iterator, Code.ID)
-    if rule_result:
+    if production == 0:
+        tk = next(token_iterator)
 
         # LPAR?
         token_iterator, rule_result = consume(token_iterator, Code.LPAR)
         if rule_result:
+            args = []
 
             # expr?
-            token_iterator, rule_result = rule_expr(token_iterator)
-            if rule_result:
+            token_iterator, arg = rule_expr(token_iterator)
+            if arg:
+                args.append(arg)
 
                 # COMMA*
                 while True:
@@ -54,649 +113,286 @@ def rule_expr_primary(token_iterator: iter):
                         break
 
                     # expr
-                    token_iterator, rule_result = rule_expr(token_iterator)
-                    if not rule_result:
+                    token_iterator, arg = rule_expr(token_iterator)
+                    if not arg:
                         raise SyntaxErrorException(next(token_iterator), "missing function parameter after , "
                                                                          "in function call")
+                    args.append(arg)
 
             # RPAR
             token_iterator, rule_result = consume(token_iterator, Code.RPAR)
             if rule_result:
-                return token_iterator, True
+                return token_iterator, Call(tk.value, args, tk.line)
 
             else:
                 raise SyntaxErrorException(next(token_iterator),
                                            "missing ) after ( in function call")
 
         else:
-            return token_iterator, True
-
-    # CT_INT
-    token_iterator = copy.deepcopy(fallback_iterator)
-    token_iterator, rule_result = consume(token_iterator, Code.CT_INT)
-    if rule_result:
-        return token_iterator, True
-
-    # CT_REAL
-    token_iterator, rule_result = consume(token_iterator, Code.CT_REAL)
-    if rule_result:
-        return token_iterator, True
+            return token_iterator, Id(tk.value, tk.line)
 
-    # CT_CHAR
-    token_iterator, rule_result = consume(token_iterator, Code.CT_CHAR)
-    if rule_result:
-        return token_iterator, True
-
-    # CT_STRING
-    token_iterator, rule_result = consume(token_iterator, Code.CT_STRING)
-    if rule_result:
-        return token_iterator, True
+    # CT_INT | CT_REAL | CT_CHAR | CT_STRING
+    if production in (1, 2, 3, 4):
+        tk = next(token_iterator)
+        return token_iterator, Constant(tk.code, tk.value, tk.line)
 
     # LPAR
-    token_iterator, rule_result = consume(token_iterator, Code.LPAR)
-    if rule_result:
+    if production == 5:
+        token_iterator.advance()
 
         # expr
-        token_iterator, rule_result = rule_expr(token_iterator)
-        if rule_result:
+        token_iterator, expr = rule_expr(token_iterator)
+        if expr:
 
             # RPAR
             token_iterator, rule_result = consume(token_iterator, Code.RPAR)
             if rule_result:
-                return token_iterator, True
+                return token_iterator, expr
 
             else:
                 raise SyntaxErrorException(next(token_iterator), "missing ) after (")
 
         else:
             # not an error, might be just a cast
-            return fallback_iterator, False
+            token_iterator.reset(fallback_position)
+            return token_iterator, False
 
-    return fallback_iterator, False
+    return token_iterator, False
 
 
-# auxiliary grammar rule:
+# grammar rules:
+# exprPostfix: exprPrimary exprPostfixAux
 # exprPostfixAux: LBRACKET expr RBRACKET exprPostfixAux
 # | DOT ID exprPostfixAux
 # | e
-def rule_expr_postfix_aux(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+# the postfix operators are taken in a loop, exprPostfixAux is only a tail recursion
+def rule_expr_postfix(token_iterator: TokenCursor):
+    # exprPrimary
+    token_iterator, expr = rule_expr_primary(token_iterator)
+    if not expr:
+        return token_iterator, False
 
-    # LBRACKET
-    token_iterator, rule_result = consume(token_iterator, Code.LBRACKET)
-    if rule_result:
+    while True:
+        code = token_iterator.peek_code()
 
-        # expr
-        token_iterator, rule_result = rule_expr(token_iterator)
-        if rule_result:
+        # LBRACKET
+        if code is Code.LBRACKET:
+            token_iterator.advance()
+
+            # expr
+            token_iterator, index = rule_expr(token_iterator)
+            if not index:
+                raise SyntaxErrorException(next(token_iterator), "no array index after [ in expression")
 
             # RBRACKET
             token_iterator, rule_result = consume(token_iterator, Code.RBRACKET)
-            if rule_result:
-
-                # exprPostfixAux
-                token_iterator, rule_result = rule_expr_postfix_aux(token_iterator)
-                if rule_result:
-
-                    return token_iterator, True
-
-                # else:
-                #     raise SyntaxErrorException(next(token_iterator), "invalid postfix expression")
-
-            else:
+            if not rule_result:
                 raise SyntaxErrorException(next(token_iterator), "no ] in array variable in expression")
 
-        else:
-            raise SyntaxErrorException(next(token_iterator), "no array index after [ in expression")
+            expr = Index(expr, index, expr.line)
 
-    # DOT
-    token_iterator = copy.deepcopy(fallback_iterator)
-    token_iterator, rule_result = consume(token_iterator, Code.DOT)
-    if rule_result:
+        # DOT
+        elif code is Code.DOT:
+            token_iterator.advance()
 
-        # ID
-        token_iterator, rule_result = consume(token_iterator, Code.ID)
-        if rule_result:
+            # ID
+            token_iterator, tk = consume_token(token_iterator, Code.ID)
+            if tk is None:
+                raise SyntaxErrorException(next(token_iterator), "no field name after .")
 
-            # exprPostfixAux
-            token_iterator, rule_result = rule_expr_postfix_aux(token_iterator)
-            if rule_result:
-
-                return token_iterator, True
+            expr = Field(expr, tk.value, expr.line)
 
+        # e
         else:
-            raise SyntaxErrorException(next(token_iterator), "no field name after .")
-
-    # e
-    return fallback_iterator, True
-
-
-# grammar rule:
-# exprPostfix: exprPrimary exprPostfixAux
-def rule_expr_postfix(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # exprPrimary
-    token_iterator, rule_result = rule_expr_primary(token_iterator)
-    if rule_result:
-
-        # exprPostfixAux
-        token_iterator, rule_result = rule_expr_postfix_aux(token_iterator)
-        if rule_result:
-            return token_iterator, True
-
-    return fallback_iterator, False
+            return token_iterator, expr
 
 
 # grammar rule:
 # exprUnary: ( SUB | NOT ) exprUnary | exprPostfix
-def rule_expr_unary(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+# the prefix operators are taken in a loop, the error names the last one when no exprPostfix follows
+def rule_expr_unary(token_iterator: TokenCursor):
+    operators = []
 
-    # SUB
-    token_iterator, rule_result = consume(token_iterator, Code.SUB)
-    if rule_result:
+    # ( SUB | NOT )*
+    while token_iterator.peek_code() in unary_operators:
+        operators.append(next(token_iterator))
 
-        # exprUnary
-        token_iterator, rule_result = rule_expr_unary(token_iterator)
-        if rule_result:
-            return token_iterator, True
-
-        else:
-            raise SyntaxErrorException(next(token_iterator), "no unary expression after -")
+    # exprPostfix
+    token_iterator, expr = rule_expr_postfix(token_iterator)
+    if not operators:
+        return token_iterator, expr
 
-    # NOT
-    token_iterator, rule_result = consume(token_iterator, Code.NOT)
-    if rule_result:
+    if not expr:
+        raise SyntaxErrorException(next(token_iterator), "no unary expression after " +
+                                   operator_names[operators[-1].code])
 
-        # exprUnary
-        token_iterator, rule_result = rule_expr_unary(token_iterator)
-        if rule_result:
-            return token_iterator, True
+    # the operators apply from the innermost one, the closest to the operand
+    for tk in reversed(operators):
+        expr = Unary(tk.code, expr, tk.line)
 
-        else:
-            raise SyntaxErrorException(next(token_iterator), "no unary expression after ! (not)")
-
-    # exprPostfix
-    token_iterator = copy.deepcopy(fallback_iterator)
-    token_iterator, rule_result = rule_expr_postfix(token_iterator)
-    if rule_result:
-        return token_iterator, True
-
-    return fallback_iterator, False
+    return token_iterator, expr
 
 
 # grammar rule:
 # exprCast: LPAR typeBase arrayDecl? RPAR exprCast | exprUnary
-def rule_expr_cast(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # LPAR
-    token_iterator, rule_result = consume(token_iterator, Code.LPAR)
-    if rule_result:
+def rule_expr_cast(token_iterator: TokenCursor):
+    # LPAR typeBase, a parenthesized expression (exprUnary) has no type after (
+    if token_iterator.peek_code() is Code.LPAR and token_iterator.lookahead(1) in type_base_first:
+        tk = next(token_iterator)
 
         # typeBase
-        token_iterator, rule_result = rule_type_base(token_iterator)
-        if rule_result:
-
-            # arrayDecl?
-            token_iterator, rule_result = rule_array_decl(token_iterator)
-
-            # RPAR
-            token_iterator, rule_result = consume(token_iterator, Code.RPAR)
-            if rule_result:
-
-                # exprCast
-                token_iterator, rule_result = rule_expr_cast(token_iterator)
-                if rule_result:
-
-                    return token_iterator, True
-
-                else:
-                    raise SyntaxErrorException(next(token_iterator), "invalid expression after cast type")
-
-            else:
-                raise SyntaxErrorException(next(token_iterator), "no ) after type in cast")
-
-        # cannot raise an exception here, there are other things after ( aside from cast types,
-        # such as exprUnary
+        token_iterator, cast_type = rule_type_base(token_iterator)
 
-    # exprUnary
-    token_iterator = copy.deepcopy(fallback_iterator)
-    token_iterator, rule_result = rule_expr_unary(token_iterator)
-    if rule_result:
-        return token_iterator, True
-
-    return fallback_iterator, False
-
-
-# auxiliary grammar rule:
-# exprMulAux: ( MUL | DIV ) exprCast exprMulAux | e
-def rule_expr_mul_aux(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+        # arrayDecl?
+        token_iterator, array_size = rule_array_decl(token_iterator)
+        cast_type = array_type(cast_type, array_size)
 
-    # MUL
-    token_iterator, rule_result = consume(token_iterator, Code.MUL)
-    if rule_result:
-
-        # exprCast
-        token_iterator, rule_result = rule_expr_cast(token_iterator)
+        # RPAR
+        token_iterator, rule_result = consume(token_iterator, Code.RPAR)
         if rule_result:
 
-            # exprMulAux
-            token_iterator, rule_result = rule_expr_mul_aux(token_iterator)
-            if rule_result:
-                return token_iterator, True
+            # exprCast
+            token_iterator, expr = rule_expr_cast(token_iterator)
+            if expr:
 
-        else:
-            raise SyntaxErrorException(next(token_iterator), "invalid expression after *")
+                return token_iterator, Cast(cast_type, expr, tk.line)
 
-    # DIV
-    token_iterator, rule_result = consume(token_iterator, Code.DIV)
-    if rule_result:
-
-        # exprCast
-        token_iterator, rule_result = rule_expr_cast(token_iterator)
-        if rule_result:
-
-            # exprMulAux
-            token_iterator, rule_result = rule_expr_mul_aux(token_iterator)
-            if rule_result:
-                return token_iterator, True
+            else:
+                raise SyntaxErrorException(next(token_iterator), "invalid expression after cast type")
 
         else:
-            raise SyntaxErrorException(next(token_iterator), "invalid expression after /")
+            raise SyntaxErrorException(next(token_iterator), "no ) after type in cast")
 
-    # e
-    return fallback_iterator, True
+    # exprUnary
+    return rule_expr_unary(token_iterator)
 
 
-# grammar rule:
+# grammar rules, one per precedence level of the binary operators:
+# exprOr: exprAnd exprOrAux
+# exprOrAux: OR exprAnd exprOrAux | e
+# exprAnd: exprEq exprAndAux
+# exprAndAux: AND exprEq exprAndAux | e
+# exprEq: exprRel exprEqAux
+# exprEqAux: ( EQUAL | NOTEQ ) exprRel exprEqAux | e
+# exprRel: exprAdd exprRelAux
+# exprRelAux: ( LESS | LESSEQ | GREATER | GREATEREQ ) exprAdd exprRelAux | e
+# exprAdd: exprMul exprAddAux
+# exprAddAux: ( ADD | SUB ) exprMul exprAddAux | e
 # exprMul: exprCast exprMulAux
-def rule_expr_mul(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
+# exprMulAux: ( MUL | DIV ) exprCast exprMulAux | e
+#
+# instead of one rule per level, they are parsed by precedence climbing: every level is an exprCast followed by
+# operators and their right operands, where the right operand of an operator only takes the operators which bind
+# tighter than it; so parsing an operand takes a few calls instead of one per level
+# the accepted expressions and the errors are the ones of the rules above
+
+# exprCast followed by the binary operators which bind at least as tight as min_precedence, with their operands
+# not satisfied when there is no exprCast
+def parse_binary(token_iterator: TokenCursor, min_precedence: int):
     # exprCast
-    token_iterator, rule_result = rule_expr_cast(token_iterator)
-    if rule_result:
-
-        # exprMulAux
-        token_iterator, rule_result = rule_expr_mul_aux(token_iterator)
-        if rule_result:
-            return token_iterator, True
-
-    return fallback_iterator, False
-
-
-# auxiliary grammar rule:
-# exprAddAux: ( ADD | SUB ) exprMul exprAddAux | e
-def rule_expr_add_aux(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # ADD
-    token_iterator, rule_result = consume(token_iterator, Code.ADD)
-    if rule_result:
-
-        # exprMul
-        token_iterator, rule_result = rule_expr_mul(token_iterator)
-        if rule_result:
-
-            # exprAddAux
-            token_iterator, rule_result = rule_expr_add_aux(token_iterator)
-            if rule_result:
-                return token_iterator, True
-
-        else:
-            raise SyntaxErrorException(next(token_iterator), "invalid expression after +")
-
-    # SUB
-    token_iterator, rule_result = consume(token_iterator, Code.SUB)
-    if rule_result:
-
-        # exprMul
-        token_iterator, rule_result = rule_expr_mul(token_iterator)
-        if rule_result:
-
-            # exprAddAux
-            token_iterator, rule_result = rule_expr_add_aux(token_iterator)
-            if rule_result:
-
-                return token_iterator, True
-
-        else:
-            raise SyntaxErrorException(next(token_iterator), "invalid expression after -")
-
-    # e
-    return fallback_iterator, True
-
-
-# grammar rule:
-# exprAdd: exprMul exprAddAux
-def rule_expr_add(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # exprMul
-    token_iterator, rule_result = rule_expr_mul(token_iterator)
-    if rule_result:
-
-        # exprAddAux
-        token_iterator, rule_result = rule_expr_add_aux(token_iterator)
-        if rule_result:
-            return token_iterator, True
-
-    return fallback_iterator, False
-
-
-# auxiliary grammar rule:
-# exprRelAux: ( LESS | LESSEQ | GREATER | GREATEREQ ) exprAdd exprRelAux | e
-def rule_expr_rel_aux(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # LESS
-    token_iterator, rule_result = consume(token_iterator, Code.LESS)
-    if rule_result:
-
-        # exprAdd
-        token_iterator, rule_result = rule_expr_add(token_iterator)
-        if rule_result:
-
-            # exprRelAux
-            token_iterator, rule_result = rule_expr_rel_aux(token_iterator)
-            if rule_result:
-                return token_iterator, True
+    token_iterator, expr = rule_expr_cast(token_iterator)
+    if not expr:
+        return token_iterator, False
 
-        else:
-            raise SyntaxErrorException(next(token_iterator), "invalid expression after <")
-
-    # LESSEQ
-    token_iterator, rule_result = consume(token_iterator, Code.LESSEQ)
-    if rule_result:
-
-        # exprAdd
-        token_iterator, rule_result = rule_expr_add(token_iterator)
-        if rule_result:
-
-            # exprRelAux
-            token_iterator, rule_result = rule_expr_rel_aux(token_iterator)
-            if rule_result:
-                return token_iterator, True
-
-        else:
-            raise SyntaxErrorException(next(token_iterator), "invalid expression after <=")
-
-    # GREATER
-    token_iterator, rule_result = consume(token_iterator, Code.GREATER)
-    if rule_result:
-
-        # exprAdd
-        token_iterator, rule_result = rule_expr_add(token_iterator)
-        if rule_result:
-
-            # exprRelAux
-            token_iterator, rule_result = rule_expr_rel_aux(token_iterator)
-            if rule_result:
-                return token_iterator, True
-
-        else:
-            raise SyntaxErrorException(next(token_iterator), "invalid expression after >")
-
-    # GREATEREQ
-    token_iterator, rule_result = consume(token_iterator, Code.GREATEREQ)
-    if rule_result:
-
-        # exprAdd
-        token_iterator, rule_result = rule_expr_add(token_iterator)
-        if rule_result:
-
-            # exprRelAux
-            token_iterator, rule_result = rule_expr_rel_aux(token_iterator)
-            if rule_result:
-                return token_iterator, True
-
-        else:
-            raise SyntaxErrorException(next(token_iterator), "invalid expression after >=")
-
-    # e
-    return fallback_iterator, True
-
-
-# grammar rule:
-# exprRel: exprAdd exprRelAux
-def rule_expr_rel(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # exprAdd
-    token_iterator, rule_result = rule_expr_add(token_iterator)
-    if rule_result:
-
-        # exprRelAux
-        token_iterator, rule_result = rule_expr_rel_aux(token_iterator)
-        if rule_result:
-            return token_iterator, True
-
-    return fallback_iterator, False
-
-
-# auxiliary grammar rule:
-# exprEqAux: ( EQUAL | NOTEQ ) exprRel exprEqAux | e
-def rule_expr_eq_aux(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # EQUAL
-    token_iterator, rule_result = consume(token_iterator, Code.EQUAL)
-    if rule_result:
-
-        # exprRel
-        token_iterator, rule_result = rule_expr_rel(token_iterator)
-        if rule_result:
-
-            # exprEqAux
-            token_iterator, rule_result = rule_expr_eq_aux(token_iterator)
-            if rule_result:
-                return token_iterator, True
-
-        else:
-            raise SyntaxErrorException(next(token_iterator), "invalid expression after ==")
-
-    # NOTEQ
-    token_iterator, rule_result = consume(token_iterator, Code.NOTEQ)
-    if rule_result:
-
-        # exprRel
-        token_iterator, rule_result = rule_expr_rel(token_iterator)
-        if rule_result:
-
-            # exprEqAux
-            token_iterator, rule_result = rule_expr_eq_aux(token_iterator)
-            if rule_result:
-                return token_iterator, True
-
-        else:
-            raise SyntaxErrorException(next(token_iterator), "invalid expression after !=")
+    return parse_operators(token_iterator, min_precedence, expr)
 
-    # e
-    return fallback_iterator, True
 
+# the binary operators after an operand (left), with their right operands, as long as they bind at least as tight as
+# min_precedence; the operators of the same precedence group to the left
+def parse_operators(token_iterator: TokenCursor, min_precedence: int, left):
+    while True:
+        operator = token_iterator.peek_code()
+        precedence = binary_precedences.get(operator)
+        if precedence is None or precedence < min_precedence:
+            return token_iterator, left
 
-# grammar rule:
-# exprEq: exprRel exprEqAux
-def rule_expr_eq(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # exprRel
-    token_iterator, rule_result = rule_expr_rel(token_iterator)
-    if rule_result:
-
-        # exprEqAux
-        token_iterator, rule_result = rule_expr_eq_aux(token_iterator)
-        if rule_result:
-            return token_iterator, True
-
-    return fallback_iterator, False
-
-
-# auxiliary grammar rule:
-# exprAndAux: AND exprEq exprAndAux | e
-def rule_expr_and_aux(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # AND
-    token_iterator, rule_result = consume(token_iterator, Code.AND)
-    if rule_result:
-
-        # exprEq
-        token_iterator, rule_result = rule_expr_eq(token_iterator)
-        if rule_result:
-
-            # exprAndAux
-            token_iterator, rule_result = rule_expr_and_aux(token_iterator)
-            if rule_result:
-                return token_iterator, True
-
-        else:
-            raise SyntaxErrorException(next(token_iterator), "invalid expression after &&")
-
-    # e
-    return fallback_iterator, True
-
-
-# grammar rule:
-# exprAnd: exprEq exprAndAux
-def rule_expr_and(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # exprEq
-    token_iterator, rule_result = rule_expr_eq(token_iterator)
-    if rule_result:
-
-        # exprAndAux
-        token_iterator, rule_result = rule_expr_and_aux(token_iterator)
-        if rule_result:
-            return token_iterator, True
-
-    return fallback_iterator, False
-
-
-# auxiliary grammar rule:
-# exprOrAux: OR exprAnd exprOrAux | e
-def rule_expr_or_aux(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # OR
-    token_iterator, rule_result = consume(token_iterator, Code.OR)
-    if rule_result:
-
-        # exprAnd
-        token_iterator, rule_result = rule_expr_and(token_iterator)
-        if rule_result:
-
-            # exprOrAux
-            token_iterator, rule_result = rule_expr_or_aux(token_iterator)
-            if rule_result:
-                return token_iterator, True
-
-        else:
-            raise SyntaxErrorException(next(token_iterator), "invalid expression after ||")
-
-    # e
-    return fallback_iterator, True
-
-
-# grammar rule:
-# exprOr: exprAnd exprOrAux
-def rule_expr_or(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # exprAnd
-    token_iterator, rule_result = rule_expr_and(token_iterator)
-    if rule_result:
+        token_iterator.advance()
 
-        # exprOrAux
-        token_iterator, rule_result = rule_expr_or_aux(token_iterator)
-        if rule_result:
-            return token_iterator, True
+        # the right operand, e.g. exprMul after ADD
+        token_iterator, right = parse_binary(token_iterator, precedence + 1)
+        if not right:
+            raise SyntaxErrorException(next(token_iterator), "invalid expression after " + operator_names[operator])
 
-    return fallback_iterator, False
+        left = Binary(operator, left, right, left.line)
 
 
-# grammar rule:
+# grammar rules:
+# expr: exprAssign
 # exprAssign: exprUnary ASSIGN exprAssign | exprOr
-def rule_expr_assign(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+def rule_expr(token_iterator: TokenCursor):
+    # exprOr starting with a cast, no exprUnary starts with LPAR typeBase
+    if token_iterator.peek_code() is Code.LPAR and token_iterator.lookahead(1) in type_base_first:
+        return parse_binary(token_iterator, lowest_precedence)
 
     # exprUnary
-    token_iterator, rule_result = rule_expr_unary(token_iterator)
-    if rule_result:
-
-        # ASSIGN
-        token_iterator, rule_result = consume(token_iterator, Code.ASSIGN)
-        if rule_result:
-
-            # exprAssign
-            token_iterator, rule_result = rule_expr_assign(token_iterator)
-            if rule_result:
-
-                return token_iterator, True
+    token_iterator, expr = rule_expr_unary(token_iterator)
+    if not expr:
+        return token_iterator, False
 
-            else:
-                # return fallback_iterator, False
-                raise SyntaxErrorException(next(token_iterator),
-                                           "invalid expression after =")
-
-            # exprOr can be reduced to an unary expression, so every exprOr will be considered assignation unless
-            # you let both the branches check
-
-    # exprOr
-    token_iterator = copy.deepcopy(fallback_iterator)
-    token_iterator, rule_result = rule_expr_or(token_iterator)
+    # ASSIGN
+    token_iterator, rule_result = consume(token_iterator, Code.ASSIGN)
     if rule_result:
-        return token_iterator, True
 
-    return fallback_iterator, False
+        # exprAssign
+        token_iterator, value = rule_expr(token_iterator)
+        if value:
 
+            return token_iterator, Assign(expr, value, expr.line)
 
-# grammar rule:
-# expr: exprAssign
-def rule_expr(token_iterator: list):
-    # exprAssign
-    token_iterator, rule_result = rule_expr_assign(token_iterator)
-    if rule_result:
-        return token_iterator, True
+        else:
+            raise SyntaxErrorException(next(token_iterator),
+                                       "invalid expression after =")
 
-    return token_iterator, False
+    # exprOr, the exprUnary is also the exprCast it starts with
+    return parse_operators(token_iterator, lowest_precedence, expr)
 
 
 # grammar rule:
 # stmCompound: LACC ( varDef | stm )* RACC
-def rule_stm_compound(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+def rule_stm_compound(token_iterator: TokenCursor):
+    fallback_position = token_iterator.mark()
 
     # LACC
-    token_iterator, rule_result = consume(token_iterator, Code.LACC)
-    if rule_result:
+    token_iterator, tk = consume_token(token_iterator, Code.LACC)
+    if tk is not None:
+        items = []
 
-        # ( varDef | stm )*
+        # ( varDef | stm )* RACC
         while True:
 
-            # varDef
-            token_iterator, rule_result = rule_var_def(token_iterator)
+            # no rule backtracks over a whole statement, so the tokens before it are no longer needed
+            token_iterator.commit()
+            item_position = token_iterator.mark()
 
-            # stm
-            if not rule_result:
-                token_iterator, rule_result = rule_stm(token_iterator)
-                if not rule_result:
-                    break
+            try:
+                # varDef
+                if token_iterator.peek_code() in var_def_first:
+                    token_iterator, item = rule_var_def(token_iterator)
 
-        # RACC
-        token_iterator, rule_result = consume(token_iterator, Code.RACC)
-        if rule_result:
+                # stm
+                else:
+                    token_iterator, item = rule_stm(token_iterator)
 
-            return token_iterator, True
+                if item:
+                    if not token_iterator.recognize:
+                        items.append(item)
+                    continue
 
-        else:
-            raise SyntaxErrorException(next(token_iterator), "no } after {")
+                # RACC
+                token_iterator, rule_result = consume(token_iterator, Code.RACC)
+                if rule_result:
+
+                    return token_iterator, CompoundStm(items, tk.line)
+
+                else:
+                    raise SyntaxErrorException(next(token_iterator), "no } after {")
+
+            # in the recovering mode, the statement is dropped and the analysis goes on after it
+            except SyntaxErrorException as exc:
+                recover(token_iterator, exc, item_position, False)
 
-    return fallback_iterator, False
+    token_iterator.reset(fallback_position)
+    return token_iterator, False
 
 
 # grammar rule:
@@ -707,48 +403,48 @@ def rule_stm_compound(token_iterator: iter):
 # | BREAK SEMICOLON
 # | RETURN expr? SEMICOLON
 # | expr? SEMICOLON
-def rule_stm(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+def rule_stm(token_iterator: TokenCursor):
+    fallback_position = token_iterator.mark()
+    production = stm_table.get(token_iterator.peek_code())
 
     # stmCompound
-    token_iterator, rule_result = rule_stm_compound(token_iterator)
-    if rule_result:
-        return token_iterator, True
+    if production == 0:
+        return rule_stm_compound(token_iterator)
 
     # IF
-    token_iterator, rule_result = consume(token_iterator, Code.IF)
-    if rule_result:
+    if production == 1:
+        tk = next(token_iterator)
 
         # LPAR
         token_iterator, rule_result = consume(token_iterator, Code.LPAR)
         if rule_result:
 
             # expr
-            token_iterator, rule_result = rule_expr(token_iterator)
-            if rule_result:
+            token_iterator, condition = rule_expr(token_iterator)
+            if condition:
 
                 # RPAR
                 token_iterator, rule_result = consume(token_iterator, Code.RPAR)
                 if rule_result:
 
                     # stm
-                    token_iterator, rule_result = rule_stm(token_iterator)
-                    if rule_result:
+                    token_iterator, then_stm = rule_stm(token_iterator)
+                    if then_stm:
 
                         # ELSE?
                         token_iterator, rule_result = consume(token_iterator, Code.ELSE)
                         if rule_result:
 
                             # stm
-                            token_iterator, rule_result = rule_stm(token_iterator)
-                            if rule_result:
+                            token_iterator, else_stm = rule_stm(token_iterator)
+                            if else_stm:
 
-                                return token_iterator, True
+                                return token_iterator, IfStm(condition, then_stm, else_stm, tk.line)
 
                             else:
                                 raise SyntaxErrorException(next(token_iterator), "no statement after else")
 
-                        return token_iterator, True
+                        return token_iterator, IfStm(condition, then_stm, None, tk.line)
 
                     else:
                         raise SyntaxErrorException(next(token_iterator), "no statement after if")
@@ -763,27 +459,26 @@ def rule_stm(token_iterator: iter):
             raise SyntaxErrorException(next(token_iterator), "no ( after if")
 
     # WHILE
-    token_iterator = copy.deepcopy(fallback_iterator)
-    token_iterator, rule_result = consume(token_iterator, Code.WHILE)
-    if rule_result:
+    if production == 2:
+        tk = next(token_iterator)
 
         # LPAR
         token_iterator, rule_result = consume(token_iterator, Code.LPAR)
         if rule_result:
 
             # expr
-            token_iterator, rule_result = rule_expr(token_iterator)
-            if rule_result:
+            token_iterator, condition = rule_expr(token_iterator)
+            if condition:
 
                 # RPAR
                 token_iterator, rule_result = consume(token_iterator, Code.RPAR)
                 if rule_result:
 
                     # stm
-                    token_iterator, rule_result = rule_stm(token_iterator)
-                    if rule_result:
+                    token_iterator, body = rule_stm(token_iterator)
+                    if body:
 
-                        return token_iterator, True
+                        return token_iterator, WhileStm(condition, body, tk.line)
 
                     else:
                         raise SyntaxErrorException(next(token_iterator), "no statement after while")
@@ -798,40 +493,40 @@ def rule_stm(token_iterator: iter):
             raise SyntaxErrorException(next(token_iterator), "no ( after while")
 
     # FOR
-    token_iterator = copy.deepcopy(fallback_iterator)
-    token_iterator, rule_result = consume(token_iterator, Code.FOR)
-    if rule_result:
+    if production == 3:
+        tk = next(token_iterator)
 
         # LPAR
         token_iterator, rule_result = consume(token_iterator, Code.LPAR)
         if rule_result:
 
             # expr?
-            token_iterator, _ = rule_expr(token_iterator)
+            token_iterator, init = rule_expr(token_iterator)
 
             # SEMICOLON
             token_iterator, rule_result = consume(token_iterator, Code.SEMICOLON)
             if rule_result:
 
                 # expr?
-                token_iterator, _ = rule_expr(token_iterator)
+                token_iterator, condition = rule_expr(token_iterator)
 
                 # SEMICOLON
                 token_iterator, rule_result = consume(token_iterator, Code.SEMICOLON)
                 if rule_result:
 
                     # expr?
-                    token_iterator, _ = rule_expr(token_iterator)
+                    token_iterator, step = rule_expr(token_iterator)
 
                     # RPAR
                     token_iterator, rule_result = consume(token_iterator, Code.RPAR)
                     if rule_result:
 
                         # stm
-                        token_iterator, rule_result = rule_stm(token_iterator)
-                        if rule_result:
+                        token_iterator, body = rule_stm(token_iterator)
+                        if body:
 
-                            return token_iterator, True
+                            return token_iterator, ForStm(init or None, condition or None, step or None, body,
+                                                          tk.line)
 
                         else:
                             raise SyntaxErrorException(next(token_iterator), "no statement after for")
@@ -848,283 +543,238 @@ def rule_stm(token_iterator: iter):
         raise SyntaxErrorException(next(token_iterator), "no ( after FOR")
 
     # BREAK
-    token_iterator = copy.deepcopy(fallback_iterator)
-    token_iterator, rule_result = consume(token_iterator, Code.BREAK)
-    if rule_result:
+    if production == 4:
+        tk = next(token_iterator)
 
         # SEMICOLON
         token_iterator, rule_result = consume(token_iterator, Code.SEMICOLON)
         if rule_result:
 
-            return token_iterator, True
+            return token_iterator, BreakStm(tk.line)
 
         else:
             raise SyntaxErrorException(next(token_iterator), "no ; after break")
 
     # RETURN
-    token_iterator = copy.deepcopy(fallback_iterator)
-    token_iterator, rule_result = consume(token_iterator, Code.RETURN)
-    if rule_result:
+    if production == 5:
+        tk = next(token_iterator)
 
         # expr?
-        token_iterator, _ = rule_expr(token_iterator)
+        token_iterator, expr = rule_expr(token_iterator)
 
         # SEMICOLON
         token_iterator, rule_result = consume(token_iterator, Code.SEMICOLON)
         if rule_result:
 
-            return token_iterator, True
+            return token_iterator, ReturnStm(expr or None, tk.line)
 
         else:
             raise SyntaxErrorException(next(token_iterator), "no ; after return")
 
+    # no statement starts with this token
+    if production is None:
+        return token_iterator, False
+
     # expr?
-    token_iterator = copy.deepcopy(fallback_iterator)
-    token_iterator, _ = rule_expr(token_iterator)
+    token_iterator, expr = rule_expr(token_iterator)
 
     # SEMICOLON
-    token_iterator, rule_result = consume(token_iterator, Code.SEMICOLON)
-    if rule_result:
-        return token_iterator, True
+    token_iterator, tk = consume_token(token_iterator, Code.SEMICOLON)
+    if tk is not None:
+        return token_iterator, ExprStm(expr, expr.line) if expr else ExprStm(None, tk.line)
 
     # we cannot raise an error regarding the semicolon here,
     # because there are others rules which can be satisfied
     # so instead, the error will come from the stm_compound rule,
     # trying to find the } for the function definition
 
-    return fallback_iterator, False
+    token_iterator.reset(fallback_position)
+    return token_iterator, False
 
 
 # grammar rule:
 # fnParam: typeBase ID arrayDecl?
-def rule_fn_param(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+def rule_fn_param(token_iterator: TokenCursor):
+    fallback_position = token_iterator.mark()
 
     # typeBase
-    token_iterator, rule_result = rule_type_base(token_iterator)
-    if rule_result:
+    token_iterator, param_type = rule_type_base(token_iterator)
+    if param_type:
 
         # ID
-        token_iterator, rule_result = consume(token_iterator, Code.ID)
-        if rule_result:
+        token_iterator, tk = consume_token(token_iterator, Code.ID)
+        if tk is not None:
 
             # arrayDecl?
-            token_iterator, _ = rule_array_decl(token_iterator)
+            token_iterator, array_size = rule_array_decl(token_iterator)
 
-            return token_iterator, True
+            return token_iterator, VarDef(array_type(param_type, array_size), tk.value, param_type.line)
 
         else:
             raise SyntaxErrorException(next(token_iterator),
                                        "no variable name after type declaration in function parameter definition")
 
-    return fallback_iterator, False
+    token_iterator.reset(fallback_position)
+    return token_iterator, False
 
 
 # grammar rule:
-# fnDef: ( typeBase | VOID ) ID LPAR ( fnParam ( COMMA fnParam )* )? RPAR stmCompound
-def rule_fn_def(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
-
-    # typeBase
-    token_iterator, rule_result = rule_type_base(token_iterator)
-    if rule_result:
-
-        # ID
-        token_iterator, rule_result = consume(token_iterator, Code.ID)
-        if rule_result:
-
-            # LPAR
-            token_iterator, rule_result = consume(token_iterator, Code.LPAR)
-            if rule_result:
+# fnDef: ( typeBase | VOID ) ID LPAR ( fnParam ( COMMA fnParam )* )? RPAR stm
+def rule_fn_def(token_iterator: TokenCursor):
+    fallback_position = token_iterator.mark()
 
-                # ( fnParam ( COMMA fnParam )* )?
+    # VOID
+    if token_iterator.peek_code() is Code.VOID:
+        tk = next(token_iterator)
+        fn_type = Type(Code.VOID, None, -1, tk.line)
 
-                # fnParam
-                token_iterator, rule_result = rule_fn_param(token_iterator)
-                if rule_result:
+    # typeBase
+    else:
+        token_iterator, fn_type = rule_type_base(token_iterator)
+        if not fn_type:
+            return token_iterator, False
 
-                    while True:
+    # ID
+    token_iterator, tk = consume_token(token_iterator, Code.ID)
+    if tk is not None:
 
-                        # COMMA
-                        token_iterator, rule_result = consume(token_iterator, Code.COMMA)
-                        if rule_result:
+        # LPAR
+        token_iterator, rule_result = consume(token_iterator, Code.LPAR)
+        if rule_result:
+            params = []
 
-                            # fnParam
-                            token_iterator, rule_result = rule_fn_param(token_iterator)
-                            if not rule_result:
-                                raise SyntaxErrorException(next(token_iterator),
-                                                           "no function parameter after comma")
+            # ( fnParam ( COMMA fnParam )* )?
 
-                        else:
-                            break
+            # fnParam
+            token_iterator, param = rule_fn_param(token_iterator)
+            if param:
+                params.append(param)
 
-                # RPAR
-                token_iterator, rule_result = consume(token_iterator, Code.RPAR)
-                if rule_result:
+                while True:
 
-                    # stm
-                    token_iterator, rule_result = rule_stm(token_iterator)
+                    # COMMA
+                    token_iterator, rule_result = consume(token_iterator, Code.COMMA)
                     if rule_result:
 
-                        return token_iterator, True
+                        # fnParam
+                        token_iterator, param = rule_fn_param(token_iterator)
+                        if not param:
+                            raise SyntaxErrorException(next(token_iterator),
+                                                       "no function parameter after comma")
+                        params.append(param)
 
                     else:
-                        raise SyntaxErrorException(next(token_iterator),
-                                                   "missing { after function definition")
-
-                else:
-                    raise SyntaxErrorException(next(token_iterator), "no ) after ( in function definition")
-
-            else:
-                # not error, might be variable declaration
-                return fallback_iterator, False
-
-        else:
-            # not error, might be cast
-            return fallback_iterator, False
-
-    # VOID
-    token_iterator, rule_result = consume(token_iterator, Code.VOID)
-    if rule_result:
-
-        # ID
-        token_iterator, rule_result = consume(token_iterator, Code.ID)
-        if rule_result:
+                        break
 
-            # LPAR
-            token_iterator, rule_result = consume(token_iterator, Code.LPAR)
+            # RPAR
+            token_iterator, rule_result = consume(token_iterator, Code.RPAR)
             if rule_result:
 
-                # ( fnParam ( COMMA fnParam )* )?
-
-                # fnParam
-                token_iterator, rule_result = rule_fn_param(token_iterator)
-                if rule_result:
-
-                    while True:
-
-                        # COMMA
-                        token_iterator, rule_result = consume(token_iterator, Code.COMMA)
-                        if rule_result:
+                # stm
+                token_iterator, body = rule_stm(token_iterator)
+                if body:
 
-                            # fnParam
-                            token_iterator, rule_result = rule_fn_param(token_iterator)
-                            if not rule_result:
-                                raise SyntaxErrorException(next(token_iterator),
-                                                           "no function parameter after comma")
-
-                        else:
-                            break
-
-                # RPAR
-                token_iterator, rule_result = consume(token_iterator, Code.RPAR)
-                if rule_result:
-
-                    # stm
-                    token_iterator, rule_result = rule_stm(token_iterator)
-                    if rule_result:
-
-                        return token_iterator, True
-
-                    else:
-                        raise SyntaxErrorException(next(token_iterator),
-                                                   "missing { after function definition")
+                    return token_iterator, FnDef(fn_type, tk.value, params, body, fn_type.line)
 
                 else:
-                    raise SyntaxErrorException(next(token_iterator), "no ) after ( in function definition")
+                    raise SyntaxErrorException(next(token_iterator),
+                                               "missing { after function definition")
 
             else:
-                # not error, might be variable declaration
-                return fallback_iterator, False
+                raise SyntaxErrorException(next(token_iterator), "no ) after ( in function definition")
 
         else:
-            # not error, might be cast?
-            return fallback_iterator, False
+            # not error, might be variable declaration
+            token_iterator.reset(fallback_position)
+            return token_iterator, False
 
-    return fallback_iterator, False
+    else:
+        # not error, might be cast
+        token_iterator.reset(fallback_position)
+        return token_iterator, False
 
 
 # grammar rule:
 # arrayDecl: LBRACKET CT_INT? RBRACKET
-def rule_array_decl(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+# the result is the size of the array instead of a node: the CT_INT, 0 without one, None if there is no arrayDecl
+def rule_array_decl(token_iterator: TokenCursor):
+    fallback_position = token_iterator.mark()
 
     # LBRACKET
     token_iterator, rule_result = consume(token_iterator, Code.LBRACKET)
     if rule_result:
 
         # CT_INT? (was expr? before)
-        token_iterator, _ = consume(token_iterator, Code.CT_INT)
+        token_iterator, tk = consume_token(token_iterator, Code.CT_INT)
 
         # RBRACKET
         token_iterator, rule_result = consume(token_iterator, Code.RBRACKET)
         if rule_result:
 
-            return token_iterator, True
+            return token_iterator, 0 if tk is None else tk.value
 
         else:
             raise SyntaxErrorException(next(token_iterator), "no ] after [ in array declaration")
 
-    return fallback_iterator, False
+    token_iterator.reset(fallback_position)
+    return token_iterator, None
 
 
-# grammar rule:
-# typeBase: INT | DOUBLE | CHAR | STRUCT ID
-def rule_type_base(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+# the type declared by a typeBase followed by an arrayDecl? (array_size is the result of rule_array_decl())
+def array_type(base_type: Type, array_size: int):
+    if array_size is None:
+        return base_type
 
-    # INT
-    token_iterator, rule_result = consume(token_iterator, Code.INT)
-    if rule_result:
-        return token_iterator, True
+    return Type(base_type.base, base_type.struct_name, array_size, base_type.line)
 
-    # DOUBLE
-    token_iterator, rule_result = consume(token_iterator, Code.DOUBLE)
-    if rule_result:
-        return token_iterator, True
 
-    # CHAR
-    token_iterator, rule_result = consume(token_iterator, Code.CHAR)
-    if rule_result:
-        return token_iterator, True
+# grammar rule:
+# typeBase: INT | DOUBLE | CHAR | STRUCT ID
+def rule_type_base(token_iterator: TokenCursor):
+    production = type_base_table.get(token_iterator.peek_code())
+
+    # INT | DOUBLE | CHAR
+    if production in (0, 1, 2):
+        tk = next(token_iterator)
+        return token_iterator, Type(tk.code, None, -1, tk.line)
 
     # STRUCT
-    token_iterator, rule_result = consume(token_iterator, Code.STRUCT)
-    if rule_result:
+    if production == 3:
+        tk = next(token_iterator)
 
         # ID
-        token_iterator, rule_result = consume(token_iterator, Code.ID)
-        if rule_result:
+        token_iterator, name = consume_token(token_iterator, Code.ID)
+        if name is not None:
 
-            return token_iterator, True
+            return token_iterator, Type(Code.STRUCT, name.value, -1, tk.line)
 
         else:
             raise SyntaxErrorException(next(token_iterator), "no { in struct type definition or no ID after struct")
 
-    return fallback_iterator, False
+    return token_iterator, False
 
 
 # grammar rule:
 # varDef: typeBase ID arrayDecl? SEMICOLON
-def rule_var_def(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+def rule_var_def(token_iterator: TokenCursor):
+    fallback_position = token_iterator.mark()
 
     # typeBase
-    token_iterator, rule_result = rule_type_base(token_iterator)
-    if rule_result:
+    token_iterator, var_type = rule_type_base(token_iterator)
+    if var_type:
 
         # ID
-        token_iterator, rule_result = consume(token_iterator, Code.ID)
-        if rule_result:
+        token_iterator, tk = consume_token(token_iterator, Code.ID)
+        if tk is not None:
 
             # arrayDecl?
-            token_iterator, _ = rule_array_decl(token_iterator)
+            token_iterator, array_size = rule_array_decl(token_iterator)
 
             # SEMICOLON
             token_iterator, rule_result = consume(token_iterator, Code.SEMICOLON)
             if rule_result:
 
-                return token_iterator, True
+                return token_iterator, VarDef(array_type(var_type, array_size), tk.value, var_type.line)
 
             else:
                 raise SyntaxErrorException(next(token_iterator), "no ; after variable definition")
@@ -1132,33 +782,37 @@ def rule_var_def(token_iterator: iter):
         else:
             raise SyntaxErrorException(next(token_iterator), "no identifier after type")
 
-    return fallback_iterator, False
+    token_iterator.reset(fallback_position)
+    return token_iterator, False
 
 
 # grammar rule:
 # structDef: STRUCT ID LACC varDef* RACC SEMICOLON
-def rule_struct_def(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+def rule_struct_def(token_iterator: TokenCursor):
+    fallback_position = token_iterator.mark()
 
     # STRUCT
-    token_iterator, rule_result = consume(token_iterator, Code.STRUCT)
-    if rule_result:
+    token_iterator, tk = consume_token(token_iterator, Code.STRUCT)
+    if tk is not None:
 
         # ID
-        token_iterator, rule_result = consume(token_iterator, Code.ID)
-        if rule_result:
+        token_iterator, name = consume_token(token_iterator, Code.ID)
+        if name is not None:
 
             # LACC
             token_iterator, rule_result = consume(token_iterator, Code.LACC)
             if rule_result:
+                fields = []
 
                 # varDef*
                 while True:
 
-                    token_iterator, rule_result = rule_var_def(token_iterator)
-                    if not rule_result:
+                    token_iterator, field = rule_var_def(token_iterator)
+                    if not field:
                         break
 
+                    fields.append(field)
+
                 # RACC
                 token_iterator, rule_result = consume(token_iterator, Code.RACC)
                 if rule_result:
@@ -1167,7 +821,7 @@ def rule_struct_def(token_iterator: iter):
                     token_iterator, rule_result = consume(token_iterator, Code.SEMICOLON)
                     if rule_result:
 
-                        return token_iterator, True
+                        return token_iterator, StructDef(name.value, fields, tk.line)
 
                     else:
                         raise SyntaxErrorException(next(token_iterator), "no semicolon after struct type definition")
@@ -1178,48 +832,190 @@ def rule_struct_def(token_iterator: iter):
             else:
                 # don't raise exception here, it might be a struct type definition, not a struct variable declaration
                 # raise SyntaxErrorException(next(token_iterator), "unnamed struct declared")
-                return fallback_iterator, False
+                token_iterator.reset(fallback_position)
+                return token_iterator, False
 
         else:
             raise SyntaxErrorException(next(token_iterator), "unnamed struct")
 
-    return fallback_iterator, False
+    token_iterator.reset(fallback_position)
+    return token_iterator, False
 
 
 # grammar rule:
-# unit: ( structDef | fnDef | varDef )* END
-def rule_unit(token_iterator: iter):
-    fallback_iterator = copy.deepcopy(token_iterator)
+# structDef | fnDef | varDef, the top-level declarations of unit
+# no declaration goes on after its last token, so this is also how a declaration is analyzed on its own (see
+# incremental.py)
+def rule_declaration(token_iterator: TokenCursor):
+    code = token_iterator.peek_code()
+
+    # the number of tokens of the typeBase the declaration starts with
+    type_length = 2 if code is Code.STRUCT else 1
+
+    # structDef: STRUCT ID LACC, or STRUCT without a name, which is an error in structDef
+    if code is Code.STRUCT and (token_iterator.lookahead(1) is not Code.ID or token_iterator.lookahead(2) is Code.LACC):
+        return rule_struct_def(token_iterator)
 
-    # ( structDef | fnDef | varDef )*
+    # fnDef: ( typeBase | VOID ) ID LPAR
+    if code is Code.VOID or (code in type_base_first and token_iterator.lookahead(type_length) is Code.ID
+                             and token_iterator.lookahead(type_length + 1) is Code.LPAR):
+        return rule_fn_def(token_iterator)
+
+    # varDef
+    if code in var_def_first:
+        return rule_var_def(token_iterator)
+
+    return token_iterator, False
+
+
+# ( structDef | fnDef | varDef )* END, the loop of unit, from the position of the cursor; adds the declarations it
+# finds to declarations (none in recognize mode) and returns the cursor after END
+# chunks: the declarations already analyzed some other way (see parallel.py), start position -> the position after
+# them and their declarations (True when only recognized); the loop takes them instead of analyzing their tokens
+def unit_declarations(token_iterator: TokenCursor, declarations: list, chunks: dict = None):
     while True:
 
-        # structDef
-        token_iterator, rule_result = rule_struct_def(token_iterator)
-        if not rule_result:
+        # no rule backtracks over a whole declaration, so the tokens before it are no longer needed
+        token_iterator.commit()
+        declaration_position = token_iterator.mark()
+
+        chunk = chunks.get(declaration_position) if chunks else None
+        if chunk is not None:
+            end, chunk_declarations = chunk
+            if chunk_declarations is not True and not token_iterator.recognize:
+                declarations += chunk_declarations
+            token_iterator.reset(end)
+            continue
+
+        try:
+            # structDef | fnDef | varDef
+            token_iterator, declaration = rule_declaration(token_iterator)
+            if declaration:
+                if not token_iterator.recognize:
+                    declarations.append(declaration)
+                continue
+
+            # END
+            token_iterator, rule_result = consume(token_iterator, Code.END)
+            if rule_result:
+
+                return token_iterator
 
-            # fnDef
-            token_iterator, rule_result = rule_fn_def(token_iterator)
-            if not rule_result:
+            else:
+                raise SyntaxErrorException(next(token_iterator), "invalid token found")
 
-                # varDef
-                token_iterator, rule_result = rule_var_def(token_iterator)
-                if not rule_result:
-                    break
+        # in the recovering mode, the declaration is dropped and the analysis goes on after it
+        except SyntaxErrorException as exc:
+            recover(token_iterator, exc, declaration_position, True)
 
-    # END
-    token_iterator, rule_result = consume(token_iterator, Code.END)
-    if rule_result:
 
-        return token_iterator, True
+# grammar rule:
+# unit: ( structDef | fnDef | varDef )* END
+def rule_unit(token_iterator: TokenCursor):
+    declarations = []
+    line = token_iterator.peek().line
 
-    else:
-        raise SyntaxErrorException(next(token_iterator), "invalid token found")
+    # ( structDef | fnDef | varDef )* END
+    token_iterator = unit_declarations(token_iterator, declarations)
+
+    return token_iterator, True if token_iterator.recognize else Unit(declarations, line)
+
+
+# the rules again, calling each other through their memoized versions, for the packrat mode
+# a copy, so the rules cost nothing more when the packrat mode is off
+packrat_rules = memoized_rules(globals())
+
+
+# the rules again, recording their calls in the ParserProfile of the cursor, for the profiling mode
+# a copy too, so the rules cost nothing more when profiling is off
+profiling_rules = profiled_rules(globals())
 
 
-def analyze(tokens):
-    token_iterator = iter(tokens)
+# the unit rule to start the analysis with, with a PackratMemo for the cursor in packrat mode, and the profile for
+# the cursor in profiling mode
+def start_rule(token_iterator: TokenCursor, packrat: bool, profile: ParserProfile = None):
+    if profile is not None:
+        if packrat:
+            raise ValueError("the packrat mode cannot be profiled")
+
+        token_iterator.profile = profile
+        profile.watch(token_iterator)
+        return profiling_rules["rule_unit"]
+
+    if packrat:
+        token_iterator.memo = PackratMemo()
+        return packrat_rules["rule_unit"]
+
+    return rule_unit
+
+
+# returns the syntax tree of the tokens, its Unit node (see syntax_tree.py)
+# the tokens can be a list of Token objects or a TokenStream
+# packrat: memoize the result of every rule at every token position (see packrat.py), so no token span is parsed
+# twice by the same rule, whatever the grammar backtracks over; off by default, the rules barely backtrack
+# recognize: only check that the tokens follow the grammar, without building the tree, and return True; this runs the
+# analysis of stack_analyzer.py, on the codes of the tokens alone, so no Token object or node is created
+# stack: run on an explicit stack instead of recursive calls (see stack_analyzer.py), so the nesting depth is not bound
+# by the recursion limit of python; the stack analyzer does not build the tree, so this implies recognize
+# generated: recognize with the table-driven parser which parser_generator.py generates from atomc.grammar
+# (generated_parser.py), no recursion either
+# profile: a ParserProfile to record the calls of every rule in (see profiler.py), off with None; only the analysis
+# which builds the tree, without packrat, can be profiled
+# the errors are the same in all the modes
+def analyze(tokens, packrat: bool = False, stack: bool = False, recognize: bool = False, generated: bool = False,
+            profile: ParserProfile = None):
+    if profile is not None and (stack or recognize or generated):
+        raise ValueError("only the analysis which builds the tree can be profiled")
+
+    if generated:
+        from atomc.syntactic_analyzer.generated_parser import parse
+        return parse(tokens)
+
+    if stack or recognize:
+        from atomc.syntactic_analyzer.stack_analyzer import analyze_stack
+        return analyze_stack(tokens)
+
+    if isinstance(tokens, TokenStream):
+        token_iterator = PackedTokenCursor(tokens)
+    else:
+        token_iterator = TokenCursor(tokens)
 
     # I don't need to forward the declarations of functions as long as this function is the one which gets called first
     # here I will call the unit rule
-    _, analysis_result = rule_unit(token_iterator)
+    _, unit = start_rule(token_iterator, packrat, profile)(token_iterator)
+    return unit
+
+
+# same as analyze(), but the tokens are pulled from an iterator (e.g. iter_tokens()) as the analysis needs them
+# the lexer and the analyzer run interleaved, and only the tokens of the statement being analyzed are kept in memory
+# recognize: only check that the tokens follow the grammar and return True; the nodes of the statements and
+# declarations are dropped once analyzed, so the memory is bounded by the nesting depth, not by the input length
+# (the syntax tree itself grows with the input)
+def analyze_iter(tokens: iter, packrat: bool = False, recognize: bool = False, profile: ParserProfile = None):
+    token_iterator = StreamingTokenCursor(tokens)
+    token_iterator.recognize = recognize
+
+    _, unit = start_rule(token_iterator, packrat, profile)(token_iterator)
+    return unit
+
+
+# same as analyze(), but the analysis does not stop at the first syntax error: it records every error and goes on
+# (see recovery.py); after max_errors errors, it gives up
+# returns the syntax tree, without the statements and declarations which had errors (None if the analysis gave up),
+# and the list of errors (SyntaxErrorException objects, in the order of the source)
+def analyze_recovering(tokens, max_errors: int = default_max_errors, packrat: bool = False,
+                       profile: ParserProfile = None):
+    if isinstance(tokens, TokenStream):
+        token_iterator = PackedTokenCursor(tokens)
+    else:
+        token_iterator = TokenCursor(tokens)
+
+    token_iterator.errors = []
+    token_iterator.max_errors = max_errors
+
+    try:
+        _, unit = start_rule(token_iterator, packrat, profile)(token_iterator)
+    except SyntaxErrorException:
+        unit = None
+
+    return unit, token_iterator.errors
@@ -0,0 +1,109 @@
+import re
+
+from atomc.lexer.token import Code
+from atomc.lexer.token_stream import TokenStream
+
+# TOP-LEVEL DECLARATIONS:
+# nothing in the grammar goes from one top-level declaration into the next, so they can be analyzed one at a time
+# they are told apart from the braces and the semicolons alone, without analyzing them:
+# - a structDef (STRUCT ID LACC) ends with the SEMICOLON after its RACC
+# - a fnDef ends with its body: the RACC which closes it, or the SEMICOLON of a body which is not in braces
+# - a varDef ends with its SEMICOLON
+# so a declaration ends with a SEMICOLON outside of the braces and of the parentheses (of a for), or with the RACC
+# which closes the braces of a declaration which is not a structDef, unless an ELSE comes after it: the if of a body
+# which is not in braces goes on
+# for tokens which follow the grammar, these are exactly the declarations the analysis finds; for the others, the
+# analysis of a piece does not take all of its tokens, or reports an error
+
+STRUCT, ID, LACC, RACC, LPAR, RPAR, SEMICOLON, ELSE, END = (Code.STRUCT.value, Code.ID.value, Code.LACC.value,
+                                                            Code.RACC.value, Code.LPAR.value, Code.RPAR.value,
+                                                            Code.SEMICOLON.value, Code.ELSE.value, Code.END.value)
+
+# Code -> its value, faster than getting the value attribute of each
+code_values = {code: code.value for code in Code}
+
+# the codes the ends of the declarations are found from, the loops below only look at these
+boundary_pattern = re.compile(b"[" + re.escape(bytes([LACC, RACC, LPAR, RPAR, SEMICOLON, END])) + b"]")
+brace_pattern = re.compile(b"[" + re.escape(bytes([LACC, RACC, END])) + b"]")
+
+
+def starts_struct_def(codes: bytes, start: int):
+    return codes[start:start + 3] == bytes([STRUCT, ID, LACC])
+
+
+# the position of the RACC which closes the LACC at position, or of END if it is not closed
+def closing_brace(codes: bytes, position: int):
+    depth = 0
+    for match in brace_pattern.finditer(codes, position):
+        position = match.start()
+        code = codes[position]
+
+        if code == LACC:
+            depth += 1
+        elif code == RACC:
+            depth -= 1
+            if depth == 0:
+                return position
+        else:
+            return position
+
+    return len(codes)
+
+
+# the positions right after the top-level declarations, codes: the code values of the tokens, as bytes (END last)
+# the tokens from the last declaration to END make one more piece, if there are any (e.g. a declaration without its
+# SEMICOLON)
+# the semicolons inside the braces are skipped over, only the braces are counted there; so are the ones inside the
+# parentheses
+def split_declarations(codes: bytes):
+    ends = []
+    start = position = 0
+    parentheses = 0
+
+    while True:
+        match = boundary_pattern.search(codes, position)
+        if match is None:
+            return ends
+
+        position = match.start()
+        code = codes[position]
+
+        if code == END:
+            if position > start:
+                ends.append(position)
+            return ends
+
+        if code == LPAR or code == RPAR:
+            parentheses += 1 if code == LPAR else -1
+            position += 1
+            continue
+
+        if code == SEMICOLON and parentheses > 0:
+            position += 1
+            continue
+
+        if code == LACC:
+            position = closing_brace(codes, position)
+            if position == len(codes) or codes[position] == END:
+                continue
+
+            # the SEMICOLON after the RACC ends a structDef
+            if starts_struct_def(codes, start):
+                position += 1
+                continue
+
+        # the SEMICOLON of a declaration, the RACC which closes the body of a fnDef, or an RACC without an LACC
+        position += 1
+        if codes[position] == ELSE:
+            continue
+        ends.append(position)
+        start = position
+        parentheses = 0
+
+
+# the code values of a list of Token objects or of a TokenStream, as split_declarations() takes them
+def declaration_codes(tokens):
+    if isinstance(tokens, TokenStream):
+        return tokens.codes.tobytes()
+
+    return bytes([code_values[tk.code] for tk in tokens])
@@ -0,0 +1,1008 @@
+# GENERATED by parser_generator.py from atomc.grammar, do not edit
+# to generate it again: python -m atomc.syntactic_analyzer.parser_generator
+#
+# the conflicts of the grammar:
+# - exprAssign: FIRST / FIRST conflict on CT_CHAR, CT_INT, CT_REAL, CT_STRING, ID, LPAR, NOT, SUB, resolved by left-
+#   corner factoring on exprUnary
+# - exprCast: FIRST / FIRST conflict on LPAR, resolved by 2 tokens of lookahead
+# - stm: FIRST / FOLLOW conflict on ELSE, resolved by the longest match
+# - unit: FIRST / FIRST conflict on CHAR, DOUBLE, INT, resolved by 3 tokens of lookahead
+# - unit: FIRST / FIRST conflict on STRUCT, resolved by 4 tokens of lookahead
+
+from atomc.lexer.token_stream import TokenStream
+from atomc.syntactic_analyzer.syntax_error_exception import SyntaxErrorException
+
+# the instructions, see parser_generator.py
+DECIDE = 0  # (DECIDE, table, error message, default entry)
+MATCH = 1  # (MATCH, code, error message)
+FRAME_END = 2
+ACCEPT = 3
+
+# an entry: (tokens consumed, instructions pushed, frames opened: (offset in the instructions pushed, what to do))
+# a lookahead: code of the token DEPTH tokens after the current one -> entry or lookahead, DEFAULT for the others
+DEPTH = -2
+DEFAULT = -3
+
+# what a frame does instead of raising an error message
+SKIP = 1
+
+# the entry of the empty alternatives
+EMPTY = (0, (), ())
+
+MAX_LOOKAHEAD = 4
+
+token_names = {
+    15: '+',  # ADD
+    16: '-',  # SUB
+    17: '*',  # MUL
+    18: '/',  # DIV
+    19: '&&',  # AND
+    20: '||',  # OR
+    21: '==',  # EQUAL
+    22: '!=',  # NOTEQ
+    23: '<=',  # LESSEQ
+    24: '>=',  # GREATEREQ
+    26: '! (not)',  # NOT
+    27: '<',  # LESS
+    28: '>',  # GREATER
+}
+
+m0 = 'invalid token found'
+m1 = 'no ; after variable definition'
+m2 = 'no identifier after type'
+m3 = 'missing { after function definition'
+m4 = 'no ) after ( in function definition'
+m5 = 'no semicolon after struct type definition'
+m6 = 'no } after { in struct type definition'
+m7 = 'unnamed struct'
+m8 = 'no { in struct type definition or no ID after struct'
+m9 = 'no ] after [ in array declaration'
+m10 = 'invalid expression after cast type'
+m11 = 'no ) after type in cast'
+m12 = 'missing ) after ('
+m13 = 'no } after {'
+m14 = 'no unary expression after {previous}'
+m15 = 'no ; after break'
+m16 = 'no statement after for'
+m17 = 'no ) after ( in for'
+m18 = 'no ; after condition in for'
+m19 = 'no ; after init in for'
+m20 = 'no ( after FOR'
+m21 = 'no statement after if'
+m22 = 'no ( after ) in if'
+m23 = 'invalid or missing expression in if'
+m24 = 'no ( after if'
+m25 = 'no ; after return'
+m26 = 'no statement after while'
+m27 = 'no ) after ( in while'
+m28 = 'invalid or missing expression after ( in while'
+m29 = 'no ( after while'
+m30 = 'no variable name after type declaration in function parameter definition'
+m31 = 'invalid expression after {previous}'
+m32 = 'invalid expression after ='
+m33 = 'missing ) after ( in function call'
+m34 = 'no field name after .'
+m35 = 'no ] in array variable in expression'
+m36 = 'no array index after [ in expression'
+m37 = 'no statement after else'
+m38 = 'no function parameter after comma'
+m39 = 'missing function parameter after , in function call'
+
+t0 = {}
+t1 = {}
+t2 = {}
+t3 = {}
+t4 = {}
+t5 = {}
+t6 = {}
+t7 = {}
+t8 = {}
+t9 = {}
+t10 = {}
+t11 = {}
+t12 = {}
+t13 = {}
+t14 = {}
+t15 = {}
+t16 = {}
+t17 = {}
+t18 = {}
+t19 = {}
+t20 = {}
+t21 = {}
+t22 = {}
+t23 = {}
+t24 = {}
+t25 = {}
+t26 = {}
+t27 = {}
+t28 = {}
+t29 = {}
+t30 = {}
+t31 = {}
+t32 = {}
+t33 = {}
+t34 = {}
+t35 = {}
+t36 = {}
+t37 = {}
+t38 = {}
+t39 = {}
+t40 = {}
+t41 = {}
+t42 = {}
+t43 = {}
+t44 = {}
+t45 = {}
+
+i0 = (FRAME_END,)
+i1 = (MATCH, 14, m0)  # END
+i2 = (DECIDE, t0, None, EMPTY)
+i3 = (MATCH, 7, m1)  # SEMICOLON
+i4 = (DECIDE, t1, None, EMPTY)
+i5 = (MATCH, 1, m2)  # ID
+i6 = (DECIDE, t2, m3, None)
+i7 = (MATCH, 9, m4)  # RPAR
+i8 = (DECIDE, t3, None, EMPTY)
+i9 = (MATCH, 8, None)  # LPAR
+i10 = (MATCH, 1, None)  # ID
+i11 = (MATCH, 7, m5)  # SEMICOLON
+i12 = (MATCH, 13, m6)  # RACC
+i13 = (DECIDE, t4, None, EMPTY)
+i14 = (MATCH, 12, None)  # LACC
+i15 = (MATCH, 1, m7)  # ID
+i16 = (MATCH, 1, m8)  # ID
+i17 = (MATCH, 11, m9)  # RBRACKET
+i18 = (DECIDE, t5, None, EMPTY)
+i19 = (DECIDE, t6, None, EMPTY)
+i20 = (DECIDE, t7, None, EMPTY)
+i21 = (DECIDE, t8, None, EMPTY)
+i22 = (MATCH, 7, None)  # SEMICOLON
+i23 = (DECIDE, t9, m10, None)
+i24 = (MATCH, 9, m11)  # RPAR
+i25 = (DECIDE, t10, None, EMPTY)
+i26 = (DECIDE, t11, None, None)
+i27 = (DECIDE, t12, None, EMPTY)
+i28 = (DECIDE, t13, None, EMPTY)
+i29 = (DECIDE, t14, None, EMPTY)
+i30 = (DECIDE, t15, None, EMPTY)
+i31 = (DECIDE, t16, None, EMPTY)
+i32 = (DECIDE, t17, None, EMPTY)
+i33 = (MATCH, 9, m12)  # RPAR
+i34 = (DECIDE, t18, None, None)
+i35 = (MATCH, 13, m13)  # RACC
+i36 = (DECIDE, t19, None, EMPTY)
+i37 = (DECIDE, t20, m14, None)
+i38 = (MATCH, 7, m15)  # SEMICOLON
+i39 = (DECIDE, t21, m16, None)
+i40 = (MATCH, 9, m17)  # RPAR
+i41 = (DECIDE, t22, None, EMPTY)
+i42 = (MATCH, 7, m18)  # SEMICOLON
+i43 = (DECIDE, t23, None, EMPTY)
+i44 = (MATCH, 7, m19)  # SEMICOLON
+i45 = (DECIDE, t24, None, EMPTY)
+i46 = (MATCH, 8, m20)  # LPAR
+i47 = (DECIDE, t25, None, EMPTY)
+i48 = (DECIDE, t26, m21, None)
+i49 = (MATCH, 9, m22)  # RPAR
+i50 = (DECIDE, t27, m23, None)
+i51 = (MATCH, 8, m24)  # LPAR
+i52 = (MATCH, 7, m25)  # SEMICOLON
+i53 = (DECIDE, t28, None, EMPTY)
+i54 = (DECIDE, t29, m26, None)
+i55 = (MATCH, 9, m27)  # RPAR
+i56 = (DECIDE, t30, m28, None)
+i57 = (MATCH, 8, m29)  # LPAR
+i58 = (DECIDE, t31, None, EMPTY)
+i59 = (MATCH, 1, m30)  # ID
+i60 = (DECIDE, t32, None, EMPTY)
+i61 = (DECIDE, t33, m31, None)
+i62 = (DECIDE, t34, m31, None)
+i63 = (DECIDE, t35, m31, None)
+i64 = (DECIDE, t36, m31, None)
+i65 = (DECIDE, t37, m31, None)
+i66 = (DECIDE, t38, m31, None)
+i67 = (DECIDE, t39, m32, None)
+i68 = (MATCH, 9, m33)  # RPAR
+i69 = (DECIDE, t40, None, EMPTY)
+i70 = (MATCH, 1, m34)  # ID
+i71 = (MATCH, 11, m35)  # RBRACKET
+i72 = (DECIDE, t41, m36, None)
+i73 = (DECIDE, t42, m37, None)
+i74 = (DECIDE, t43, m38, None)
+i75 = (DECIDE, t44, None, EMPTY)
+i76 = (DECIDE, t45, m39, None)
+
+e0 = (1, (i2, i3, i4, i5), ())
+e1 = (1, (i2, i0, i6, i7, i8, i9, i10), ((0, SKIP),))
+l2 = {
+    DEPTH: 2,
+    DEFAULT: e0,
+    8: e1,  # LPAR
+}
+l3 = {
+    DEPTH: 1,
+    DEFAULT: e0,
+    1: l2,  # ID
+}
+e4 = (1, (i2, i0, i11, i12, i13, i14, i15), ((0, SKIP),))
+e5 = (1, (i2, i3, i4, i5, i16), ())
+e6 = (1, (i2, i0, i6, i7, i8, i9, i10, i16), ((0, SKIP),))
+l7 = {
+    DEPTH: 3,
+    DEFAULT: e5,
+    8: e6,  # LPAR
+}
+l8 = {
+    DEPTH: 2,
+    DEFAULT: e5,
+    1: l7,  # ID
+    12: e4,  # LACC
+}
+l9 = {
+    DEPTH: 1,
+    DEFAULT: e4,
+    1: l8,  # ID
+}
+e10 = (1, (i17, i18), ())
+e11 = (1, (i0, i22, i19, i21, i20), ((0, m3),))
+e12 = (1, (i0, i22, i19, i21), ((0, m3),))
+e13 = (1, (), ())
+e14 = (1, (i0, i22, i0, i19, i21, i33, i34), ((0, m3), (2, SKIP)))
+e15 = (1, (i0, i22, i0, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, m3), (2, SKIP)))
+l16 = {
+    DEPTH: 1,
+    DEFAULT: e14,
+    32: e15,  # CHAR
+    33: e15,  # DOUBLE
+    37: e15,  # INT
+    39: e15,  # STRUCT
+}
+e17 = (1, (i35, i36), ())
+e18 = (1, (i0, i22, i19, i37), ((0, m3),))
+e19 = (1, (i38,), ())
+e20 = (1, (i39, i40, i41, i42, i43, i44, i45, i46), ())
+e21 = (1, (i47, i48, i49, i50, i51), ())
+e22 = (1, (i52, i53), ())
+e23 = (1, (i54, i55, i56, i57), ())
+e24 = (1, (i60, i58, i59), ())
+e25 = (1, (i60, i58, i59, i16), ())
+e26 = (1, (i13, i3, i4, i5), ())
+e27 = (1, (i13, i3, i4, i5, i16), ())
+e28 = (1, (i32, i31, i30, i29, i28, i61), ())
+e29 = (1, (i32, i31, i30, i29, i28, i27, i62), ())
+e30 = (1, (i32, i31, i63), ())
+e31 = (1, (i32, i64), ())
+e32 = (1, (i32, i31, i30, i65), ())
+e33 = (1, (i32, i31, i30, i29, i66), ())
+e34 = (1, (i67,), ())
+e35 = (1, (i68, i69), ())
+e36 = (1, (i21, i70), ())
+e37 = (1, (i21, i71, i72), ())
+e38 = (1, (i21, i20), ())
+e39 = (1, (i21,), ())
+e40 = (1, (i0, i21, i33, i34), ((0, m10),))
+e41 = (1, (i0, i23, i24, i25, i26), ((0, m10),))
+l42 = {
+    DEPTH: 1,
+    DEFAULT: e40,
+    32: e41,  # CHAR
+    33: e41,  # DOUBLE
+    37: e41,  # INT
+    39: e41,  # STRUCT
+}
+e43 = (1, (i37,), ())
+e44 = (1, (i16,), ())
+e45 = (1, (i27, i62), ())
+e46 = (1, (i28, i61), ())
+e47 = (1, (i29, i66), ())
+e48 = (1, (i30, i65), ())
+e49 = (1, (i31, i63), ())
+e50 = (1, (i19, i21, i20), ())
+e51 = (1, (i19, i21), ())
+e52 = (1, (i19, i21, i33, i34), ())
+e53 = (1, (i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ())
+l54 = {
+    DEPTH: 1,
+    DEFAULT: e52,
+    32: e53,  # CHAR
+    33: e53,  # DOUBLE
+    37: e53,  # INT
+    39: e53,  # STRUCT
+}
+e55 = (1, (i19, i37), ())
+e56 = (1, (i36, i0, i22, i19, i21, i20), ((0, SKIP),))
+e57 = (1, (i36, i0, i22, i19, i21), ((0, SKIP),))
+e58 = (1, (i36,), ())
+e59 = (1, (i36, i0, i22, i0, i19, i21, i33, i34), ((0, SKIP), (3, SKIP)))
+e60 = (1, (i36, i0, i22, i0, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, SKIP), (3, SKIP)))
+l61 = {
+    DEPTH: 1,
+    DEFAULT: e59,
+    32: e60,  # CHAR
+    33: e60,  # DOUBLE
+    37: e60,  # INT
+    39: e60,  # STRUCT
+}
+e62 = (1, (i36, i35, i36), ())
+e63 = (1, (i36, i0, i22, i19, i37), ((0, SKIP),))
+e64 = (1, (i36, i38), ())
+e65 = (1, (i36, i3, i4, i5), ())
+e66 = (1, (i36, i39, i40, i41, i42, i43, i44, i45, i46), ())
+e67 = (1, (i36, i47, i48, i49, i50, i51), ())
+e68 = (1, (i36, i52, i53), ())
+e69 = (1, (i36, i3, i4, i5, i16), ())
+e70 = (1, (i36, i54, i55, i56, i57), ())
+e71 = (1, (i0, i21, i33, i34), ((0, m14),))
+e72 = (1, (i0, i22, i19, i21, i20), ((0, m16),))
+e73 = (1, (i0, i22, i19, i21), ((0, m16),))
+e74 = (1, (i0, i22, i0, i19, i21, i33, i34), ((0, m16), (2, SKIP)))
+e75 = (1, (i0, i22, i0, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, m16), (2, SKIP)))
+l76 = {
+    DEPTH: 1,
+    DEFAULT: e74,
+    32: e75,  # CHAR
+    33: e75,  # DOUBLE
+    37: e75,  # INT
+    39: e75,  # STRUCT
+}
+e77 = (1, (i0, i22, i19, i37), ((0, m16),))
+e78 = (1, (i0, i19, i21, i33, i34), ((0, SKIP),))
+e79 = (1, (i0, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, SKIP),))
+l80 = {
+    DEPTH: 1,
+    DEFAULT: e78,
+    32: e79,  # CHAR
+    33: e79,  # DOUBLE
+    37: e79,  # INT
+    39: e79,  # STRUCT
+}
+e81 = (1, (i73,), ())
+e82 = (1, (i0, i22, i19, i21, i20), ((0, m21),))
+e83 = (1, (i0, i22, i19, i21), ((0, m21),))
+e84 = (1, (i0, i22, i0, i19, i21, i33, i34), ((0, m21), (2, SKIP)))
+e85 = (1, (i0, i22, i0, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, m21), (2, SKIP)))
+l86 = {
+    DEPTH: 1,
+    DEFAULT: e84,
+    32: e85,  # CHAR
+    33: e85,  # DOUBLE
+    37: e85,  # INT
+    39: e85,  # STRUCT
+}
+e87 = (1, (i0, i22, i19, i37), ((0, m21),))
+e88 = (1, (i0, i19, i21, i33, i34), ((0, m23),))
+e89 = (1, (i0, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, m23),))
+l90 = {
+    DEPTH: 1,
+    DEFAULT: e88,
+    32: e89,  # CHAR
+    33: e89,  # DOUBLE
+    37: e89,  # INT
+    39: e89,  # STRUCT
+}
+e91 = (1, (i0, i22, i19, i21, i20), ((0, m26),))
+e92 = (1, (i0, i22, i19, i21), ((0, m26),))
+e93 = (1, (i0, i22, i0, i19, i21, i33, i34), ((0, m26), (2, SKIP)))
+e94 = (1, (i0, i22, i0, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, m26), (2, SKIP)))
+l95 = {
+    DEPTH: 1,
+    DEFAULT: e93,
+    32: e94,  # CHAR
+    33: e94,  # DOUBLE
+    37: e94,  # INT
+    39: e94,  # STRUCT
+}
+e96 = (1, (i0, i22, i19, i37), ((0, m26),))
+e97 = (1, (i0, i19, i21, i33, i34), ((0, m28),))
+e98 = (1, (i0, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, m28),))
+l99 = {
+    DEPTH: 1,
+    DEFAULT: e97,
+    32: e98,  # CHAR
+    33: e98,  # DOUBLE
+    37: e98,  # INT
+    39: e98,  # STRUCT
+}
+e100 = (1, (i60, i74), ())
+e101 = (1, (i27, i21, i20), ())
+e102 = (1, (i27, i21), ())
+e103 = (1, (i0, i27, i21, i33, i34), ((0, m31),))
+e104 = (1, (i0, i27, i23, i24, i25, i26), ((0, m31),))
+l105 = {
+    DEPTH: 1,
+    DEFAULT: e103,
+    32: e104,  # CHAR
+    33: e104,  # DOUBLE
+    37: e104,  # INT
+    39: e104,  # STRUCT
+}
+e106 = (1, (i27, i37), ())
+e107 = (1, (i0, i21, i33, i34), ((0, m31),))
+e108 = (1, (i0, i23, i24, i25, i26), ((0, m31),))
+l109 = {
+    DEPTH: 1,
+    DEFAULT: e107,
+    32: e108,  # CHAR
+    33: e108,  # DOUBLE
+    37: e108,  # INT
+    39: e108,  # STRUCT
+}
+e110 = (1, (i30, i29, i28, i27, i21, i20), ())
+e111 = (1, (i30, i29, i28, i27, i21), ())
+e112 = (1, (i0, i30, i29, i28, i27, i21, i33, i34), ((0, m31),))
+e113 = (1, (i0, i30, i29, i28, i27, i23, i24, i25, i26), ((0, m31),))
+l114 = {
+    DEPTH: 1,
+    DEFAULT: e112,
+    32: e113,  # CHAR
+    33: e113,  # DOUBLE
+    37: e113,  # INT
+    39: e113,  # STRUCT
+}
+e115 = (1, (i30, i29, i28, i27, i37), ())
+e116 = (1, (i31, i30, i29, i28, i27, i21, i20), ())
+e117 = (1, (i31, i30, i29, i28, i27, i21), ())
+e118 = (1, (i0, i31, i30, i29, i28, i27, i21, i33, i34), ((0, m31),))
+e119 = (1, (i0, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, m31),))
+l120 = {
+    DEPTH: 1,
+    DEFAULT: e118,
+    32: e119,  # CHAR
+    33: e119,  # DOUBLE
+    37: e119,  # INT
+    39: e119,  # STRUCT
+}
+e121 = (1, (i31, i30, i29, i28, i27, i37), ())
+e122 = (1, (i29, i28, i27, i21, i20), ())
+e123 = (1, (i29, i28, i27, i21), ())
+e124 = (1, (i0, i29, i28, i27, i21, i33, i34), ((0, m31),))
+e125 = (1, (i0, i29, i28, i27, i23, i24, i25, i26), ((0, m31),))
+l126 = {
+    DEPTH: 1,
+    DEFAULT: e124,
+    32: e125,  # CHAR
+    33: e125,  # DOUBLE
+    37: e125,  # INT
+    39: e125,  # STRUCT
+}
+e127 = (1, (i29, i28, i27, i37), ())
+e128 = (1, (i28, i27, i21, i20), ())
+e129 = (1, (i28, i27, i21), ())
+e130 = (1, (i0, i28, i27, i21, i33, i34), ((0, m31),))
+e131 = (1, (i0, i28, i27, i23, i24, i25, i26), ((0, m31),))
+l132 = {
+    DEPTH: 1,
+    DEFAULT: e130,
+    32: e131,  # CHAR
+    33: e131,  # DOUBLE
+    37: e131,  # INT
+    39: e131,  # STRUCT
+}
+e133 = (1, (i28, i27, i37), ())
+e134 = (1, (i0, i19, i21, i33, i34), ((0, m32),))
+e135 = (1, (i0, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, m32),))
+l136 = {
+    DEPTH: 1,
+    DEFAULT: e134,
+    32: e135,  # CHAR
+    33: e135,  # DOUBLE
+    37: e135,  # INT
+    39: e135,  # STRUCT
+}
+e137 = (1, (i75, i19, i21, i20), ())
+e138 = (1, (i75, i19, i21), ())
+e139 = (1, (i0, i75, i19, i21, i33, i34), ((0, SKIP),))
+e140 = (1, (i0, i75, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, SKIP),))
+l141 = {
+    DEPTH: 1,
+    DEFAULT: e139,
+    32: e140,  # CHAR
+    33: e140,  # DOUBLE
+    37: e140,  # INT
+    39: e140,  # STRUCT
+}
+e142 = (1, (i75, i19, i37), ())
+e143 = (1, (i0, i19, i21, i33, i34), ((0, m36),))
+e144 = (1, (i0, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, m36),))
+l145 = {
+    DEPTH: 1,
+    DEFAULT: e143,
+    32: e144,  # CHAR
+    33: e144,  # DOUBLE
+    37: e144,  # INT
+    39: e144,  # STRUCT
+}
+e146 = (1, (i0, i22, i19, i21, i20), ((0, m37),))
+e147 = (1, (i0, i22, i19, i21), ((0, m37),))
+e148 = (1, (i0, i22, i0, i19, i21, i33, i34), ((0, m37), (2, SKIP)))
+e149 = (1, (i0, i22, i0, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, m37), (2, SKIP)))
+l150 = {
+    DEPTH: 1,
+    DEFAULT: e148,
+    32: e149,  # CHAR
+    33: e149,  # DOUBLE
+    37: e149,  # INT
+    39: e149,  # STRUCT
+}
+e151 = (1, (i0, i22, i19, i37), ((0, m37),))
+e152 = (1, (i58, i59), ())
+e153 = (1, (i58, i59, i16), ())
+e154 = (1, (i75, i76), ())
+e155 = (1, (i0, i19, i21, i33, i34), ((0, m39),))
+e156 = (1, (i0, i32, i31, i30, i29, i28, i27, i23, i24, i25, i26), ((0, m39),))
+l157 = {
+    DEPTH: 1,
+    DEFAULT: e155,
+    32: e156,  # CHAR
+    33: e156,  # DOUBLE
+    37: e156,  # INT
+    39: e156,  # STRUCT
+}
+
+t0.update({
+    32: l3,  # CHAR
+    33: l3,  # DOUBLE
+    37: l3,  # INT
+    39: l9,  # STRUCT
+    40: e1,  # VOID
+})
+t1.update({
+    10: e10,  # LBRACKET
+})
+t2.update({
+    1: e11,  # ID
+    2: e12,  # CT_INT
+    3: e12,  # CT_REAL
+    4: e12,  # CT_CHAR
+    5: e12,  # CT_STRING
+    7: e13,  # SEMICOLON
+    8: l16,  # LPAR
+    12: e17,  # LACC
+    16: e18,  # SUB
+    26: e18,  # NOT
+    31: e19,  # BREAK
+    35: e20,  # FOR
+    36: e21,  # IF
+    38: e22,  # RETURN
+    41: e23,  # WHILE
+})
+t3.update({
+    32: e24,  # CHAR
+    33: e24,  # DOUBLE
+    37: e24,  # INT
+    39: e25,  # STRUCT
+})
+t4.update({
+    32: e26,  # CHAR
+    33: e26,  # DOUBLE
+    37: e26,  # INT
+    39: e27,  # STRUCT
+})
+t5.update({
+    2: e13,  # CT_INT
+})
+t6.update({
+    15: e28,  # ADD
+    16: e28,  # SUB
+    17: e29,  # MUL
+    18: e29,  # DIV
+    19: e30,  # AND
+    20: e31,  # OR
+    21: e32,  # EQUAL
+    22: e32,  # NOTEQ
+    23: e33,  # LESSEQ
+    24: e33,  # GREATEREQ
+    25: e34,  # ASSIGN
+    27: e33,  # LESS
+    28: e33,  # GREATER
+})
+t7.update({
+    8: e35,  # LPAR
+})
+t8.update({
+    0: e36,  # DOT
+    10: e37,  # LBRACKET
+})
+t9.update({
+    1: e38,  # ID
+    2: e39,  # CT_INT
+    3: e39,  # CT_REAL
+    4: e39,  # CT_CHAR
+    5: e39,  # CT_STRING
+    8: l42,  # LPAR
+    16: e43,  # SUB
+    26: e43,  # NOT
+})
+t10.update({
+    10: e10,  # LBRACKET
+})
+t11.update({
+    32: e13,  # CHAR
+    33: e13,  # DOUBLE
+    37: e13,  # INT
+    39: e44,  # STRUCT
+})
+t12.update({
+    17: e45,  # MUL
+    18: e45,  # DIV
+})
+t13.update({
+    15: e46,  # ADD
+    16: e46,  # SUB
+})
+t14.update({
+    23: e47,  # LESSEQ
+    24: e47,  # GREATEREQ
+    27: e47,  # LESS
+    28: e47,  # GREATER
+})
+t15.update({
+    21: e48,  # EQUAL
+    22: e48,  # NOTEQ
+})
+t16.update({
+    19: e49,  # AND
+})
+t17.update({
+    20: e31,  # OR
+})
+t18.update({
+    1: e50,  # ID
+    2: e51,  # CT_INT
+    3: e51,  # CT_REAL
+    4: e51,  # CT_CHAR
+    5: e51,  # CT_STRING
+    8: l54,  # LPAR
+    16: e55,  # SUB
+    26: e55,  # NOT
+})
+t19.update({
+    1: e56,  # ID
+    2: e57,  # CT_INT
+    3: e57,  # CT_REAL
+    4: e57,  # CT_CHAR
+    5: e57,  # CT_STRING
+    7: e58,  # SEMICOLON
+    8: l61,  # LPAR
+    12: e62,  # LACC
+    16: e63,  # SUB
+    26: e63,  # NOT
+    31: e64,  # BREAK
+    32: e65,  # CHAR
+    33: e65,  # DOUBLE
+    35: e66,  # FOR
+    36: e67,  # IF
+    37: e65,  # INT
+    38: e68,  # RETURN
+    39: e69,  # STRUCT
+    41: e70,  # WHILE
+})
+t20.update({
+    1: e38,  # ID
+    2: e39,  # CT_INT
+    3: e39,  # CT_REAL
+    4: e39,  # CT_CHAR
+    5: e39,  # CT_STRING
+    8: e71,  # LPAR
+    16: e43,  # SUB
+    26: e43,  # NOT
+})
+t21.update({
+    1: e72,  # ID
+    2: e73,  # CT_INT
+    3: e73,  # CT_REAL
+    4: e73,  # CT_CHAR
+    5: e73,  # CT_STRING
+    7: e13,  # SEMICOLON
+    8: l76,  # LPAR
+    12: e17,  # LACC
+    16: e77,  # SUB
+    26: e77,  # NOT
+    31: e19,  # BREAK
+    35: e20,  # FOR
+    36: e21,  # IF
+    38: e22,  # RETURN
+    41: e23,  # WHILE
+})
+t22.update({
+    1: e50,  # ID
+    2: e51,  # CT_INT
+    3: e51,  # CT_REAL
+    4: e51,  # CT_CHAR
+    5: e51,  # CT_STRING
+    8: l80,  # LPAR
+    16: e55,  # SUB
+    26: e55,  # NOT
+})
+t23.update({
+    1: e50,  # ID
+    2: e51,  # CT_INT
+    3: e51,  # CT_REAL
+    4: e51,  # CT_CHAR
+    5: e51,  # CT_STRING
+    8: l80,  # LPAR
+    16: e55,  # SUB
+    26: e55,  # NOT
+})
+t24.update({
+    1: e50,  # ID
+    2: e51,  # CT_INT
+    3: e51,  # CT_REAL
+    4: e51,  # CT_CHAR
+    5: e51,  # CT_STRING
+    8: l80,  # LPAR
+    16: e55,  # SUB
+    26: e55,  # NOT
+})
+t25.update({
+    34: e81,  # ELSE
+})
+t26.update({
+    1: e82,  # ID
+    2: e83,  # CT_INT
+    3: e83,  # CT_REAL
+    4: e83,  # CT_CHAR
+    5: e83,  # CT_STRING
+    7: e13,  # SEMICOLON
+    8: l86,  # LPAR
+    12: e17,  # LACC
+    16: e87,  # SUB
+    26: e87,  # NOT
+    31: e19,  # BREAK
+    35: e20,  # FOR
+    36: e21,  # IF
+    38: e22,  # RETURN
+    41: e23,  # WHILE
+})
+t27.update({
+    1: e50,  # ID
+    2: e51,  # CT_INT
+    3: e51,  # CT_REAL
+    4: e51,  # CT_CHAR
+    5: e51,  # CT_STRING
+    8: l90,  # LPAR
+    16: e55,  # SUB
+    26: e55,  # NOT
+})
+t28.update({
+    1: e50,  # ID
+    2: e51,  # CT_INT
+    3: e51,  # CT_REAL
+    4: e51,  # CT_CHAR
+    5: e51,  # CT_STRING
+    8: l80,  # LPAR
+    16: e55,  # SUB
+    26: e55,  # NOT
+})
+t29.update({
+    1: e91,  # ID
+    2: e92,  # CT_INT
+    3: e92,  # CT_REAL
+    4: e92,  # CT_CHAR
+    5: e92,  # CT_STRING
+    7: e13,  # SEMICOLON
+    8: l95,  # LPAR
+    12: e17,  # LACC
+    16: e96,  # SUB
+    26: e96,  # NOT
+    31: e19,  # BREAK
+    35: e20,  # FOR
+    36: e21,  # IF
+    38: e22,  # RETURN
+    41: e23,  # WHILE
+})
+t30.update({
+    1: e50,  # ID
+    2: e51,  # CT_INT
+    3: e51,  # CT_REAL
+    4: e51,  # CT_CHAR
+    5: e51,  # CT_STRING
+    8: l99,  # LPAR
+    16: e55,  # SUB
+    26: e55,  # NOT
+})
+t31.update({
+    10: e10,  # LBRACKET
+})
+t32.update({
+    6: e100,  # COMMA
+})
+t33.update({
+    1: e101,  # ID
+    2: e102,  # CT_INT
+    3: e102,  # CT_REAL
+    4: e102,  # CT_CHAR
+    5: e102,  # CT_STRING
+    8: l105,  # LPAR
+    16: e106,  # SUB
+    26: e106,  # NOT
+})
+t34.update({
+    1: e38,  # ID
+    2: e39,  # CT_INT
+    3: e39,  # CT_REAL
+    4: e39,  # CT_CHAR
+    5: e39,  # CT_STRING
+    8: l109,  # LPAR
+    16: e43,  # SUB
+    26: e43,  # NOT
+})
+t35.update({
+    1: e110,  # ID
+    2: e111,  # CT_INT
+    3: e111,  # CT_REAL
+    4: e111,  # CT_CHAR
+    5: e111,  # CT_STRING
+    8: l114,  # LPAR
+    16: e115,  # SUB
+    26: e115,  # NOT
+})
+t36.update({
+    1: e116,  # ID
+    2: e117,  # CT_INT
+    3: e117,  # CT_REAL
+    4: e117,  # CT_CHAR
+    5: e117,  # CT_STRING
+    8: l120,  # LPAR
+    16: e121,  # SUB
+    26: e121,  # NOT
+})
+t37.update({
+    1: e122,  # ID
+    2: e123,  # CT_INT
+    3: e123,  # CT_REAL
+    4: e123,  # CT_CHAR
+    5: e123,  # CT_STRING
+    8: l126,  # LPAR
+    16: e127,  # SUB
+    26: e127,  # NOT
+})
+t38.update({
+    1: e128,  # ID
+    2: e129,  # CT_INT
+    3: e129,  # CT_REAL
+    4: e129,  # CT_CHAR
+    5: e129,  # CT_STRING
+    8: l132,  # LPAR
+    16: e133,  # SUB
+    26: e133,  # NOT
+})
+t39.update({
+    1: e50,  # ID
+    2: e51,  # CT_INT
+    3: e51,  # CT_REAL
+    4: e51,  # CT_CHAR
+    5: e51,  # CT_STRING
+    8: l136,  # LPAR
+    16: e55,  # SUB
+    26: e55,  # NOT
+})
+t40.update({
+    1: e137,  # ID
+    2: e138,  # CT_INT
+    3: e138,  # CT_REAL
+    4: e138,  # CT_CHAR
+    5: e138,  # CT_STRING
+    8: l141,  # LPAR
+    16: e142,  # SUB
+    26: e142,  # NOT
+})
+t41.update({
+    1: e50,  # ID
+    2: e51,  # CT_INT
+    3: e51,  # CT_REAL
+    4: e51,  # CT_CHAR
+    5: e51,  # CT_STRING
+    8: l145,  # LPAR
+    16: e55,  # SUB
+    26: e55,  # NOT
+})
+t42.update({
+    1: e146,  # ID
+    2: e147,  # CT_INT
+    3: e147,  # CT_REAL
+    4: e147,  # CT_CHAR
+    5: e147,  # CT_STRING
+    7: e13,  # SEMICOLON
+    8: l150,  # LPAR
+    12: e17,  # LACC
+    16: e151,  # SUB
+    26: e151,  # NOT
+    31: e19,  # BREAK
+    35: e20,  # FOR
+    36: e21,  # IF
+    38: e22,  # RETURN
+    41: e23,  # WHILE
+})
+t43.update({
+    32: e152,  # CHAR
+    33: e152,  # DOUBLE
+    37: e152,  # INT
+    39: e153,  # STRUCT
+})
+t44.update({
+    6: e154,  # COMMA
+})
+t45.update({
+    1: e50,  # ID
+    2: e51,  # CT_INT
+    3: e51,  # CT_REAL
+    4: e51,  # CT_CHAR
+    5: e51,  # CT_STRING
+    8: l157,  # LPAR
+    16: e55,  # SUB
+    26: e55,  # NOT
+})
+
+START = (i1, i2)
+ACCEPT_INSTRUCTION = (ACCEPT,)
+
+# the codes after the last token, so looking ahead never goes out of the list
+padding = [-1] * MAX_LOOKAHEAD
+
+
+def syntax_error(tokens, codes: list, position: int, message: str):
+    message = message.replace("{previous}", token_names.get(codes[position - 1], ""))
+    return SyntaxErrorException(tokens[position], message)
+
+
+# the recognize mode of analyzer.analyze(), for a list of Token objects or a TokenStream: True, or the same
+# SyntaxErrorException
+def parse(tokens):
+    if isinstance(tokens, TokenStream):
+        codes = list(tokens.codes)
+    else:
+        codes = [tk.code.value for tk in tokens]
+    codes += padding
+
+    stack = [ACCEPT_INSTRUCTION]
+    stack += START
+    pop = stack.pop
+    extend = stack.extend
+    frames = []
+    position = 0
+
+    while True:
+        instruction = pop()
+        kind = instruction[0]
+
+        if kind == DECIDE:
+            entry = instruction[1].get(codes[position], instruction[3])
+            if entry is not None:
+                while entry.__class__ is dict:
+                    entry = entry.get(codes[position + entry[DEPTH]], entry[DEFAULT])
+
+                advance, items, entry_frames = entry
+                if entry_frames:
+                    depth = len(stack)
+                    for offset, fail in entry_frames:
+                        frames.append((depth + offset, position, fail))
+
+                position += advance
+                extend(items)
+                continue
+
+            fail = instruction[2]
+
+        elif kind == MATCH:
+            if codes[position] == instruction[1]:
+                position += 1
+                continue
+
+            fail = instruction[2]
+
+        elif kind == FRAME_END:
+            frames.pop()
+            continue
+
+        else:
+            return True
+
+        # the rule is not satisfied: back to the start of the innermost symbol which can report it or be skipped
+        if fail is None:
+            depth, position, fail = frames.pop()
+            del stack[depth:]
+
+        if fail is not SKIP:
+            raise syntax_error(tokens, codes, position, fail)
@@ -0,0 +1,328 @@
+import os
+import re
+
+from atomc.lexer.token import Code
+
+# the grammar of the language, written once in atomc.grammar (see the comments there for its notation)
+grammar_path = os.path.join(os.path.dirname(__file__), "atomc.grammar")
+with open(grammar_path) as grammar_file:
+    grammar_text = grammar_file.read()
+
+start_rule = "unit"
+
+# GRAMMAR NODES:
+# the right side of every rule is parsed into a tree of tuples:
+# - ("symbol", name): a token code or a rule; ("symbol", name, message) when it has an error message
+# - ("empty",): e
+# - ("sequence", [nodes]), ("choice", [nodes])
+# - ("repeat", node): node*, ("optional", node): node?
+
+grammar_token_pattern = re.compile(r'\s*([()*?|:]|[A-Za-z_]+|"[^"]*")')
+
+
+def tokenize_grammar(text: str):
+    position = 0
+    tokens = []
+    text = text.rstrip()
+
+    while position < len(text):
+        match = grammar_token_pattern.match(text, position)
+        if match is None:
+            raise ValueError("invalid grammar text at: " + text[position:position + 20])
+
+        tokens.append(match.group(1))
+        position = match.end()
+
+    return tokens
+
+
+# choice: sequence ( "|" sequence )*
+def parse_choice(tokens: list, position: int):
+    alternatives = []
+
+    while True:
+        node, position = parse_sequence(tokens, position)
+        alternatives.append(node)
+
+        if position < len(tokens) and tokens[position] == '|':
+            position += 1
+        else:
+            break
+
+    if len(alternatives) == 1:
+        return alternatives[0], position
+
+    return ("choice", alternatives), position
+
+
+# sequence: ( atom ( "*" | "?" )* )*
+def parse_sequence(tokens: list, position: int):
+    items = []
+
+    while position < len(tokens) and tokens[position] not in ('|', ')'):
+        if tokens[position] == '(':
+            node, position = parse_choice(tokens, position + 1)
+            if position >= len(tokens) or tokens[position] != ')':
+                raise ValueError("no ) in grammar")
+            position += 1
+
+        elif tokens[position] == 'e':
+            node = ("empty",)
+            position += 1
+
+        elif tokens[position].startswith('"'):
+            raise ValueError("error message " + tokens[position] + " is not after a symbol")
+
+        else:
+            node = ("symbol", tokens[position])
+            position += 1
+
+            # "message"
+            if position < len(tokens) and tokens[position].startswith('"'):
+                node = ("symbol", node[1], tokens[position][1:-1])
+                position += 1
+
+        while position < len(tokens) and tokens[position] in ('*', '?'):
+            node = ("repeat", node) if tokens[position] == '*' else ("optional", node)
+            position += 1
+
+        items.append(node)
+
+    if len(items) == 1:
+        return items[0], position
+    if not items:
+        return ("empty",), position
+
+    return ("sequence", items), position
+
+
+# returns the rules of a grammar text, rule name -> node, and the names of the tokens given by its %name lines,
+# Code -> name
+# every rule starts on a new line with "name:", a line which does not continue the rule before it
+def parse_grammar(text: str):
+    rules = {}
+    token_names = {}
+    name = None
+
+    for line in text.splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+
+        match = re.match(r'%name\s+(\w+)\s+"([^"]*)"\s*$', line)
+        if match:
+            token_names[Code[match.group(1)]] = match.group(2)
+            continue
+
+        match = re.match(r"(\w+):(.*)", line)
+        if match:
+            name = match.group(1)
+            rules[name] = match.group(2)
+        elif name is not None:
+            rules[name] += " " + line
+        else:
+            raise ValueError("grammar text does not start with a rule")
+
+    for name, body in rules.items():
+        tokens = tokenize_grammar(body)
+        node, position = parse_choice(tokens, 0)
+        if position != len(tokens):
+            raise ValueError("unexpected " + tokens[position] + " in rule " + name)
+
+        rules[name] = node
+
+    for name, node in rules.items():
+        for symbol in node_symbols(node):
+            if symbol not in rules and symbol not in Code.__members__:
+                raise ValueError("unknown symbol " + symbol + " in rule " + name)
+
+    return rules, token_names
+
+
+# the names of all the symbols in a node
+def node_symbols(node: tuple):
+    if node[0] == "symbol":
+        return [node[1]]
+    if node[0] in ("sequence", "choice"):
+        return [symbol for item in node[1] for symbol in node_symbols(item)]
+    if node[0] in ("repeat", "optional"):
+        return node_symbols(node[1])
+
+    return []
+
+
+# FIRST / FOLLOW SETS:
+# nullable: the rules which can match the empty string
+# FIRST(x): the token codes which can start x
+# FOLLOW(rule): the token codes which can come right after the rule
+# all of them are computed by iterating until nothing changes (fixed point)
+
+def node_nullable(node: tuple, nullable: set):
+    kind = node[0]
+    if kind == "symbol":
+        return node[1] in nullable
+    if kind == "sequence":
+        return all(node_nullable(item, nullable) for item in node[1])
+    if kind == "choice":
+        return any(node_nullable(item, nullable) for item in node[1])
+
+    # empty, repeat, optional
+    return True
+
+
+def node_first(node: tuple, first_sets: dict, nullable: set):
+    kind = node[0]
+    if kind == "symbol":
+        if node[1] in first_sets:
+            return set(first_sets[node[1]])
+        return {Code[node[1]]}
+
+    if kind == "sequence":
+        first = set()
+        for item in node[1]:
+            first |= node_first(item, first_sets, nullable)
+            if not node_nullable(item, nullable):
+                break
+        return first
+
+    if kind == "choice":
+        first = set()
+        for item in node[1]:
+            first |= node_first(item, first_sets, nullable)
+        return first
+
+    if kind in ("repeat", "optional"):
+        return node_first(node[1], first_sets, nullable)
+
+    return set()
+
+
+def compute_nullable(rules: dict):
+    nullable = set()
+
+    changed = True
+    while changed:
+        changed = False
+        for name, node in rules.items():
+            if name not in nullable and node_nullable(node, nullable):
+                nullable.add(name)
+                changed = True
+
+    return nullable
+
+
+def compute_first_sets(rules: dict, nullable: set):
+    first_sets = {name: set() for name in rules}
+
+    changed = True
+    while changed:
+        changed = False
+        for name, node in rules.items():
+            first = node_first(node, first_sets, nullable)
+            if first != first_sets[name]:
+                first_sets[name] = first
+                changed = True
+
+    return first_sets
+
+
+# adds to follow_sets what can follow every rule used in node, given what can follow node itself:
+# the codes in after, and FOLLOW(rule) if the rest of the rule after node is nullable
+# returns True if a FOLLOW set changed
+def add_follow(node: tuple, after: set, after_nullable: bool, rule: str, follow_sets: dict, first_sets: dict,
+               nullable: set):
+    kind = node[0]
+    changed = False
+
+    if kind == "symbol" and node[1] in follow_sets:
+        follow = set(after)
+        if after_nullable:
+            follow |= follow_sets[rule]
+        if not follow <= follow_sets[node[1]]:
+            follow_sets[node[1]] |= follow
+            changed = True
+
+    elif kind == "sequence":
+        for item in reversed(node[1]):
+            changed |= add_follow(item, after, after_nullable, rule, follow_sets, first_sets, nullable)
+            if node_nullable(item, nullable):
+                after = after | node_first(item, first_sets, nullable)
+            else:
+                after = node_first(item, first_sets, nullable)
+                after_nullable = False
+
+    elif kind == "choice":
+        for item in node[1]:
+            changed |= add_follow(item, after, after_nullable, rule, follow_sets, first_sets, nullable)
+
+    elif kind == "repeat":
+        # the repeated node can be followed by itself
+        after = after | node_first(node[1], first_sets, nullable)
+        changed |= add_follow(node[1], after, after_nullable, rule, follow_sets, first_sets, nullable)
+
+    elif kind == "optional":
+        changed |= add_follow(node[1], after, after_nullable, rule, follow_sets, first_sets, nullable)
+
+    return changed
+
+
+def compute_follow_sets(rules: dict, first_sets: dict, nullable: set):
+    follow_sets = {name: set() for name in rules}
+
+    changed = True
+    while changed:
+        changed = False
+        for name, node in rules.items():
+            changed |= add_follow(node, set(), True, name, follow_sets, first_sets, nullable)
+
+    return follow_sets
+
+
+rules, token_names = parse_grammar(grammar_text)
+nullable_rules = compute_nullable(rules)
+first_sets = compute_first_sets(rules, nullable_rules)
+follow_sets = compute_follow_sets(rules, first_sets, nullable_rules)
+
+
+# PREDICTION TABLES:
+# the alternatives of a rule, in the order they are written
+def alternatives(rule: str):
+    node = rules[rule]
+    if node[0] == "choice":
+        return node[1]
+
+    return [node]
+
+
+# the codes which predict an alternative of a rule: its FIRST set, plus the FOLLOW set of the rule if it is nullable
+def predict_set(rule: str, alternative: tuple):
+    predict = node_first(alternative, first_sets, nullable_rules)
+    if node_nullable(alternative, nullable_rules):
+        predict |= follow_sets[rule]
+
+    return predict
+
+
+# code -> the indexes of the alternatives of the rule which the code predicts
+def prediction_table(rule: str):
+    table = {}
+    for index, alternative in enumerate(alternatives(rule)):
+        for code in predict_set(rule, alternative):
+            table.setdefault(code, []).append(index)
+
+    return table
+
+
+# the codes for which more than one alternative of the rule is predicted, code -> indexes of the alternatives
+def conflicts(rule: str):
+    return {code: indexes for code, indexes in prediction_table(rule).items() if len(indexes) > 1}
+
+
+# code -> the index of the only alternative of the rule which the code predicts
+# the rule must be LL(1), the rules with conflicts need more lookahead to pick their alternative
+def ll1_table(rule: str):
+    rule_conflicts = conflicts(rule)
+    if rule_conflicts:
+        raise ValueError("rule " + rule + " is not LL(1), conflicts on " +
+                         ", ".join(sorted(code.name for code in rule_conflicts)))
+
+    return {code: indexes[0] for code, indexes in prediction_table(rule).items()}
@@ -0,0 +1,96 @@
+from operator import attrgetter
+
+from atomc.syntactic_analyzer.analyzer import rule_declaration, rule_unit
+from atomc.syntactic_analyzer.declarations import split_declarations, declaration_codes
+from atomc.syntactic_analyzer.syntax_error_exception import SyntaxErrorException
+from atomc.syntactic_analyzer.syntax_tree import Unit
+from atomc.syntactic_analyzer.token_cursor import TokenCursor
+
+
+# the key a top-level declaration is cached by: the same key means the same tokens, on the same lines relative to
+# the first one
+# the tokens which know their lexeme (all of them in the same source text, sources: the source of every token) are
+# keyed by their codes and the text of the declaration, both sliced and hashed at C speed; the other tokens by their
+# codes, values and relative lines
+def declaration_key(tokens: list, codes: bytes, sources: list, start: int, end: int):
+    first, last = tokens[start], tokens[end - 1]
+    if first.source is not None and sources[start:end].count(first.source) == end - start:
+        return codes[start:end], first.source[first.start:last.end]
+
+    return tuple((tk.code, tk.value, tk.line - first.line) for tk in tokens[start:end])
+
+
+# the node of the declaration of tokens[start:end] analyzed on its own, None if the analysis does not take exactly
+# these tokens (the tokens do not follow the grammar there, the unit analysis tells how)
+def analyze_declaration(tokens: list, start: int, end: int):
+    token_iterator = TokenCursor(tokens[start:end] + tokens[-1:])
+
+    try:
+        _, declaration = rule_declaration(token_iterator)
+    except SyntaxErrorException:
+        return None
+
+    if not declaration or token_iterator.mark() != end - start:
+        return None
+
+    return declaration
+
+
+class IncrementalAnalyzer:
+    # analyzes a source again and again as it is edited, only the top-level declarations whose tokens changed are
+    # analyzed again (see declarations.py for how the tokens are split into declarations)
+    # the node of every declaration is kept by declaration_key(); a declaration with a key from the last analysis
+    # gets its node back: the same object if it is still on the same lines, a copy moved to its new lines otherwise
+    # the nodes are never changed, so the results of the earlier analyses stay as they were
+    # the tokens are a list of Token objects, e.g. from tokenize(), or from relex() after an edit; tokens which know
+    # their lexeme are taken to be the ones the lexer made from it
+
+    def __init__(self):
+        self.declarations = {}  # key -> list of nodes, the same declaration can be written several times
+
+        # the number of declarations analyzed and reused by the last analysis
+        self.analyzed = 0
+        self.reused = 0
+
+    # returns the same Unit as analyzer.analyze(), or raises the same SyntaxErrorException
+    def analyze(self, tokens: list):
+        cached, self.declarations = self.declarations, {}
+        self.analyzed = self.reused = 0
+        taken = {}  # key -> how many of the cached nodes were reused
+        declarations = []
+
+        codes = declaration_codes(tokens)
+        sources = list(map(attrgetter("source"), tokens))
+        start = 0
+        for end in split_declarations(codes):
+            key = declaration_key(tokens, codes, sources, start, end)
+            nodes = cached.get(key, ())
+            count = taken.get(key, 0)
+
+            if count < len(nodes):
+                declaration = nodes[count]
+                if declaration.line != tokens[start].line:
+                    declaration = declaration.shifted(tokens[start].line - declaration.line)
+                taken[key] = count + 1
+                self.reused += 1
+
+            else:
+                declaration = analyze_declaration(tokens, start, end)
+                if declaration is None:
+                    # the unit analysis from there gives the error; the nodes of this analysis are kept along with
+                    # the old ones, for the analysis after the error is fixed
+                    self.declarations = {**cached, **self.declarations}
+                    return self.analyze_rest(tokens, start, declarations)
+                self.analyzed += 1
+
+            self.declarations.setdefault(key, []).append(declaration)
+            declarations.append(declaration)
+            start = end
+
+        return Unit(declarations, tokens[0].line)
+
+    # the unit analysis of the tokens from start on, after the declarations before them
+    def analyze_rest(self, tokens: list, start: int, declarations: list):
+        _, unit = rule_unit(TokenCursor(tokens, start))
+
+        return Unit(declarations + unit.declarations, tokens[0].line)
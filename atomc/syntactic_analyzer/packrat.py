@@ -0,0 +1,80 @@
+import functools
+import types
+
+from atomc.syntactic_analyzer.syntax_error_exception import SyntaxErrorException
+
+# the most results a memo keeps at a time
+default_max_entries = 1 << 16
+
+
+class PackratMemo:
+    # the results of the grammar rules by (rule, token position), for the packrat mode of the analyzer
+    # a rule which already ran at a position is not run again, its result is replayed: the position after it and
+    # whether it was satisfied, or the SyntaxErrorException it raised
+    # the memory is bounded two ways:
+    # - the results before the last commit() of the cursor are dropped, the analysis never backtracks there again
+    # - past max_entries, the oldest results are dropped first; a dropped result is only computed again when needed,
+    #   so the outcome of the analysis never changes
+
+    def __init__(self, max_entries: int = default_max_entries):
+        self.max_entries = max_entries
+        self.entries = {}  # (rule, position) -> (position after the rule, result or exception)
+        self.hits = 0
+
+    def store(self, key: tuple, entry: tuple):
+        self.entries[key] = entry
+
+        if len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+
+    # drops the results of the rules which started before position
+    def evict(self, position: int):
+        self.entries = {key: entry for key, entry in self.entries.items() if key[1] >= position}
+
+
+# makes a grammar rule use the memo of the cursor
+def memoized(rule):
+    @functools.wraps(rule)
+    def memoized_rule(token_iterator):
+        memo = token_iterator.memo
+        key = (rule, token_iterator.mark())
+        entry = memo.entries.get(key)
+
+        if entry is not None:
+            memo.hits += 1
+            position, result = entry
+            token_iterator.reset(position)
+
+            if isinstance(result, SyntaxErrorException):
+                raise result
+            return token_iterator, result
+
+        try:
+            token_iterator, result = rule(token_iterator)
+        except SyntaxErrorException as exc:
+            memo.store(key, (token_iterator.mark(), exc))
+            raise
+
+        memo.store(key, (token_iterator.mark(), result))
+        return token_iterator, result
+
+    return memoized_rule
+
+
+# returns a copy of the namespace of a module (its globals()) where every rule_* function is memoized
+# all the functions of the module are copied to look up the others in the new namespace, so the recursive calls are
+# memoized too, also the ones made from helpers (e.g. the rules of the operands of the binary operators), while the
+# functions of the module itself stay untouched
+def memoized_rules(namespace: dict):
+    packrat_namespace = dict(namespace)
+
+    for name, function in namespace.items():
+        if isinstance(function, types.FunctionType) and function.__module__ == namespace["__name__"]:
+            copy = functools.update_wrapper(types.FunctionType(function.__code__, packrat_namespace, name,
+                                                               function.__defaults__, function.__closure__), function)
+            if name.startswith("rule_"):
+                copy = memoized(copy)
+
+            packrat_namespace[name] = copy
+
+    return packrat_namespace
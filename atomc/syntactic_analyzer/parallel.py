@@ -0,0 +1,178 @@
+import gc
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from operator import attrgetter
+
+from atomc.lexer.token import Code, lexeme_converters, unset
+from atomc.lexer.token_stream import TokenStream
+from atomc.syntactic_analyzer.analyzer import analyze, unit_declarations
+from atomc.syntactic_analyzer.declarations import split_declarations, declaration_codes
+from atomc.syntactic_analyzer.recovery import default_max_errors
+from atomc.syntactic_analyzer.syntax_error_exception import SyntaxErrorException
+from atomc.syntactic_analyzer.syntax_tree import Unit
+from atomc.syntactic_analyzer.token_cursor import TokenCursor, PackedTokenCursor
+
+# PARALLEL ANALYSIS:
+# the tokens are split in chunks of whole top-level declarations (see declarations.py), every chunk is analyzed on its
+# own as a unit, in a separate process, and the declarations of the chunks are put back together in order
+# a chunk with a syntax error is only reported as such by its process; the errors are found by analyzing the chunk
+# again in this process, in the loop of unit (unit_declarations() in analyzer.py), from the start of the chunk, so
+# they are exactly the ones the whole analysis finds; when that analysis comes back to the top level at the start of a
+# chunk without errors, it takes the declarations of that chunk and goes on after it
+# the nodes built by the processes have to be sent back and built again here (Node.__reduce__), in recognize mode
+# only the codes are sent and nothing but whether the chunk follows the grammar is sent back, so that mode scales best
+# with the number of processes
+
+# the code values of the tokens which have a value computed from their lexeme
+lexeme_values = {code.value for code in lexeme_converters}
+
+# the chunks analyzed in parallel have at least this many tokens, smaller inputs are not worth sending to processes
+parallel_chunk_size = 1 << 14
+
+
+# the columns of a TokenStream for the tokens, a list of Token objects or a TokenStream, to slice the chunks from:
+# source, codes, lines, offsets, ends, values
+# the tokens from the lexer (which all know their lexeme in the same source) are sent without their values, the
+# processes compute them from the lexemes; in recognize mode only the codes are sent
+def token_columns(tokens, codes: bytes, recognize: bool):
+    if recognize:
+        return None, codes, None, None, None, None
+
+    if isinstance(tokens, TokenStream):
+        return tokens.source, tokens.codes, tokens.lines, tokens.offsets, tokens.ends, tokens.values
+
+    lines = array('I', map(attrgetter("line"), tokens))
+    source = tokens[0].source
+    if source is not None and list(map(attrgetter("source"), tokens)).count(source) == len(tokens):
+        return source, codes, lines, array('I', map(attrgetter("start"), tokens)), \
+            array('I', map(attrgetter("end"), tokens)), None
+
+    return None, codes, lines, None, None, [tk.value for tk in tokens]
+
+
+# the columns of the tokens from start to end followed by an END token, to send to a process
+def chunk_columns(columns: tuple, start: int, end: int):
+    chunk = tuple(None if column is None else column[start:end + 1] for column in columns[1:])
+    return (columns[0],) + chunk
+
+
+# the TokenStream of a chunk, in the process which analyzes it
+# the columns which were not sent are filled in: no lines and offsets in recognize mode, the values from the lexemes
+def chunk_stream(columns: tuple):
+    source, codes, lines, offsets, ends, values = columns
+    zeros = array('I', bytes(4 * len(codes)))
+
+    stream = TokenStream(source)
+    stream.codes = array('B', codes)
+    stream.lines = zeros if lines is None else lines
+    stream.offsets = zeros if offsets is None else offsets
+    stream.ends = zeros if ends is None else ends
+    if values is None:
+        values = [unset if source is not None and code in lexeme_values else None for code in codes]
+    stream.values = values
+
+    # the chunk ends with the first token after it, which is taken as END
+    stream.codes[-1] = Code.END.value
+    stream.values[-1] = None
+    return stream
+
+
+# analyzes one chunk in a worker process
+# returns its declarations (True in recognize mode), or None if it has a syntax error
+def analyze_chunk(columns: tuple, recognize: bool):
+    stream = chunk_stream(columns)
+
+    try:
+        # the generated parser is the fastest way to recognize the tokens
+        if recognize:
+            return analyze(stream, generated=True)
+
+        return analyze(stream).declarations
+
+    except SyntaxErrorException:
+        return None
+
+
+# the positions at which the tokens are split in (at most) count chunks of whole declarations, of at least min_size
+# tokens each
+def find_chunk_points(codes: bytes, count: int, min_size: int):
+    points = []
+    size = max(len(codes) // count, min_size)
+    target = size
+
+    for end in split_declarations(codes):
+        if end >= target:
+            if end + min_size > len(codes):
+                break
+
+            points.append(end)
+            target = end + size
+
+    return points
+
+
+# same as analyze(), but large inputs are split in chunks of top-level declarations analyzed in parallel, by up to
+# workers processes; the tokens can be a list of Token objects or a TokenStream
+# recognize: only check that the tokens follow the grammar and return True, as analyze() does
+# recovering: do not stop at the first syntax error, return the syntax tree (True in recognize mode) and the list of
+# errors, as analyze_recovering() does
+# the result and the errors are the same as the ones of the analysis of the whole input
+def analyze_parallel(tokens, workers: int = None, min_chunk_size: int = parallel_chunk_size, recognize: bool = False,
+                     recovering: bool = False, max_errors: int = default_max_errors):
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    codes = declaration_codes(tokens)
+    points = find_chunk_points(codes, workers, min_chunk_size)
+
+    if not points and not recovering:
+        return analyze(tokens, recognize=recognize)
+
+    # every chunk is sent with the token after it, which it takes as its END
+    bounds = [0] + points + [len(codes) - 1]
+    chunks = {}
+    if points:
+        columns = token_columns(tokens, codes, recognize)
+        sent = [chunk_columns(columns, start, end) for start, end in zip(bounds, bounds[1:])]
+
+        # the garbage collector would go through the nodes again and again while they are built, they are only ever
+        # added to, so it is paused until they are all here, and in the processes (which can also start with a copy
+        # of all the tokens, when forked); otherwise it takes most of the time
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            with ProcessPoolExecutor(len(sent), initializer=gc.disable) as executor:
+                results = list(executor.map(analyze_chunk, sent, repeat(recognize)))
+        finally:
+            if collecting:
+                gc.enable()
+
+        chunks = {start: (end, result) for start, end, result in zip(bounds, bounds[1:], results)
+                  if result is not None}
+
+    if isinstance(tokens, TokenStream):
+        token_iterator = PackedTokenCursor(tokens)
+    else:
+        token_iterator = TokenCursor(tokens)
+    token_iterator.recognize = recognize
+
+    if recovering:
+        token_iterator.errors = []
+        token_iterator.max_errors = max_errors
+
+    # without chunks, this is the recovering analysis of the whole input in this process
+    declarations = []
+    try:
+        unit_declarations(token_iterator, declarations, chunks)
+    except SyntaxErrorException:
+        if not recovering:
+            raise
+        return None, token_iterator.errors
+
+    unit = True if recognize else Unit(declarations, tokens[0].line)
+    if recovering:
+        return unit, token_iterator.errors
+
+    return unit
@@ -0,0 +1,886 @@
+import os
+import sys
+import textwrap
+
+from atomc.lexer.token import Code
+from atomc.syntactic_analyzer.grammar import rules, token_names, nullable_rules, first_sets, follow_sets, start_rule, \
+    node_first, node_nullable
+
+# PARSER GENERATOR:
+# builds generated_parser.py from the grammar of atomc.grammar: a table-driven LL parser, which recognizes the same
+# language as analyzer.py and reports the same syntax errors, from the error messages written in the grammar
+#
+# the parser runs on a stack of instructions, the top one runs next:
+# - MATCH code: consumes a token with that code
+# - DECIDE table: picks how to go on from the code of the current token, table: code -> entry, and a default entry
+#   for the codes missing from the table; an entry consumes the token and pushes the rest of the alternative it
+#   picked, so one table lookup both picks the alternative and consumes its first token
+# - FRAME_END: see the frames below
+# the tables are built from the FIRST sets of the alternatives:
+# - an entry goes straight down the leftmost symbols of the alternative, through the rules it starts with, to the
+#   token; the rest of every rule it went through is pushed, so there is no instruction per rule call
+# - the optional parts and the repetitions are greedy, they are taken as soon as their FIRST set allows, their
+#   FIRST / FOLLOW conflicts (the else of an if) are resolved this way
+# - the FIRST / FIRST conflicts are resolved by looking at the next tokens (up to max_lookahead), and when no number
+#   of tokens is enough (exprAssign: exprUnary ASSIGN exprAssign | exprOr, where exprOr starts with an exprUnary of
+#   any length), by left-corner factoring: the exprUnary both alternatives start with is parsed first, then a DECIDE
+#   on the token after it picks the rest of one of them
+# - a conflict resolved by none of these is an error of the grammar, the generation fails
+#
+# the errors: a symbol of the grammar with an error message raises it when it is not found, a symbol without one
+# makes the rule it is in not satisfied, so the analysis goes back to the start of the rule, and the symbol which
+# called the rule reports the error instead, or the optional part / repetition it is in is skipped
+# so a DECIDE for a symbol with an error message, which can fail after consuming tokens, opens a frame: the position
+# of the stack and of the tokens to go back to, and what to do then (raise the message, or skip); FRAME_END closes it
+# once the symbol is done
+
+generated_path = os.path.join(os.path.dirname(__file__), "generated_parser.py")
+
+# the most tokens looked at to pick an alternative
+max_lookahead = 4
+
+# what a frame does when the analysis goes back to it: skip the optional part / repetition, instead of raising
+skip = 1
+
+
+# one instruction of the parser, kind: MATCH, DECIDE or FRAME_END
+# can_fail: the instruction can make the rule it is in not satisfied (it has no error message of its own)
+class Instruction:
+    def __init__(self, kind: str, code: Code = None, fail: str = None, can_fail: bool = False):
+        self.kind = kind
+        self.code = code
+        self.fail = fail
+        self.can_fail = can_fail
+
+        # DECIDE: code -> entry or Lookahead, filled in by ParserGenerator.build_tables()
+        self.table = {}
+        self.default = None
+        self.build = None
+
+
+# consumes advance tokens, opens the frames (offset in items, fail), then pushes the items (the top one last)
+# can_fail: some of the items can fail, outside of the frames of the entry
+class Entry:
+    def __init__(self, advance: int, items: list, frames: list, can_fail: bool):
+        self.advance = advance
+        self.items = items
+        self.frames = frames
+        self.can_fail = can_fail
+
+
+# looks at the token depth positions after the current one to pick an entry, branches: code -> entry or Lookahead
+class Lookahead:
+    def __init__(self, depth: int, branches: dict, default):
+        self.depth = depth
+        self.branches = branches
+        self.default = default
+
+
+# only while looking for the left corner of an alternative: the alternative got to it, tails are the symbols left
+# after it, in the order they come
+class Corner:
+    def __init__(self, tails: list):
+        self.tails = tails
+
+
+# the nodes of a sequence, [] for e
+def sequence_items(node: tuple):
+    if node[0] == "sequence":
+        return node[1]
+    if node[0] == "empty":
+        return []
+
+    return [node]
+
+
+# the alternatives of a choice (or of a rule which is not one), as lists of nodes
+def alternative_items(node: tuple):
+    if node[0] == "choice":
+        return [sequence_items(alternative) for alternative in node[1]]
+
+    return [sequence_items(node)]
+
+
+def items_first(items: list):
+    return node_first(("sequence", items), first_sets, nullable_rules)
+
+
+def items_nullable(items: list):
+    return node_nullable(("sequence", items), nullable_rules)
+
+
+def is_rule(node: tuple):
+    return node[0] == "symbol" and node[1] in rules
+
+
+# the error message of a symbol, None if it has none
+def node_message(node: tuple):
+    return node[2] if node[0] == "symbol" and len(node) > 2 else None
+
+
+# applies leaf() to every Entry and Corner of a structure built by derive()
+def map_leaves(structure, leaf):
+    if isinstance(structure, Lookahead):
+        branches = {code: map_leaves(branch, leaf) for code, branch in structure.branches.items()}
+        return Lookahead(structure.depth, branches, map_leaves(structure.default, leaf))
+
+    return leaf(structure)
+
+
+# the most tokens after the current one a structure looks at
+def lookahead_depth(structure):
+    if isinstance(structure, Lookahead):
+        return max([structure.depth, lookahead_depth(structure.default)] +
+                   [lookahead_depth(branch) for branch in structure.branches.values()])
+
+    return 0
+
+
+def has_corner(structure):
+    if isinstance(structure, Lookahead):
+        return any(has_corner(branch) for branch in structure.branches.values()) or has_corner(structure.default)
+
+    return isinstance(structure, Corner)
+
+
+class ParserGenerator:
+    def __init__(self):
+        self.instructions = {}  # key -> Instruction, in the order they were made
+        self.frame_end = self.instruction(("frame_end",), "FRAME_END")
+        self.derived = {}
+        self.first_k_sets = {}
+        self.pending = []
+
+        # the conflicts of the grammar and how they were resolved: (rule, kind, resolution) -> codes
+        self.conflicts = {}
+
+        self.check_grammar()
+        self.deep = self.compute_deep()
+        self.report_first_follow_conflicts()
+
+    # ANALYSIS OF THE GRAMMAR
+
+    # the error messages are only reported for the symbols which are not the first of their alternative, the first one
+    # is the one the alternative is picked by
+    def check_grammar(self):
+        if len(alternative_items(rules[start_rule])) != 1:
+            raise ValueError("the start rule " + start_rule + " must have a single alternative")
+
+        for name, node in rules.items():
+            self.check_node(name, node)
+
+    def check_node(self, name: str, node: tuple):
+        kind = node[0]
+        if kind in ("sequence", "choice"):
+            for items in alternative_items(node):
+                if items and node_message(items[0]) is not None:
+                    raise ValueError("error message on the first symbol of an alternative of " + name)
+            for item in node[1]:
+                self.check_node(name, item)
+
+        elif kind in ("optional", "repeat"):
+            if kind == "repeat" and node_nullable(node[1], nullable_rules):
+                raise ValueError("repetition of something which can be empty in " + name)
+            self.check_node(name, node[1])
+
+    # deep[rule]: the rule can be not satisfied after its first token was consumed, so the analysis has to go back
+    # to the start of the rule; computed by iterating until nothing changes, like the FIRST sets
+    def compute_deep(self):
+        self.deep = {name: False for name in rules}
+
+        changed = True
+        while changed:
+            changed = False
+            for name, node in rules.items():
+                if not self.deep[name] and any(self.items_deep(items) for items in alternative_items(node)):
+                    self.deep[name] = True
+                    changed = True
+
+        return self.deep
+
+    # a sequence can fail after its first token: its first symbol can, or one of the others can fail at all
+    def items_deep(self, items: list):
+        items = [item for item in items if item[0] != "empty"]
+        if not items:
+            return False
+
+        return self.node_deep(items[0]) or any(self.node_can_fail(item) for item in items[1:])
+
+    def node_deep(self, node: tuple):
+        kind = node[0]
+        if kind == "symbol":
+            return is_rule(node) and self.deep[node[1]]
+        if kind in ("sequence", "choice"):
+            return any(self.items_deep(items) for items in alternative_items(node))
+
+        # empty; the optional parts and the repetitions are skipped when they fail
+        return False
+
+    # a node which is not the first of its sequence can make the sequence fail
+    def node_can_fail(self, node: tuple):
+        kind = node[0]
+        if kind == "symbol":
+            if node_message(node) is not None:
+                return False
+            return not is_rule(node) or node[1] not in nullable_rules or self.deep[node[1]]
+        if kind == "sequence":
+            return any(self.node_can_fail(item) for item in node[1])
+        if kind == "choice":
+            return not node_nullable(node, nullable_rules) or self.node_deep(node)
+
+        return False
+
+    # the FIRST / FOLLOW conflicts, resolved by taking the longest match: the optional parts and the repetitions which
+    # can start with a token which can also come after them, the rules which can be empty and start with a token which
+    # can come after them
+    def report_first_follow_conflicts(self):
+        for name, node in rules.items():
+            self.add_group_conflicts(name, node, follow_sets[name])
+
+            if name in nullable_rules:
+                first = set()
+                for items in alternative_items(node):
+                    if not items_nullable(items):
+                        first |= items_first(items)
+
+                for code in first & follow_sets[name]:
+                    self.add_conflict(name, "FIRST / FOLLOW", code, "the longest match")
+
+    # after: the codes which can come after node
+    def add_group_conflicts(self, name: str, node: tuple, after: set):
+        kind = node[0]
+        if kind in ("optional", "repeat"):
+            first = node_first(node[1], first_sets, nullable_rules)
+            for code in first & after:
+                self.add_conflict(name, "FIRST / FOLLOW", code, "the longest match")
+
+            self.add_group_conflicts(name, node[1], after | first if kind == "repeat" else after)
+
+        elif kind == "sequence":
+            for item in reversed(node[1]):
+                self.add_group_conflicts(name, item, after)
+                first = node_first(item, first_sets, nullable_rules)
+                after = after | first if node_nullable(item, nullable_rules) else first
+
+        elif kind == "choice":
+            for item in node[1]:
+                self.add_group_conflicts(name, item, after)
+
+    # the sequences of the first k codes the items can start with, as tuples; the shorter ones end the items
+    def first_k(self, items: list, k: int):
+        if k == 0 or not items:
+            return {()}
+
+        result = set()
+        for head in self.node_first_k(items[0], k):
+            if len(head) == k:
+                result.add(head)
+            else:
+                for tail in self.first_k(items[1:], k - len(head)):
+                    result.add(head + tail)
+
+        return result
+
+    def node_first_k(self, node: tuple, k: int):
+        key = (node[1], k) if node[0] == "symbol" else (id(node), k)
+        if key in self.first_k_sets:
+            return self.first_k_sets[key]
+
+        kind = node[0]
+        if kind == "symbol":
+            if is_rule(node):
+                result = set()
+                for items in alternative_items(rules[node[1]]):
+                    result |= self.first_k(items, k)
+            else:
+                result = {(Code[node[1]],)}
+
+        elif kind in ("sequence", "choice"):
+            result = set()
+            for items in alternative_items(node):
+                result |= self.first_k(items, k)
+
+        elif kind == "optional":
+            result = self.first_k(sequence_items(node[1]), k) | {()}
+
+        elif kind == "repeat":
+            result = self.first_k(sequence_items(node[1]) + [node], k) | {()}
+
+        else:
+            result = {()}
+
+        self.first_k_sets[key] = result
+        return result
+
+    def add_conflict(self, name: str, kind: str, code: Code, resolution: str):
+        self.conflicts.setdefault((name, kind, resolution), set()).add(code)
+
+    # the conflicts, one line for each rule, kind and resolution
+    def report(self):
+        return [name + ": " + kind + " conflict on " + ", ".join(sorted(code.name for code in codes)) +
+                ", resolved by " + resolution for (name, kind, resolution), codes in sorted(self.conflicts.items())]
+
+    # INSTRUCTIONS
+
+    def instruction(self, key: tuple, kind: str, code: Code = None, fail: str = None, can_fail: bool = False):
+        if key not in self.instructions:
+            self.instructions[key] = Instruction(kind, code, fail, can_fail)
+
+        return self.instructions[key]
+
+    # the instructions which parse the items, in the order they are pushed (the first item on top)
+    def compile(self, items: list):
+        instructions = []
+        for node in reversed(items):
+            instructions += self.node_instructions(node)
+
+        return instructions
+
+    def node_instructions(self, node: tuple):
+        kind = node[0]
+        if kind == "empty":
+            return []
+        if kind == "sequence":
+            return self.compile(node[1])
+
+        if kind == "symbol":
+            message = node_message(node)
+            if not is_rule(node):
+                code = Code[node[1]]
+                return [self.instruction(("match", code, message), "MATCH", code, message, message is None)]
+
+            return [self.rule_decision(node[1], message)]
+
+        return [self.group_decision(node)]
+
+    def decision(self, key: tuple, fail: str, can_fail: bool, build):
+        new = key not in self.instructions
+        instruction = self.instruction(key, "DECIDE", None, fail, can_fail)
+        if new:
+            instruction.build = build
+            self.pending.append(instruction)
+
+        return instruction
+
+    # a rule called by a symbol, with the error message of the symbol
+    def rule_decision(self, name: str, fail: str):
+        can_fail = fail is None and (name not in nullable_rules or self.deep[name])
+
+        def build(instruction: Instruction):
+            for code in sorted(first_sets[name], key=lambda code: code.value):
+                structure = self.decide(alternative_items(rules[name]), code, None, name)
+                instruction.table[code] = self.scope(structure, fail, None)
+
+            if name in nullable_rules:
+                instruction.default = Entry(0, [], [], False)
+
+        return self.decision(("rule", name, fail), fail, can_fail, build)
+
+    # an optional part, a repetition or a choice inside a rule
+    def group_decision(self, node: tuple):
+        kind = node[0]
+
+        def build(instruction: Instruction):
+            for code in sorted(node_first(node, first_sets, nullable_rules), key=lambda code: code.value):
+                if kind == "choice":
+                    structure = self.decide(alternative_items(node), code, None, self.rule_of(node))
+                else:
+                    structure = self.scope(self.derive(sequence_items(node[1]), code), skip,
+                                           instruction if kind == "repeat" else None)
+                instruction.table[code] = structure
+
+            if node_nullable(node, nullable_rules):
+                instruction.default = Entry(0, [], [], False)
+
+        return self.decision(("group", id(node)), None, kind == "choice" and self.node_can_fail(node), build)
+
+    # after the left corner of exprAssign: picks one of the alternatives, as the sequences of nodes left
+    def corner_decision(self, alternatives: list):
+        nullable = [items for items in alternatives if items_nullable(items)]
+        can_fail = not nullable or any(self.items_deep(items) for items in alternatives)
+
+        def build(instruction: Instruction):
+            codes = set()
+            for items in alternatives:
+                codes |= items_first(items)
+
+            for code in sorted(codes, key=lambda code: code.value):
+                instruction.table[code] = self.decide(alternatives, code, None, "left corner")
+
+            if nullable:
+                instruction.default = Entry(0, [], [], False)
+
+        key = ("corner",) + tuple(tuple(id(node) for node in items) for items in alternatives)
+        return self.decision(key, None, can_fail, build)
+
+    # the rule an optional part, a repetition or a choice is in, for the reports
+    def rule_of(self, node: tuple):
+        for name, rule in rules.items():
+            if self.contains(rule, node):
+                return name
+
+        return "?"
+
+    def contains(self, node: tuple, part: tuple):
+        if node is part:
+            return True
+        if node[0] in ("sequence", "choice"):
+            return any(self.contains(item, part) for item in node[1])
+        if node[0] in ("optional", "repeat"):
+            return self.contains(node[1], part)
+
+        return False
+
+    # builds the tables of the DECIDE instructions, and of the ones they push, until there are no new ones
+    def build_tables(self):
+        while self.pending:
+            instruction = self.pending.pop(0)
+            instruction.build(instruction)
+
+    # ENTRIES
+
+    # how to parse the items, when the current token has the given code: an Entry which consumes the token, a
+    # Lookahead when more tokens are needed to know which one, None if the items cannot start with that code
+    # corner: the rule to stop at when it is the leftmost symbol, so the result is a Corner (see left_corner())
+    def derive(self, items: list, code: Code, corner: str = None):
+        key = (tuple(id(node) for node in items), code, corner)
+        if key not in self.derived:
+            self.derived[key] = self.derive_items(items, code, corner)
+
+        return self.derived[key]
+
+    def derive_items(self, items: list, code: Code, corner: str):
+        # the leftmost node
+        while items and items[0][0] in ("empty", "sequence"):
+            items = sequence_items(items[0]) + items[1:]
+        if not items:
+            return None
+
+        node = items[0]
+        rest = items[1:]
+        kind = node[0]
+
+        if code not in node_first(node, first_sets, nullable_rules):
+            # the node is empty here, the longest match takes it when it can
+            if node_nullable(node, nullable_rules):
+                return self.derive(rest, code, corner)
+            return None
+
+        if kind == "symbol":
+            if not is_rule(node):
+                structure = Entry(1, [], [], False)
+            elif node[1] == corner:
+                return Corner(rest)
+            else:
+                structure = self.decide(alternative_items(rules[node[1]]), code, corner, node[1])
+
+        elif kind == "choice":
+            structure = self.decide(alternative_items(node), code, corner, self.rule_of(node))
+
+        elif kind == "optional":
+            structure = self.scope(self.derive(sequence_items(node[1]), code), skip, None)
+
+        else:
+            structure = self.scope(self.derive(sequence_items(node[1]), code), skip, self.group_decision(node))
+
+        return self.append(structure, rest)
+
+    # picks one of the alternatives which can start with the code
+    def decide(self, alternatives: list, code: Code, corner: str, name: str):
+        candidates = [items for items in alternatives if code in items_first(items)]
+        if len(candidates) == 1:
+            return self.derive(candidates[0], code, corner)
+
+        if not candidates:
+            return None
+
+        if corner is None:
+            structure = self.left_corner(candidates, code, name)
+            if structure is not None:
+                return structure
+
+        structure = self.lookahead(candidates, (code,), corner, name)
+        self.add_conflict(name, "FIRST / FIRST", code, str(lookahead_depth(structure) + 1) + " tokens of lookahead")
+        return structure
+
+    # the alternatives can all start with the tokens in prefix: picks one of them from the tokens after it
+    def lookahead(self, alternatives: list, prefix: tuple, corner: str, name: str):
+        depth = len(prefix)
+        if depth >= max_lookahead:
+            raise ValueError(name + ": FIRST / FIRST conflict on " + " ".join(code.name for code in prefix) +
+                             ", not resolved by " + str(max_lookahead) + " tokens of lookahead")
+
+        branches = {}
+        for items in alternatives:
+            for sequence in self.first_k(items, depth + 1):
+                if sequence[:depth] != prefix:
+                    continue
+
+                # the alternative can end here, so it can be followed by anything
+                next_codes = [sequence[depth]] if len(sequence) > depth else list(Code)
+                for next_code in next_codes:
+                    candidates = branches.setdefault(next_code, [])
+                    if not any(candidate is items for candidate in candidates):
+                        candidates.append(items)
+
+        # when the next token continues none of them: the analyzers try the alternatives in order, so the first one
+        # which reports an error there is taken, or the last one if none does
+        default = next((items for items in alternatives if any(self.reports(items, prefix, [], False))),
+                       alternatives[-1])
+        structure = Lookahead(depth, {}, self.derive(default, prefix[0], corner))
+
+        for next_code in sorted(branches, key=lambda code: code.value):
+            candidates = branches[next_code]
+            if len(candidates) == 1:
+                if candidates[0] is not default:
+                    structure.branches[next_code] = self.derive(candidates[0], prefix[0], corner)
+            else:
+                structure.branches[next_code] = self.lookahead(candidates, prefix + (next_code,), corner, name)
+
+        return structure
+
+    # the items go over the codes of prefix: for every way they can, whether the symbol after them reports an error
+    # when it is missing, instead of making the items not satisfied
+    # callers: the items left after each rule the items are in, and whether the symbol which called it had a message
+    # (the rule it calls reports the error then); message: the same for the rule the items are in
+    def reports(self, items: list, prefix: tuple, callers: list, message: bool):
+        while items and items[0][0] in ("empty", "sequence"):
+            items = sequence_items(items[0]) + items[1:]
+        if not items:
+            if not callers:
+                return [False]
+            rest, caller_message = callers[-1]
+            return self.reports(rest, prefix, callers[:-1], caller_message)
+
+        node = items[0]
+        rest = items[1:]
+        kind = node[0]
+
+        # the optional parts and the repetitions are skipped when they fail
+        if kind in ("optional", "repeat"):
+            result = self.reports(rest, prefix, callers, message)
+            if prefix:
+                inner = sequence_items(node[1]) + ([node] if kind == "repeat" else [])
+                result += self.reports(inner + rest, prefix, callers, message)
+            return result
+
+        # an empty symbol or choice lets the one after it report
+        if not prefix and node_nullable(node, nullable_rules):
+            return self.reports(rest, prefix, callers, message)
+
+        if kind == "choice":
+            if not prefix:
+                return [message]
+            return [flag for alternative in alternative_items(node)
+                    for flag in self.reports(alternative + rest, prefix, callers, message)]
+
+        if not prefix:
+            return [message or node_message(node) is not None]
+
+        if not is_rule(node):
+            return self.reports(rest, prefix[1:], callers, message) if Code[node[1]] is prefix[0] else []
+
+        callers = callers + [(rest, message)]
+        message = message or node_message(node) is not None
+        return [flag for alternative in alternative_items(rules[node[1]])
+                for flag in self.reports(alternative, prefix, callers, message)]
+
+    # left-corner factoring of two alternatives, one starting with a rule, the corner, the other one getting to it as
+    # its leftmost symbol, e.g. exprUnary ASSIGN exprAssign | exprOr: the corner is parsed first, then the rest of the
+    # first alternative or what the second one has left after the corner
+    def left_corner(self, alternatives: list, code: Code, name: str):
+        if len(alternatives) != 2:
+            return None
+
+        for corner_items, other in (alternatives, alternatives[::-1]):
+            if not corner_items or not is_rule(corner_items[0]):
+                continue
+
+            corner = corner_items[0][1]
+            structure = self.derive(other, code, corner)
+            if not has_corner(structure):
+                continue
+
+            self.add_conflict(name, "FIRST / FIRST", code, "left-corner factoring on " + corner)
+
+            def leaf(part):
+                if not isinstance(part, Corner):
+                    return part
+
+                # the corner, then the decision between the rests of the alternatives
+                tails = self.corner_decision([corner_items[1:], part.tails])
+                return self.append_instructions(self.derive(corner_items[:1], code), [tails])
+
+            return map_leaves(structure, leaf)
+
+        return None
+
+    # the structure followed by the rest of the items
+    def append(self, structure, rest: list):
+        if not rest:
+            return structure
+
+        def leaf(part):
+            if isinstance(part, Corner):
+                return Corner(part.tails + rest)
+
+            return self.append_instructions(part, self.compile(rest))
+
+        return map_leaves(structure, leaf)
+
+    def append_instructions(self, structure, instructions: list):
+        can_fail = any(instruction.can_fail for instruction in instructions)
+
+        def leaf(entry: Entry):
+            return Entry(entry.advance, instructions + entry.items,
+                         [(offset + len(instructions), fail) for offset, fail in entry.frames],
+                         entry.can_fail or can_fail)
+
+        return map_leaves(structure, leaf)
+
+    # the structure parses something which fails as a whole: with the error message fail, or skipped when fail is
+    # skip; loop: the DECIDE of a repetition, pushed again under it
+    def scope(self, structure, fail, loop: Instruction):
+        def leaf(entry):
+            if isinstance(entry, Corner):
+                raise ValueError("left corner inside an optional part or a repetition")
+
+            items = [loop] if loop is not None else []
+            frames = []
+            if entry.can_fail and fail is not None:
+                frames.append((0, fail))
+                items.append(self.frame_end)
+
+            frames += [(offset + len(items), frame_fail) for offset, frame_fail in entry.frames]
+            return Entry(entry.advance, items + entry.items, frames, entry.can_fail and fail is None)
+
+        return map_leaves(structure, leaf)
+
+    # MODULE
+
+    # the text of generated_parser.py
+    def generate(self):
+        start = self.compile(alternative_items(rules[start_rule])[0])
+        self.build_tables()
+        return ModuleWriter(self, start).write()
+
+
+# writes the tables of a ParserGenerator as python literals, every instruction, entry, lookahead and error message is
+# a module variable, so the tables can refer to each other (the rules are recursive)
+class ModuleWriter:
+    def __init__(self, generator: ParserGenerator, start: list):
+        self.generator = generator
+        self.start = start
+        self.names = {}  # id of an Instruction or a message -> its name
+        self.messages = []
+        self.instructions = list(generator.instructions.values())
+        self.tables = [instruction for instruction in self.instructions if instruction.kind == "DECIDE"]
+        self.entries = {}  # literal -> name, the entries and lookaheads, in the order they refer to each other
+
+        for number, instruction in enumerate(self.instructions):
+            self.names[id(instruction)] = "i" + str(number)
+        for number, instruction in enumerate(self.tables):
+            self.names[("table", id(instruction))] = "t" + str(number)
+
+    def message(self, fail):
+        if fail is None:
+            return "None"
+        if fail is skip:
+            return "SKIP"
+
+        if fail not in self.names:
+            self.names[fail] = "m" + str(len(self.messages))
+            self.messages.append(fail)
+        return self.names[fail]
+
+    # the name of an entry or a lookahead, the literal of which is written before it is used
+    def entry(self, structure):
+        if isinstance(structure, Lookahead):
+            branches = ["DEPTH: " + str(structure.depth), "DEFAULT: " + self.entry(structure.default)]
+            branches += [str(code.value) + ": " + self.entry(branch) + ",  # " + code.name
+                         for code, branch in structure.branches.items()]
+            literal = "{\n    " + ",\n    ".join(branches[:2]) + ",\n" + \
+                      "".join("    " + branch + "\n" for branch in branches[2:]) + "}"
+            literal = literal.replace(",\n}", "\n}")
+            prefix = "l"
+        else:
+            items = tuple_literal([self.names[id(instruction)] for instruction in structure.items])
+            frames = tuple_literal([tuple_literal([str(offset), self.message(fail)])
+                                    for offset, fail in structure.frames])
+            literal = tuple_literal([str(structure.advance), items, frames])
+            prefix = "e"
+
+        if literal not in self.entries:
+            self.entries[literal] = prefix + str(len(self.entries))
+        return self.entries[literal]
+
+    def instruction_literal(self, instruction: Instruction):
+        if instruction.kind == "MATCH":
+            return tuple_literal(["MATCH", str(instruction.code.value), self.message(instruction.fail)]) + \
+                   "  # " + instruction.code.name
+        if instruction.kind == "FRAME_END":
+            return tuple_literal(["FRAME_END"])
+
+        # the default entries are the empty alternatives, which push nothing
+        default = "None" if instruction.default is None else "EMPTY"
+        return tuple_literal(["DECIDE", self.names[("table", id(instruction))], self.message(instruction.fail),
+                              default])
+
+    def write(self):
+        instruction_lines = [self.names[id(instruction)] + " = " + self.instruction_literal(instruction)
+                             for instruction in self.instructions]
+
+        table_lines = []
+        for instruction in self.tables:
+            branches = ["    " + str(code.value) + ": " + self.entry(structure) + ",  # " + code.name
+                        for code, structure in instruction.table.items()]
+            table_lines.append(self.names[("table", id(instruction))] + ".update({")
+            table_lines += branches
+            table_lines.append("})")
+
+        lines = [generated_header]
+        for line in self.generator.report():
+            lines += ["# " + part for part in textwrap.wrap(line, 116, initial_indent="- ", subsequent_indent="  ")]
+        lines += ["", parser_header, ""]
+        lines.append("token_names = {")
+        lines += ["    " + str(code.value) + ": " + repr(name) + ",  # " + code.name
+                  for code, name in sorted(token_names.items(), key=lambda item: item[0].value)]
+        lines += ["}", ""]
+        lines += [self.names[message] + " = " + repr(message) for message in self.messages]
+        lines.append("")
+        lines += [self.names[("table", id(instruction))] + " = {}" for instruction in self.tables]
+        lines.append("")
+        lines += instruction_lines
+        lines.append("")
+
+        # the entries refer to the instructions, the tables to the entries
+        entry_lines = [name + " = " + literal for literal, name in self.entries.items()]
+        lines += entry_lines
+        lines.append("")
+        lines += table_lines
+        lines.append("")
+        lines.append("START = " + tuple_literal([self.names[id(instruction)] for instruction in self.start]))
+        lines.append(parser_code)
+
+        return "\n".join(lines)
+
+
+def tuple_literal(items: list):
+    if len(items) == 1:
+        return "(" + items[0] + ",)"
+
+    return "(" + ", ".join(items) + ")"
+
+
+generated_header = """# GENERATED by parser_generator.py from atomc.grammar, do not edit
+# to generate it again: python -m atomc.syntactic_analyzer.parser_generator
+#
+# the conflicts of the grammar:"""
+
+parser_header = """from atomc.lexer.token_stream import TokenStream
+from atomc.syntactic_analyzer.syntax_error_exception import SyntaxErrorException
+
+# the instructions, see parser_generator.py
+DECIDE = 0  # (DECIDE, table, error message, default entry)
+MATCH = 1  # (MATCH, code, error message)
+FRAME_END = 2
+ACCEPT = 3
+
+# an entry: (tokens consumed, instructions pushed, frames opened: (offset in the instructions pushed, what to do))
+# a lookahead: code of the token DEPTH tokens after the current one -> entry or lookahead, DEFAULT for the others
+DEPTH = -2
+DEFAULT = -3
+
+# what a frame does instead of raising an error message
+SKIP = 1
+
+# the entry of the empty alternatives
+EMPTY = (0, (), ())
+
+MAX_LOOKAHEAD = """ + str(max_lookahead)
+
+parser_code = """ACCEPT_INSTRUCTION = (ACCEPT,)
+
+# the codes after the last token, so looking ahead never goes out of the list
+padding = [-1] * MAX_LOOKAHEAD
+
+
+def syntax_error(tokens, codes: list, position: int, message: str):
+    message = message.replace("{previous}", token_names.get(codes[position - 1], ""))
+    return SyntaxErrorException(tokens[position], message)
+
+
+# the recognize mode of analyzer.analyze(), for a list of Token objects or a TokenStream: True, or the same
+# SyntaxErrorException
+def parse(tokens):
+    if isinstance(tokens, TokenStream):
+        codes = list(tokens.codes)
+    else:
+        codes = [tk.code.value for tk in tokens]
+    codes += padding
+
+    stack = [ACCEPT_INSTRUCTION]
+    stack += START
+    pop = stack.pop
+    extend = stack.extend
+    frames = []
+    position = 0
+
+    while True:
+        instruction = pop()
+        kind = instruction[0]
+
+        if kind == DECIDE:
+            entry = instruction[1].get(codes[position], instruction[3])
+            if entry is not None:
+                while entry.__class__ is dict:
+                    entry = entry.get(codes[position + entry[DEPTH]], entry[DEFAULT])
+
+                advance, items, entry_frames = entry
+                if entry_frames:
+                    depth = len(stack)
+                    for offset, fail in entry_frames:
+                        frames.append((depth + offset, position, fail))
+
+                position += advance
+                extend(items)
+                continue
+
+            fail = instruction[2]
+
+        elif kind == MATCH:
+            if codes[position] == instruction[1]:
+                position += 1
+                continue
+
+            fail = instruction[2]
+
+        elif kind == FRAME_END:
+            frames.pop()
+            continue
+
+        else:
+            return True
+
+        # the rule is not satisfied: back to the start of the innermost symbol which can report it or be skipped
+        if fail is None:
+            depth, position, fail = frames.pop()
+            del stack[depth:]
+
+        if fail is not SKIP:
+            raise syntax_error(tokens, codes, position, fail)
+"""
+
+
+# writes generated_parser.py, prints the conflicts of the grammar
+if __name__ == "__main__":
+    generator = ParserGenerator()
+    text = generator.generate()
+
+    for line in generator.report():
+        print(line)
+
+    with open(generated_path, "w") as generated_file:
+        generated_file.write(text)
+
+    print("wrote " + generated_path, file=sys.stderr)
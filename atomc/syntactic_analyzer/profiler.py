@@ -0,0 +1,181 @@
+import functools
+import json
+import sys
+import types
+from time import perf_counter
+
+from atomc.syntactic_analyzer.syntax_error_exception import SyntaxErrorException
+
+# PROFILING:
+# in the profiling mode of the analyzer, every grammar rule and consume() / consume_token() record how they were
+# called in the ParserProfile of the cursor: how many times, how many of them were satisfied, not satisfied or raised
+# a syntax error, how many tokens the cursor was reset back by while they ran (backtracking), and their time
+# - total time: from the call to the return, counted once for the recursive calls (the outermost one)
+# - self time: the total time, without the time of the profiled functions it called
+# as for the packrat mode, the profiled functions are a copy of the ones of the analyzer, so the analysis costs
+# nothing more when profiling is off
+# the time of the profiled functions includes the time spent profiling the ones they call, so the times are above
+# the ones of the analysis without profiling; they still tell which rules take the time
+
+# the functions which are profiled besides the rule_* ones, they consume the terminals
+profiled_terminals = ("consume", "consume_token")
+
+
+class RuleProfile:
+    # what was recorded for one grammar rule
+
+    __slots__ = ("calls", "satisfied", "not_satisfied", "errors", "backtracks", "rewound", "total_time",
+                 "self_time", "active")
+
+    def __init__(self):
+        self.calls = 0
+        self.satisfied = 0
+        self.not_satisfied = 0
+        self.errors = 0
+
+        # the number of times the cursor was reset back while the rule ran (not in the rules it called), and the
+        # number of tokens it was reset back by
+        self.backtracks = 0
+        self.rewound = 0
+
+        # in seconds
+        self.total_time = 0.0
+        self.self_time = 0.0
+
+        # the calls of the rule which did not return yet
+        self.active = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != "active"}
+
+
+class ParserProfile:
+    # the RuleProfile of every rule called in the analyses run with this profile, they add up across analyses
+
+    def __init__(self):
+        self.rules = {}  # name of the rule function -> RuleProfile
+
+        # the profiled calls which did not return yet, innermost last: [RuleProfile, time of the profiled calls in it]
+        self.frames = []
+
+    def rule(self, name: str):
+        rule_profile = self.rules.get(name)
+        if rule_profile is None:
+            rule_profile = self.rules[name] = RuleProfile()
+
+        return rule_profile
+
+    # makes the resets of the cursor back to an earlier position count for the rule running at the time
+    def watch(self, token_iterator):
+        reset = token_iterator.reset
+
+        def profiled_reset(position: int):
+            rewound = token_iterator.mark() - position
+            if rewound > 0 and self.frames:
+                rule_profile = self.frames[-1][0]
+                rule_profile.backtracks += 1
+                rule_profile.rewound += rewound
+
+            reset(position)
+
+        # shadows the method for this cursor only
+        token_iterator.reset = profiled_reset
+
+    # the rules by self time, the slowest first
+    def sorted_rules(self):
+        return sorted(self.rules.items(), key=lambda item: (-item[1].self_time, item[0]))
+
+    def as_dict(self):
+        return {name: rule_profile.as_dict() for name, rule_profile in self.sorted_rules()}
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), indent=2)
+
+    # the report as a text table, the times in milliseconds
+    def table(self):
+        header = ("rule", "calls", "satisfied", "not satisfied", "errors", "backtracks", "rewound", "total ms",
+                  "self ms")
+        rows = [(name, str(rule_profile.calls), str(rule_profile.satisfied), str(rule_profile.not_satisfied),
+                 str(rule_profile.errors), str(rule_profile.backtracks), str(rule_profile.rewound),
+                 "%.3f" % (rule_profile.total_time * 1000), "%.3f" % (rule_profile.self_time * 1000))
+                for name, rule_profile in self.sorted_rules()]
+
+        widths = [max(len(row[column]) for row in [header] + rows) for column in range(len(header))]
+        return "\n".join(row[0].ljust(widths[0]) + "".join("  " + cell.rjust(width)
+                                                           for cell, width in zip(row[1:], widths[1:]))
+                         for row in [header] + rows)
+
+
+# makes a grammar rule (or consume()) record its calls in the profile of the cursor
+def profiled(rule, name: str):
+    @functools.wraps(rule)
+    def profiled_rule(token_iterator, *args):
+        profile = token_iterator.profile
+        rule_profile = profile.rule(name)
+        rule_profile.calls += 1
+        rule_profile.active += 1
+
+        frame = [rule_profile, 0.0]
+        profile.frames.append(frame)
+        start = perf_counter()
+
+        try:
+            token_iterator, result = rule(token_iterator, *args)
+        except SyntaxErrorException:
+            rule_profile.errors += 1
+            raise
+
+        finally:
+            elapsed = perf_counter() - start
+            profile.frames.pop()
+            rule_profile.self_time += elapsed - frame[1]
+            rule_profile.active -= 1
+            if rule_profile.active == 0:
+                rule_profile.total_time += elapsed
+            if profile.frames:
+                profile.frames[-1][1] += elapsed
+
+        # False when a rule is not satisfied, None when consume_token() or rule_array_decl() found nothing
+        if result is False or result is None:
+            rule_profile.not_satisfied += 1
+        else:
+            rule_profile.satisfied += 1
+
+        return token_iterator, result
+
+    return profiled_rule
+
+
+# returns a copy of the namespace of a module (its globals()) where every rule_* function and the functions of
+# profiled_terminals are profiled
+# all the functions of the module are copied to look up the others in the new namespace, so the rules called from
+# helpers (e.g. the ones for the binary operators) are profiled too, while the functions of the module itself stay
+# untouched
+def profiled_rules(namespace: dict):
+    profiled_namespace = dict(namespace)
+
+    for name, function in namespace.items():
+        if isinstance(function, types.FunctionType) and function.__module__ == namespace["__name__"]:
+            copy = functools.update_wrapper(types.FunctionType(function.__code__, profiled_namespace, name,
+                                                               function.__defaults__, function.__closure__), function)
+            if name.startswith("rule_") or name in profiled_terminals:
+                copy = profiled(copy, name)
+
+            profiled_namespace[name] = copy
+
+    return profiled_namespace
+
+
+# prints the profile of the analysis of a source file, as a table, or as JSON with --json
+if __name__ == "__main__":
+    import pathlib
+
+    from atomc.lexer.lexer import tokenize
+    from atomc.syntactic_analyzer.analyzer import analyze
+
+    if len(sys.argv) < 2:
+        sys.exit("usage: python -m atomc.syntactic_analyzer.profiler source.c [--json]")
+
+    profile = ParserProfile()
+    analyze(tokenize(pathlib.Path(sys.argv[1])), profile=profile)
+    print(profile.to_json() if "--json" in sys.argv[2:] else profile.table())
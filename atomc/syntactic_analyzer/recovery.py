@@ -0,0 +1,82 @@
+from atomc.lexer.token import Code
+from atomc.syntactic_analyzer.grammar import first_sets
+from atomc.syntactic_analyzer.syntax_error_exception import SyntaxErrorException
+
+# PANIC MODE RECOVERY:
+# in the recovering mode of the analyzer, a syntax error does not stop the analysis: the statement or the declaration
+# it was found in is dropped, it is recorded, and the analysis goes on from the next synchronization token
+# - inside a function body: after the next SEMICOLON, or at the next RACC or declaration start
+# - at the top level: at the next declaration start outside braces
+# the braces in the skipped tokens are matched, so a skipped block takes its whole body with it
+# the errors which come from the missing tokens are still reported at the token found instead (as analyze() does),
+# so the first error is always the one analyze() raises
+
+# the most errors recorded before the analysis gives up
+default_max_errors = 100
+
+# STRUCT, the type keywords and VOID
+declaration_first = first_sets["structDef"] | first_sets["fnDef"] | first_sets["varDef"]
+
+
+# skips the tokens up to the next synchronization token (see above); never skips END
+def synchronize(token_iterator, top_level: bool):
+    depth = 0
+
+    while True:
+        code = token_iterator.peek_code()
+        if code is Code.END:
+            return
+
+        if depth == 0:
+            if code in declaration_first:
+                return
+
+            if not top_level:
+                if code is Code.RACC:
+                    return
+
+                if code is Code.SEMICOLON:
+                    token_iterator.advance()
+                    return
+
+        token_iterator.advance()
+
+        if code is Code.LACC:
+            depth += 1
+
+        elif code is Code.RACC and depth > 0:
+            depth -= 1
+
+            # a whole block was skipped, the statement after it can start here
+            if depth == 0 and not top_level:
+                return
+
+
+# called by the rules with the errors raised by their items (statements, declarations), start is the position of the
+# item; re-raises the error when the cursor does not recover, or when there are already too many errors
+# the error is recorded only the first time it is seen, it can go through several levels of blocks
+def recover(token_iterator, exc: SyntaxErrorException, start: int, top_level: bool):
+    errors = token_iterator.errors
+    if errors is None:
+        raise exc
+
+    if exc.position is None:
+        # the rules raise right after taking the token of the error, with next()
+        exc.position = token_iterator.mark() - 1
+        errors.append(exc)
+
+    if len(errors) >= token_iterator.max_errors:
+        raise exc
+
+    token_iterator.reset(exc.position)
+    synchronize(token_iterator, top_level)
+
+    # the error is at the first token of the item, and nothing could be skipped
+    if token_iterator.mark() == start:
+
+        # END or a declaration which is not a varDef: the } of the block is missing, the enclosing one goes on
+        if not top_level:
+            raise exc
+
+        token_iterator.advance()
+        synchronize(token_iterator, top_level)
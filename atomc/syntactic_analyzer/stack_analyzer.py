@@ -0,0 +1,577 @@
+from atomc.lexer.token import Code
+from atomc.lexer.token_stream import TokenStream, codes_by_value
+from atomc.syntactic_analyzer.analyzer import stm_table, type_base_first, var_def_first, binary_precedences, \
+    lowest_precedence, operator_names
+from atomc.syntactic_analyzer.syntax_error_exception import SyntaxErrorException
+
+# EXPLICIT STACK ANALYZER:
+# the same analysis as analyzer.py (same language, same errors at the same tokens), without recursive calls: the rules
+# which can nest (statements and expressions) are states of one loop, and a rule "calls" another one by pushing the
+# state to continue with when the other one is done (its continuation) on a list, then switching to its first state;
+# "returning" pops that state, with the result of the rule in ok
+# so the nesting depth is only limited by memory, and the analysis works on a plain list of codes, with no cursor
+# the declarations (varDef, structDef, the header of fnDef) never nest, they are parsed by plain functions
+
+# the states; the loop checks the ones which run most often first
+
+# expressions
+UNARY = 0  # exprUnary, the prefix operators, exprPrimary and the postfix operators without an expression inside them
+OPERATORS = 1  # the binary operators after an operand, as long as they bind at least as tight as min_precedence
+BINARY_CAST_DONE = 2  # data: min_precedence
+OPERAND_DONE = 3  # the right operand of a binary operator; data: min_precedence, operator
+BINARY = 4  # exprCast followed by OPERATORS, with min_precedence
+EXPR = 5  # expr
+EXPR_UNARY_DONE = 6
+POSTFIX = 7  # the postfix operators after an exprPrimary
+CALL_FIRST_ARG = 8
+CALL_NEXT_ARG = 9
+INDEX = 10
+PAREN = 11  # data: position of LPAR, prefix operator before it
+ASSIGN_DONE = 12
+CAST = 13
+CAST_DONE = 14
+
+# statements
+STM = 15
+EXPR_STM = 16  # data: position of the statement
+COMPOUND_ITEM = 17  # the ( varDef | stm )* loop of stmCompound
+COMPOUND_STM = 18
+IF_COND = 19
+IF_THEN = 20
+IF_ELSE = 21
+WHILE_COND = 22
+WHILE_BODY = 23
+FOR_INIT = 24
+FOR_COND = 25
+FOR_STEP = 26
+FOR_BODY = 27
+RETURN_EXPR = 28
+FN_BODY = 29
+
+# the unit loop, at the bottom of the stack
+UNIT = 30
+
+constant_codes = (Code.CT_INT, Code.CT_REAL, Code.CT_CHAR, Code.CT_STRING)
+
+
+def syntax_error(tokens, position: int, msg: str):
+    return SyntaxErrorException(tokens[position], msg)
+
+
+# typeBase: INT | DOUBLE | CHAR | STRUCT ID
+# returns the position after it, None if there is no typeBase
+def parse_type_base(tokens, codes: list, position: int):
+    code = codes[position]
+    if code is Code.INT or code is Code.DOUBLE or code is Code.CHAR:
+        return position + 1
+
+    if code is Code.STRUCT:
+        if codes[position + 1] is not Code.ID:
+            raise syntax_error(tokens, position + 1, "no { in struct type definition or no ID after struct")
+        return position + 2
+
+    return None
+
+
+# arrayDecl?
+def parse_array_decl(tokens, codes: list, position: int):
+    if codes[position] is not Code.LBRACKET:
+        return position
+
+    position += 1
+    if codes[position] is Code.CT_INT:
+        position += 1
+
+    if codes[position] is not Code.RBRACKET:
+        raise syntax_error(tokens, position, "no ] after [ in array declaration")
+    return position + 1
+
+
+# varDef: typeBase ID arrayDecl? SEMICOLON, starting with a typeBase
+def parse_var_def(tokens, codes: list, position: int):
+    position = parse_type_base(tokens, codes, position)
+
+    if codes[position] is not Code.ID:
+        raise syntax_error(tokens, position, "no identifier after type")
+    position = parse_array_decl(tokens, codes, position + 1)
+
+    if codes[position] is not Code.SEMICOLON:
+        raise syntax_error(tokens, position, "no ; after variable definition")
+    return position + 1
+
+
+# fnParam: typeBase ID arrayDecl?
+# returns the position after it, None if there is no typeBase
+def parse_fn_param(tokens, codes: list, position: int):
+    position = parse_type_base(tokens, codes, position)
+    if position is None:
+        return None
+
+    if codes[position] is not Code.ID:
+        raise syntax_error(tokens, position,
+                           "no variable name after type declaration in function parameter definition")
+    return parse_array_decl(tokens, codes, position + 1)
+
+
+# structDef: STRUCT ID LACC varDef* RACC SEMICOLON, starting with STRUCT
+def parse_struct_def(tokens, codes: list, position: int):
+    if codes[position + 1] is not Code.ID:
+        raise syntax_error(tokens, position + 1, "unnamed struct")
+    position += 3
+
+    # varDef*
+    while codes[position] in var_def_first:
+        position = parse_var_def(tokens, codes, position)
+
+    if codes[position] is not Code.RACC:
+        raise syntax_error(tokens, position, "no } after { in struct type definition")
+    if codes[position + 1] is not Code.SEMICOLON:
+        raise syntax_error(tokens, position + 1, "no semicolon after struct type definition")
+    return position + 2
+
+
+# fnDef up to its body: ( typeBase | VOID ) ID LPAR ( fnParam ( COMMA fnParam )* )? RPAR
+# returns the position of the body, None if there is no ID LPAR after the type (not a function definition)
+def parse_fn_header(tokens, codes: list, position: int):
+    if codes[position] is Code.VOID:
+        position += 1
+    else:
+        position = parse_type_base(tokens, codes, position)
+
+    if codes[position] is not Code.ID or codes[position + 1] is not Code.LPAR:
+        return None
+    position += 2
+
+    # ( fnParam ( COMMA fnParam )* )?
+    param_end = parse_fn_param(tokens, codes, position)
+    if param_end is not None:
+        position = param_end
+
+        while codes[position] is Code.COMMA:
+            param_end = parse_fn_param(tokens, codes, position + 1)
+            if param_end is None:
+                raise syntax_error(tokens, position + 1, "no function parameter after comma")
+            position = param_end
+
+    if codes[position] is not Code.RPAR:
+        raise syntax_error(tokens, position, "no ) after ( in function definition")
+    return position + 1
+
+
+# the recognize mode of analyzer.analyze(), for a list of Token objects or a TokenStream: True, or the same
+# SyntaxErrorException
+def analyze_stack(tokens):
+    if isinstance(tokens, TokenStream):
+        codes = list(map(codes_by_value.__getitem__, tokens.codes))
+    else:
+        codes = [tk.code for tk in tokens]
+
+    # a few more codes than tokens, so looking ahead never goes out of the list
+    codes += [None, None, None]
+
+    position = 0
+    min_precedence = lowest_precedence
+    ok = True
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    state = UNIT
+
+    while True:
+        if state == UNARY:
+            # ( SUB | NOT )*
+            operator = None
+            code = codes[position]
+            while code is Code.SUB or code is Code.NOT:
+                operator = code
+                position += 1
+                code = codes[position]
+
+            # exprPrimary
+            if code is Code.ID:
+                position += 1
+                code = codes[position]
+
+                # LPAR ( expr ( COMMA expr )* )? RPAR
+                if code is Code.LPAR:
+                    position += 1
+                    push(CALL_FIRST_ARG)
+                    state = EXPR
+                    continue
+
+            elif code in constant_codes:
+                position += 1
+                code = codes[position]
+
+            # LPAR expr RPAR
+            elif code is Code.LPAR:
+                push(position)
+                push(operator)
+                push(PAREN)
+                position += 1
+                state = EXPR
+                continue
+
+            # no exprPrimary
+            else:
+                if operator is not None:
+                    raise syntax_error(tokens, position, "no unary expression after " + operator_names[operator])
+
+                ok = False
+                state = pop()
+                continue
+
+            if code is Code.LBRACKET or code is Code.DOT:
+                state = POSTFIX
+            else:
+                ok = True
+                state = pop()
+
+        elif state == OPERATORS or state == BINARY_CAST_DONE:
+            if state == BINARY_CAST_DONE:
+                min_precedence = pop()
+                if not ok:
+                    state = pop()
+                    continue
+
+            operator = codes[position]
+            precedence = binary_precedences.get(operator)
+            if precedence is None or precedence < min_precedence:
+                ok = True
+                state = pop()
+                continue
+
+            # the right operand only takes the operators which bind tighter
+            position += 1
+            push(min_precedence)
+            push(operator)
+            push(OPERAND_DONE)
+            min_precedence = precedence + 1
+            state = BINARY
+
+        elif state == OPERAND_DONE:
+            operator = pop()
+            min_precedence = pop()
+            if not ok:
+                raise syntax_error(tokens, position, "invalid expression after " + operator_names[operator])
+            state = OPERATORS
+
+        elif state == BINARY or state == CAST:
+            code = codes[position]
+
+            # an ID or a constant alone, the most common operand: straight to the operators after it
+            if state == BINARY and (code is Code.ID or code in constant_codes) \
+                    and codes[position + 1] not in (Code.LPAR, Code.LBRACKET, Code.DOT):
+                position += 1
+                state = OPERATORS
+                continue
+
+            if state == BINARY:
+                push(min_precedence)
+                push(BINARY_CAST_DONE)
+
+            # LPAR typeBase arrayDecl? RPAR exprCast
+            if code is Code.LPAR and codes[position + 1] in type_base_first:
+                position = parse_type_base(tokens, codes, position + 1)
+                position = parse_array_decl(tokens, codes, position)
+                if codes[position] is not Code.RPAR:
+                    raise syntax_error(tokens, position, "no ) after type in cast")
+
+                position += 1
+                push(CAST_DONE)
+                state = CAST
+            else:
+                state = UNARY
+
+        elif state == EXPR:
+            code = codes[position]
+
+            # an ID or a constant alone, the most common exprUnary: straight to what comes after it
+            if (code is Code.ID or code in constant_codes) \
+                    and codes[position + 1] not in (Code.LPAR, Code.LBRACKET, Code.DOT):
+                position += 1
+
+                # ASSIGN exprAssign
+                if codes[position] is Code.ASSIGN:
+                    position += 1
+                    push(ASSIGN_DONE)
+                else:
+                    min_precedence = lowest_precedence
+                    state = OPERATORS
+
+            # exprOr starting with a cast, no exprUnary starts with LPAR typeBase
+            elif code is Code.LPAR and codes[position + 1] in type_base_first:
+                min_precedence = lowest_precedence
+                state = BINARY
+
+            else:
+                push(EXPR_UNARY_DONE)
+                state = UNARY
+
+        elif state == EXPR_UNARY_DONE:
+            if not ok:
+                state = pop()
+
+            # ASSIGN exprAssign
+            elif codes[position] is Code.ASSIGN:
+                position += 1
+                push(ASSIGN_DONE)
+                state = EXPR
+
+            # exprOr, the exprUnary is also the exprCast it starts with
+            else:
+                min_precedence = lowest_precedence
+                state = OPERATORS
+
+        elif state == STM:
+            production = stm_table.get(codes[position])
+
+            # stmCompound
+            if production == 0:
+                position += 1
+                state = COMPOUND_ITEM
+
+            # expr? SEMICOLON
+            elif production == 6:
+                push(position)
+                push(EXPR_STM)
+                state = EXPR
+
+            # IF LPAR expr RPAR stm ( ELSE stm )?
+            elif production == 1:
+                if codes[position + 1] is not Code.LPAR:
+                    raise syntax_error(tokens, position + 1, "no ( after if")
+                position += 2
+                push(IF_COND)
+                state = EXPR
+
+            # WHILE LPAR expr RPAR stm
+            elif production == 2:
+                if codes[position + 1] is not Code.LPAR:
+                    raise syntax_error(tokens, position + 1, "no ( after while")
+                position += 2
+                push(WHILE_COND)
+                state = EXPR
+
+            # FOR LPAR expr? SEMICOLON expr? SEMICOLON expr? RPAR stm
+            elif production == 3:
+                if codes[position + 1] is not Code.LPAR:
+                    raise syntax_error(tokens, position + 1, "no ( after FOR")
+                position += 2
+                push(FOR_INIT)
+                state = EXPR
+
+            # BREAK SEMICOLON
+            elif production == 4:
+                if codes[position + 1] is not Code.SEMICOLON:
+                    raise syntax_error(tokens, position + 1, "no ; after break")
+                position += 2
+                ok = True
+                state = pop()
+
+            # RETURN expr? SEMICOLON
+            elif production == 5:
+                position += 1
+                push(RETURN_EXPR)
+                state = EXPR
+
+            # no statement starts with this token
+            else:
+                ok = False
+                state = pop()
+
+        elif state == EXPR_STM:
+            fallback_position = pop()
+
+            if codes[position] is Code.SEMICOLON:
+                position += 1
+                ok = True
+            else:
+                position = fallback_position
+                ok = False
+            state = pop()
+
+        elif state == COMPOUND_ITEM or state == COMPOUND_STM:
+            if state == COMPOUND_STM and not ok:
+                if codes[position] is not Code.RACC:
+                    raise syntax_error(tokens, position, "no } after {")
+
+                position += 1
+                ok = True
+                state = pop()
+                continue
+
+            # varDef
+            if codes[position] in var_def_first:
+                position = parse_var_def(tokens, codes, position)
+                state = COMPOUND_ITEM
+
+            # stm
+            else:
+                push(COMPOUND_STM)
+                state = STM
+
+        elif state == POSTFIX:
+            code = codes[position]
+
+            # LBRACKET expr RBRACKET
+            if code is Code.LBRACKET:
+                position += 1
+                push(INDEX)
+                state = EXPR
+
+            # DOT ID
+            elif code is Code.DOT:
+                if codes[position + 1] is not Code.ID:
+                    raise syntax_error(tokens, position + 1, "no field name after .")
+                position += 2
+
+            else:
+                ok = True
+                state = pop()
+
+        elif state == CALL_FIRST_ARG or state == CALL_NEXT_ARG:
+            if state == CALL_NEXT_ARG and not ok:
+                raise syntax_error(tokens, position, "missing function parameter after , in function call")
+
+            # COMMA expr
+            if ok and codes[position] is Code.COMMA:
+                position += 1
+                push(CALL_NEXT_ARG)
+                state = EXPR
+                continue
+
+            if codes[position] is not Code.RPAR:
+                raise syntax_error(tokens, position, "missing ) after ( in function call")
+            position += 1
+            state = POSTFIX
+
+        elif state == INDEX:
+            if not ok:
+                raise syntax_error(tokens, position, "no array index after [ in expression")
+            if codes[position] is not Code.RBRACKET:
+                raise syntax_error(tokens, position, "no ] in array variable in expression")
+
+            position += 1
+            state = POSTFIX
+
+        elif state == PAREN:
+            operator = pop()
+            fallback_position = pop()
+
+            if ok:
+                if codes[position] is not Code.RPAR:
+                    raise syntax_error(tokens, position, "missing ) after (")
+                position += 1
+                state = POSTFIX
+
+            else:
+                # not an exprPrimary, so not an exprUnary either
+                position = fallback_position
+                if operator is not None:
+                    raise syntax_error(tokens, position, "no unary expression after " + operator_names[operator])
+                state = pop()
+
+        elif state == ASSIGN_DONE:
+            if not ok:
+                raise syntax_error(tokens, position, "invalid expression after =")
+            state = pop()
+
+        elif state == CAST_DONE:
+            if not ok:
+                raise syntax_error(tokens, position, "invalid expression after cast type")
+            state = pop()
+
+        elif state == IF_COND or state == WHILE_COND:
+            if not ok:
+                raise syntax_error(tokens, position, "invalid or missing expression in if" if state == IF_COND
+                                   else "invalid or missing expression after ( in while")
+            if codes[position] is not Code.RPAR:
+                raise syntax_error(tokens, position, "no ( after ) in if" if state == IF_COND
+                                   else "no ) after ( in while")
+
+            position += 1
+            push(IF_THEN if state == IF_COND else WHILE_BODY)
+            state = STM
+
+        elif state == IF_THEN:
+            if not ok:
+                raise syntax_error(tokens, position, "no statement after if")
+
+            # ELSE stm
+            if codes[position] is Code.ELSE:
+                position += 1
+                push(IF_ELSE)
+                state = STM
+            else:
+                state = pop()
+
+        elif state == IF_ELSE or state == WHILE_BODY or state == FOR_BODY:
+            if not ok:
+                raise syntax_error(tokens, position, "no statement after else" if state == IF_ELSE
+                                   else "no statement after while" if state == WHILE_BODY
+                                   else "no statement after for")
+            state = pop()
+
+        elif state == FOR_INIT or state == FOR_COND:
+            if codes[position] is not Code.SEMICOLON:
+                raise syntax_error(tokens, position, "no ; after init in for" if state == FOR_INIT
+                                   else "no ; after condition in for")
+
+            position += 1
+            push(FOR_COND if state == FOR_INIT else FOR_STEP)
+            state = EXPR
+
+        elif state == FOR_STEP:
+            if codes[position] is not Code.RPAR:
+                raise syntax_error(tokens, position, "no ) after ( in for")
+
+            position += 1
+            push(FOR_BODY)
+            state = STM
+
+        elif state == RETURN_EXPR:
+            if codes[position] is not Code.SEMICOLON:
+                raise syntax_error(tokens, position, "no ; after return")
+
+            position += 1
+            ok = True
+            state = pop()
+
+        elif state == FN_BODY:
+            if not ok:
+                raise syntax_error(tokens, position, "missing { after function definition")
+            state = UNIT
+
+        else:
+            # UNIT: ( structDef | fnDef | varDef )* END
+            code = codes[position]
+            type_length = 2 if code is Code.STRUCT else 1
+
+            # structDef: STRUCT ID LACC, or STRUCT without a name, which is an error in structDef
+            if code is Code.STRUCT and (codes[position + 1] is not Code.ID or codes[position + 2] is Code.LACC):
+                position = parse_struct_def(tokens, codes, position)
+
+            # fnDef: ( typeBase | VOID ) ID LPAR
+            elif code is Code.VOID or (code in type_base_first and codes[position + type_length] is Code.ID
+                                       and codes[position + type_length + 1] is Code.LPAR):
+                body_position = parse_fn_header(tokens, codes, position)
+                if body_position is None:
+                    break
+
+                position = body_position
+                push(FN_BODY)
+                state = STM
+
+            # varDef
+            elif code in var_def_first:
+                position = parse_var_def(tokens, codes, position)
+
+            else:
+                break
+
+    # END
+    if codes[position] is not Code.END:
+        raise syntax_error(tokens, position, "invalid token found")
+
+    return True
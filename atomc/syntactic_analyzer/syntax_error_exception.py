@@ -5,6 +5,9 @@ class SyntaxErrorException(Exception):
     __token = None
     __msg = None
 
+    # the position of the token of the error, set by the analyzer when it recovers from the error (see recovery.py)
+    position = None
+
     def __init__(self, token: Token, msg: str):
         self.__token = token
         self.__msg = msg
@@ -0,0 +1,263 @@
+from atomc.lexer.token import Code
+
+
+# SYNTAX TREE:
+# the nodes built by the analyzer, one class per construct of the grammar
+# every node has the line of the token it starts at
+# no per-node __dict__, there are about as many nodes as tokens, and there can be millions of tokens
+class Node:
+    __slots__ = ("line",)
+
+    # the fields of the node, without the line
+    def field_names(self):
+        return type(self).__slots__
+
+    # two nodes are equal when they are the same construct with the same fields, wherever they are in the source
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, name) == getattr(other, name)
+                                                 for name in self.field_names())
+
+    __hash__ = None
+
+    # a copy of the node and of all the nodes under it, moved by shift lines; the node itself is left as it is
+    # on an explicit stack, the expressions can be nested deeper than the recursion limit
+    def shifted(self, shift: int):
+        copy = object.__new__(type(self))
+        stack = [(self, copy)]
+        while stack:
+            node, node_copy = stack.pop()
+            node_copy.line = node.line + shift
+
+            for name in node.__slots__:
+                value = getattr(node, name)
+                if isinstance(value, Node):
+                    value_copy = object.__new__(type(value))
+                    stack.append((value, value_copy))
+                    value = value_copy
+                elif value.__class__ is list:
+                    value_copies = [object.__new__(type(item)) for item in value]
+                    stack += zip(value, value_copies)
+                    value = value_copies
+
+                setattr(node_copy, name, value)
+
+        return copy
+
+    # pickled as the arguments of its constructor, the fields then the line; much smaller and faster to load than the
+    # state of the slots, the nodes are sent back by the processes of the parallel analysis (see parallel.py)
+    def __reduce__(self):
+        return type(self), tuple([getattr(self, name) for name in self.field_names()]) + (self.line,)
+
+    def __repr__(self):
+        return type(self).__name__ + "(" + ", ".join(name + "=" + repr(getattr(self, name))
+                                                     for name in self.field_names()) + ")"
+
+
+# DECLARATIONS
+
+# typeBase arrayDecl?, or VOID for the functions which return nothing
+# base: Code.INT, Code.DOUBLE, Code.CHAR, Code.STRUCT (struct_name is its name) or Code.VOID
+# array_size: -1 if not an array, 0 for an array declared without a size
+class Type(Node):
+    __slots__ = ("base", "struct_name", "array_size")
+
+    def __init__(self, base: Code, struct_name: str, array_size: int, line: int):
+        self.base = base
+        self.struct_name = struct_name
+        self.array_size = array_size
+        self.line = line
+
+
+# a variable, a struct field or a function parameter
+class VarDef(Node):
+    __slots__ = ("type", "name")
+
+    def __init__(self, type: Type, name: str, line: int):
+        self.type = type
+        self.name = name
+        self.line = line
+
+
+class StructDef(Node):
+    __slots__ = ("name", "fields")
+
+    def __init__(self, name: str, fields: list, line: int):
+        self.name = name
+        self.fields = fields
+        self.line = line
+
+
+# params: list of VarDef; body: the statement after the header, a CompoundStm in any valid source
+class FnDef(Node):
+    __slots__ = ("type", "name", "params", "body")
+
+    def __init__(self, type: Type, name: str, params: list, body, line: int):
+        self.type = type
+        self.name = name
+        self.params = params
+        self.body = body
+        self.line = line
+
+
+# the whole source, declarations: StructDef, FnDef and VarDef nodes, in the order of the source
+class Unit(Node):
+    __slots__ = ("declarations",)
+
+    def __init__(self, declarations: list, line: int):
+        self.declarations = declarations
+        self.line = line
+
+
+# STATEMENTS
+# the optional parts of the statements are None when missing
+
+# items: VarDef and statement nodes
+class CompoundStm(Node):
+    __slots__ = ("items",)
+
+    def __init__(self, items: list, line: int):
+        self.items = items
+        self.line = line
+
+
+class IfStm(Node):
+    __slots__ = ("condition", "then_stm", "else_stm")
+
+    def __init__(self, condition, then_stm, else_stm, line: int):
+        self.condition = condition
+        self.then_stm = then_stm
+        self.else_stm = else_stm
+        self.line = line
+
+
+class WhileStm(Node):
+    __slots__ = ("condition", "body")
+
+    def __init__(self, condition, body, line: int):
+        self.condition = condition
+        self.body = body
+        self.line = line
+
+
+class ForStm(Node):
+    __slots__ = ("init", "condition", "step", "body")
+
+    def __init__(self, init, condition, step, body, line: int):
+        self.init = init
+        self.condition = condition
+        self.step = step
+        self.body = body
+        self.line = line
+
+
+class BreakStm(Node):
+    __slots__ = ()
+
+    def __init__(self, line: int):
+        self.line = line
+
+
+class ReturnStm(Node):
+    __slots__ = ("expr",)
+
+    def __init__(self, expr, line: int):
+        self.expr = expr
+        self.line = line
+
+
+# expr? SEMICOLON, expr is None for the empty statement
+class ExprStm(Node):
+    __slots__ = ("expr",)
+
+    def __init__(self, expr, line: int):
+        self.expr = expr
+        self.line = line
+
+
+# EXPRESSIONS
+# parenthesized expressions have no node of their own, the tree already gives the order of the operations
+
+class Id(Node):
+    __slots__ = ("name",)
+
+    def __init__(self, name: str, line: int):
+        self.name = name
+        self.line = line
+
+
+class Call(Node):
+    __slots__ = ("name", "args")
+
+    def __init__(self, name: str, args: list, line: int):
+        self.name = name
+        self.args = args
+        self.line = line
+
+
+# code: Code.CT_INT, Code.CT_REAL, Code.CT_CHAR or Code.CT_STRING
+class Constant(Node):
+    __slots__ = ("code", "value")
+
+    def __init__(self, code: Code, value, line: int):
+        self.code = code
+        self.value = value
+        self.line = line
+
+
+# array[index]
+class Index(Node):
+    __slots__ = ("array", "index")
+
+    def __init__(self, array, index, line: int):
+        self.array = array
+        self.index = index
+        self.line = line
+
+
+# operand.name
+class Field(Node):
+    __slots__ = ("operand", "name")
+
+    def __init__(self, operand, name: str, line: int):
+        self.operand = operand
+        self.name = name
+        self.line = line
+
+
+# operator: Code.SUB or Code.NOT
+class Unary(Node):
+    __slots__ = ("operator", "operand")
+
+    def __init__(self, operator: Code, operand, line: int):
+        self.operator = operator
+        self.operand = operand
+        self.line = line
+
+
+class Cast(Node):
+    __slots__ = ("type", "operand")
+
+    def __init__(self, type: Type, operand, line: int):
+        self.type = type
+        self.operand = operand
+        self.line = line
+
+
+# operator: the Code of one of the binary operators of the grammar
+class Binary(Node):
+    __slots__ = ("operator", "left", "right")
+
+    def __init__(self, operator: Code, left, right, line: int):
+        self.operator = operator
+        self.left = left
+        self.right = right
+        self.line = line
+
+
+class Assign(Node):
+    __slots__ = ("target", "value")
+
+    def __init__(self, target, value, line: int):
+        self.target = target
+        self.value = value
+        self.line = line
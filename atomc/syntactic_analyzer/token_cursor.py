@@ -0,0 +1,138 @@
+from atomc.lexer.token_stream import TokenStream, codes_by_value
+
+
+class TokenCursor:
+    # a position inside a token list
+    # the grammar rules used to deep copy a list iterator whenever they needed to backtrack, which copied the whole
+    # remaining token list on every call; a cursor only has to remember an index, so marking and resetting are O(1)
+
+    # the PackratMemo of the analysis in packrat mode, None otherwise
+    memo = None
+
+    # the ParserProfile of the analysis in profiling mode, None otherwise (see profiler.py)
+    profile = None
+
+    # in recognize mode, the statements and declarations are not kept once analyzed, so the memory does not grow with
+    # the input (see analyzer.analyze_iter())
+    recognize = False
+
+    # in the recovering mode of the analysis, the list of the syntax errors found so far and the most it can hold;
+    # None otherwise (see recovery.py)
+    errors = None
+    max_errors = None
+
+    def __init__(self, tokens: list, position: int = 0):
+        self.tokens = tokens
+        self.position = position
+
+    def __iter__(self):
+        return self
+
+    # returns the current token and advances the cursor
+    def __next__(self):
+        if self.position >= len(self.tokens):
+            raise StopIteration
+
+        tk = self.tokens[self.position]
+        self.position += 1
+        return tk
+
+    # returns the current token without advancing the cursor
+    def peek(self):
+        if self.position >= len(self.tokens):
+            raise StopIteration
+
+        return self.tokens[self.position]
+
+    # returns the code of the current token without advancing the cursor
+    # called for nearly every token by every rule, so it does not go through peek()
+    def peek_code(self):
+        try:
+            return self.tokens[self.position].code
+        except IndexError:
+            raise StopIteration
+
+    # returns the code of the token offset positions after the current one, None if there is no such token
+    # extra lookahead, for the few places where the current token is not enough to pick a grammar alternative
+    def lookahead(self, offset: int):
+        position = self.position
+        self.position += offset
+
+        try:
+            return self.peek_code()
+        except StopIteration:
+            return None
+        finally:
+            self.position = position
+
+    # moves past the current token, without returning it
+    def advance(self):
+        self.position += 1
+
+    # remembers the current position, so the cursor can backtrack to it later
+    def mark(self):
+        return self.position
+
+    # backtracks the cursor to a position obtained through mark()
+    def reset(self, position: int):
+        self.position = position
+
+    # tells the cursor that the analysis will never backtrack before the current position again
+    # a cursor over a list keeps all the tokens anyway, only the packrat results before it are dropped
+    def commit(self):
+        if self.memo is not None:
+            self.memo.evict(self.position)
+
+
+class StreamingTokenCursor(TokenCursor):
+    # a cursor which pulls the tokens from an iterator (e.g. iter_tokens()) only when the analysis reaches them
+    # only the window of tokens after the last commit() is kept in memory; positions are still counted from the
+    # start of the stream, so marks stay valid as long as they are not older than the last commit()
+
+    def __init__(self, tokens: iter):
+        super().__init__([])
+        self.source = iter(tokens)
+        self.offset = 0  # position of the first token in the window
+
+    def __next__(self):
+        tk = self.peek()
+        self.position += 1
+        return tk
+
+    def peek(self):
+        index = self.position - self.offset
+
+        # pull tokens until the current one is in the window
+        while index >= len(self.tokens):
+            self.tokens.append(next(self.source))
+
+        return self.tokens[index]
+
+    def peek_code(self):
+        return self.peek().code
+
+    def reset(self, position: int):
+        if position < self.offset:
+            raise ValueError("cannot backtrack before the last commit")
+
+        self.position = position
+
+    def commit(self):
+        super().commit()
+        del self.tokens[:self.position - self.offset]
+        self.offset = self.position
+
+
+class PackedTokenCursor(TokenCursor):
+    # a cursor over a TokenStream
+    # the analysis only looks at the packed codes, Token objects are built just for the tokens taken with next()
+
+    def __init__(self, tokens: TokenStream, position: int = 0):
+        super().__init__(tokens, position)
+        self.codes = tokens.codes
+
+    def peek_code(self):
+        if self.position >= len(self.codes):
+            raise StopIteration
+
+        return codes_by_value[self.codes[self.position]]
@@ -0,0 +1,329 @@
+import json
+import tracemalloc
+from unittest import TestCase
+from atomc.lexer.incremental_lexer import relex
+from atomc.lexer.lexer import tokenize, iter_tokens, tokenize_packed
+from atomc.lexer.symbol_pool import SymbolPool
+from atomc.lexer.token import Code
+from atomc.syntactic_analyzer.analyzer import analyze, analyze_iter, analyze_recovering, rule_unit, packrat_rules
+from atomc.syntactic_analyzer.incremental import IncrementalAnalyzer
+from atomc.syntactic_analyzer.packrat import PackratMemo
+from atomc.syntactic_analyzer.parallel import analyze_parallel
+from atomc.syntactic_analyzer.profiler import ParserProfile
+from atomc.syntactic_analyzer.syntax_error_exception import SyntaxErrorException
+from atomc.syntactic_analyzer.syntax_tree import Type, VarDef, StructDef, FnDef, Unit, CompoundStm, IfStm, ForStm, \
+    ReturnStm, ExprStm, Id, Call, Constant, Index, Field, Unary, Cast, Binary, Assign
+from atomc.syntactic_analyzer.token_cursor import StreamingTokenCursor, TokenCursor
+
+
+def tokenize_file(path: str):
+    file = open(path)
+    tokens = tokenize(file)
+    file.close()
+    return tokens
+
+
+class Test(TestCase):
+    def test_analyze(self):
+        for path in ["atomc/resources/test4.c", "atomc/resources/test5.c", "atomc/resources/test6.c"]:
+            assert analyze(tokenize_file(path))
+            assert analyze(tokenize_packed(open(path).read()))
+
+    def test_analyze_syntax_error(self):
+        tokens = tokenize_file("atomc/resources/test3.c")
+
+        # drop the ; after "int i"
+        del tokens[7]
+
+        with self.assertRaises(SyntaxErrorException) as context:
+            analyze(tokens)
+
+        assert str(context.exception) == "Syntax Error(s) detected at line: 6, token code Code.FOR, " \
+                                         "no ; after variable definition"
+
+    def test_analyze_large_input(self):
+        tokens = tokenize_file("atomc/resources/test6.c")
+
+        # the same declarations repeated many times must still be analyzed in linear time
+        body = tokens[:-1]
+        assert analyze(body * 500 + tokens[-1:])
+
+    def test_analyze_nested_expressions(self):
+        # every level of parentheses used to be parsed twice (as exprUnary, then again as exprOr)
+        depth = 30
+        assert analyze(tokenize("int f() { x = " + "(" * depth + "1" + ")" * depth + "; }"))
+        assert analyze(tokenize("int f() { x = " + "-(" * depth + "a[1] + b.c" + ")" * depth + "; }"))
+
+    def test_analyze_packrat(self):
+        for path in ["atomc/resources/test4.c", "atomc/resources/test5.c", "atomc/resources/test6.c"]:
+            assert analyze(tokenize_file(path), packrat=True)
+            assert analyze_iter(iter_tokens(open(path)), packrat=True)
+
+        tokens = tokenize_file("atomc/resources/test3.c")
+        del tokens[7]
+        with self.assertRaises(SyntaxErrorException) as context:
+            analyze(tokens, packrat=True)
+        assert str(context.exception).endswith("no ; after variable definition")
+
+        # a rule which runs again at the same position is replayed from the memo
+        token_iterator = TokenCursor(tokenize("a = b[1] + c.d * 2;"))
+        token_iterator.memo = PackratMemo()
+        packrat_rules["rule_expr"](token_iterator)
+        position = token_iterator.mark()
+        token_iterator.reset(0)
+        _, result = packrat_rules["rule_expr"](token_iterator)
+        assert result and token_iterator.mark() == position and token_iterator.memo.hits == 1
+
+        # the operands after the first one of the binary operators are memoized too: c, (d - e), e, f
+        token_iterator = TokenCursor(tokenize("a = b + c * (d - e) && f;"))
+        token_iterator.memo = PackratMemo()
+        packrat_rules["rule_expr"](token_iterator)
+        assert sorted(position for rule, position in token_iterator.memo.entries
+                      if rule.__name__ == "rule_expr_cast") == [4, 6, 9, 12]
+
+        # the memo never grows over its bound, the results are computed again instead
+        token_iterator = TokenCursor(tokenize_file("atomc/resources/test6.c"))
+        token_iterator.memo = PackratMemo(max_entries=8)
+        _, result = packrat_rules["rule_unit"](token_iterator)
+        assert result and len(token_iterator.memo.entries) <= 8
+
+    def test_analyze_iter(self):
+        source = open("atomc/resources/test6.c").read() * 200
+
+        assert analyze_iter(iter_tokens(source))
+
+        # only the tokens after the last top-level declaration / statement are kept
+        token_iterator = StreamingTokenCursor(iter_tokens(source))
+        rule_unit(token_iterator)
+
+        assert len(token_iterator.tokens) < 20
+
+        # in recognize mode, the peak memory does not grow with the input
+        peaks = []
+        for count in [100, 400]:
+            source = open("atomc/resources/test6.c").read() * count
+            tracemalloc.start()
+            assert analyze_iter(iter_tokens(source), recognize=True) is True
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        assert peaks[1] < peaks[0] * 1.5
+
+    def test_analyze_stack(self):
+        for path in ["atomc/resources/test4.c", "atomc/resources/test5.c", "atomc/resources/test6.c"]:
+            assert analyze(tokenize_file(path), stack=True)
+            assert analyze(tokenize_packed(open(path).read()), stack=True)
+
+        tokens = tokenize_file("atomc/resources/test3.c")
+        del tokens[7]
+        with self.assertRaises(SyntaxErrorException) as context:
+            analyze(tokens, stack=True)
+        assert str(context.exception).endswith("no ; after variable definition")
+
+        # far deeper than the recursion limit
+        depth = 20000
+        assert analyze(tokenize("int f() { x = " + "-(" * depth + "a[1] + b.c" + ")" * depth + "; }"), stack=True)
+        assert analyze(tokenize("void f() " + "{ if (a) " * depth + "x = 1;" + " }" * depth), stack=True)
+
+    def test_analyze_generated(self):
+        for path in ["atomc/resources/test4.c", "atomc/resources/test5.c", "atomc/resources/test6.c"]:
+            assert analyze(tokenize_file(path), generated=True)
+            assert analyze(tokenize_packed(open(path).read()), generated=True)
+
+        # the same errors as the hand-written analyzer, with the messages of atomc.grammar
+        tokens = tokenize_file("atomc/resources/test3.c")
+        del tokens[7]
+        for source in [tokens, "int f() { x = (a + ; }", "struct { int x; };", "void f() { if (a) x = 1; else }"]:
+            if isinstance(source, str):
+                source = tokenize(source)
+            with self.assertRaises(SyntaxErrorException) as expected:
+                analyze(source)
+            with self.assertRaises(SyntaxErrorException) as context:
+                analyze(source, generated=True)
+            assert str(context.exception) == str(expected.exception)
+
+        depth = 20000
+        assert analyze(tokenize("int f() { x = " + "-(" * depth + "a[1] + b.c" + ")" * depth + "; }"), generated=True)
+
+    def test_analyze_declarations(self):
+        modes = [{}, {"packrat": True}, {"stack": True}, {"generated": True}]
+
+        # the body of a function is any statement
+        for mode in modes:
+            assert analyze(tokenize("int f() return 0; void g() if (a) f(); else g();"), **mode)
+
+        # so a declaration does not end at the SEMICOLON of an if before its else, or inside the parentheses of a for
+        tokens = tokenize("int f() if (a) return 1; else if (b) {} else return 2; int x;\n"
+                          "void g() for (i = 0; i < 2; i = i + 1) x = i; struct S { int x; };\n" * 20)
+        unit = analyze(tokens)
+        analyzer = IncrementalAnalyzer()
+        assert analyzer.analyze(tokens) == unit
+        assert analyzer.analyzed == len(unit.declarations) == 80
+        assert analyze_parallel(tokens, workers=4, min_chunk_size=16) == unit
+
+        # a struct without a name is reported by structDef at top level, by typeBase in blocks
+        for source, message in [("struct { int x; };", "unnamed struct"), ("int f() {} struct;", "unnamed struct"),
+                                ("struct S;", "no identifier after type"),
+                                ("void f() { struct { int x; } }",
+                                 "no { in struct type definition or no ID after struct")]:
+            for mode in modes:
+                with self.assertRaises(SyntaxErrorException) as context:
+                    analyze(tokenize(source), **mode)
+                assert str(context.exception).endswith(message)
+
+    def test_analyze_incremental(self):
+        source = open("atomc/resources/test6.c").read()
+        pool = SymbolPool()
+        tokens = tokenize(source, pool)
+        analyzer = IncrementalAnalyzer()
+        unit = analyzer.analyze(tokens)
+        assert unit == analyze(tokens) and analyzer.analyzed == 5
+
+        # a new statement on a new line in len(): only len() is analyzed again, main() is moved a line down
+        # the declarations before it are the same nodes, main() is a moved copy, the last result does not change
+        first, main = unit.declarations[0], unit.declarations[4]
+        tokens, source = relex(tokens, source, source.index("i=0;"), 0, "i=1;\n\t", pool)
+        last_unit, unit = unit, analyzer.analyze(tokens)
+        assert (analyzer.analyzed, analyzer.reused) == (1, 4)
+        assert unit.declarations[0] is first and unit.declarations[4] == main and unit.declarations[4] is not main
+        assert unit.declarations[4].line == 20 and unit.declarations[4].body.items[1].body.items[0].line == 23
+        assert last_unit.declarations[4] is main and main.line == 19 and main.body.items[1].body.items[0].line == 22
+        assert unit == analyze(tokens)
+
+        # the same errors as analyze(), and the declarations are still reused after the error is fixed
+        offset = source.index("while")
+        tokens, source = relex(tokens, source, offset, 0, "x = ", pool)
+        with self.assertRaises(SyntaxErrorException) as context:
+            analyzer.analyze(tokens)
+        assert str(context.exception).endswith("invalid expression after =")
+
+        tokens, source = relex(tokens, source, offset, 4, "", pool)
+        assert analyzer.analyze(tokens) == unit and analyzer.analyzed == 0
+
+    def test_analyze_parallel(self):
+        source = open("atomc/resources/test6.c").read() * 50
+        tokens = tokenize(source)
+
+        # small chunks, so the tokens really are split
+        unit = analyze(tokens)
+        assert analyze_parallel(tokens, workers=4, min_chunk_size=64) == unit
+        assert analyze_parallel(tokenize_packed(source), workers=4, min_chunk_size=64) == unit
+        assert analyze_parallel(tokens, workers=4, min_chunk_size=64, recognize=True) is True
+        assert [declaration.line for declaration in analyze_parallel(tokens, workers=4, min_chunk_size=64)
+                .declarations] == [declaration.line for declaration in unit.declarations]
+
+        # errors in all the chunks: the same first error as analyze(), the same errors as analyze_recovering()
+        broken = tokenize(source.replace("i=0;", "i=;", 1).replace("return i;", "return i", 40))
+        with self.assertRaises(SyntaxErrorException) as expected:
+            analyze(broken)
+        with self.assertRaises(SyntaxErrorException) as context:
+            analyze_parallel(broken, workers=4, min_chunk_size=64)
+        assert str(context.exception) == str(expected.exception)
+
+        unit, errors = analyze_recovering(broken)
+        parallel_unit, parallel_errors = analyze_parallel(broken, workers=4, min_chunk_size=64, recovering=True)
+        assert parallel_unit == unit and [str(error) for error in parallel_errors] == [str(error) for error in errors]
+        assert len(errors) == 41
+
+    def test_analyze_profile(self):
+        tokens = tokenize_file("atomc/resources/test6.c")
+        profile = ParserProfile()
+        assert analyze(tokens, profile=profile) == analyze(tokens)
+
+        rules = profile.rules
+        assert rules["rule_unit"].calls == 1 and rules["rule_unit"].satisfied == 1
+        assert all(rule.calls == rule.satisfied + rule.not_satisfied + rule.errors for rule in rules.values())
+        assert all(0 <= rule.self_time <= rule.total_time for rule in rules.values())
+        # the rules called from the helpers of the binary operators are profiled too
+        assert rules["rule_expr_cast"].calls > 0 and rules["consume"].calls > 0
+        assert json.loads(profile.to_json())["rule_unit"]["calls"] == 1
+        assert profile.table().split()[0] == "rule" and len(profile.table().splitlines()) == len(rules) + 1
+
+        # the recovering analysis backtracks to skip the statements with errors
+        profile = ParserProfile()
+        _, errors = analyze_recovering(tokenize("void g() {\n  int i;\n  i = ;\n  i = 1;\n}\n"), profile=profile)
+        assert len(errors) == 1 and profile.rules["rule_stm"].errors == 1
+        assert profile.rules["rule_stm_compound"].backtracks == 1 and profile.rules["rule_stm_compound"].rewound > 0
+
+        with self.assertRaises(ValueError):
+            analyze(tokens, packrat=True, profile=ParserProfile())
+        with self.assertRaises(ValueError):
+            analyze(tokens, recognize=True, profile=ParserProfile())
+
+    def test_analyze_tree(self):
+        source = "struct P { int x; double v[2]; };\n" \
+                 "void f(struct P p, char s[]) {\n" \
+                 "  int i;\n" \
+                 "  for (i = 0; i < 2; i = i + 1) p.v[i] = (double) -i * 2 + g(s, 'c');\n" \
+                 "  if (!p.x) return; else ;\n" \
+                 "}\n"
+        unit = analyze(tokenize(source))
+
+        int_type = Type(Code.INT, None, -1, 0)
+        p_v_i = Index(Field(Id("p", 0), "v", 0), Id("i", 0), 0)
+        cast = Cast(Type(Code.DOUBLE, None, -1, 0), Unary(Code.SUB, Id("i", 0), 0), 0)
+        value = Binary(Code.ADD, Binary(Code.MUL, cast, Constant(Code.CT_INT, 2, 0), 0),
+                       Call("g", [Id("s", 0), Constant(Code.CT_CHAR, "'c'", 0)], 0), 0)
+
+        assert unit == Unit([
+            StructDef("P", [VarDef(int_type, "x", 0), VarDef(Type(Code.DOUBLE, None, 2, 0), "v", 0)], 0),
+            FnDef(Type(Code.VOID, None, -1, 0), "f", [
+                VarDef(Type(Code.STRUCT, "P", -1, 0), "p", 0),
+                VarDef(Type(Code.CHAR, None, 0, 0), "s", 0),
+            ], CompoundStm([
+                VarDef(int_type, "i", 0),
+                ForStm(Assign(Id("i", 0), Constant(Code.CT_INT, 0, 0), 0),
+                       Binary(Code.LESS, Id("i", 0), Constant(Code.CT_INT, 2, 0), 0),
+                       Assign(Id("i", 0), Binary(Code.ADD, Id("i", 0), Constant(Code.CT_INT, 1, 0), 0), 0),
+                       ExprStm(Assign(p_v_i, value, 0), 0), 0),
+                IfStm(Unary(Code.NOT, Field(Id("p", 0), "x", 0), 0), ReturnStm(None, 0), ExprStm(None, 0), 0),
+            ], 0), 0),
+        ], 0)
+
+        # every node has the line it starts at
+        fn_def = unit.declarations[1]
+        assert [unit.line, fn_def.line, fn_def.body.line] == [1, 2, 2]
+        assert [item.line for item in fn_def.body.items] == [3, 4, 5]
+        assert fn_def.body.items[2].else_stm.line == 5
+
+        # the same tree from every cursor, in packrat mode too; only True when recognizing
+        assert analyze(tokenize_packed(source)) == unit
+        assert analyze(tokenize(source), packrat=True) == unit
+        assert analyze_iter(iter_tokens(source)) == unit
+        assert analyze(tokenize(source), recognize=True) is True
+
+    def test_analyze_recovering(self):
+        source = "struct S { int x; dbl y; };\n" \
+                 "int f(int a,) { return a; }\n" \
+                 "void g() {\n" \
+                 "  int i;\n" \
+                 "  i = ;\n" \
+                 "  if (i b) { i = 1; }\n" \
+                 "  for (;;) break\n" \
+                 "}\n" \
+                 "double h() { return 1.5; }\n"
+        unit, errors = analyze_recovering(tokenize(source))
+
+        # every error is reported, the first one is the one analyze() raises
+        assert [str(error) for error in errors] == [
+            "Syntax Error(s) detected at line: 1, token code Code.ID, token value: dbl, "
+            "no } after { in struct type definition",
+            "Syntax Error(s) detected at line: 2, token code Code.RPAR, no function parameter after comma",
+            "Syntax Error(s) detected at line: 5, token code Code.SEMICOLON, invalid expression after =",
+            "Syntax Error(s) detected at line: 6, token code Code.ID, token value: b, no ( after ) in if",
+            "Syntax Error(s) detected at line: 8, token code Code.RACC, no ; after break"]
+        with self.assertRaises(SyntaxErrorException) as context:
+            analyze(tokenize(source))
+        assert str(context.exception) == str(errors[0])
+
+        # the declarations and statements with errors are dropped, the analysis went on after them
+        assert [declaration.name for declaration in unit.declarations] == ["g", "h"]
+        assert unit.declarations[0].body.items == [VarDef(Type(Code.INT, None, -1, 0), "i", 0)]
+
+        # past max_errors, the analysis gives up
+        unit, errors = analyze_recovering(tokenize(source), max_errors=3)
+        assert unit is None and len(errors) == 3
+
+        # without errors, the result is the same as analyze()'s
+        assert analyze_recovering(tokenize_file("atomc/resources/test6.c")) == (
+            analyze(tokenize_file("atomc/resources/test6.c")), [])
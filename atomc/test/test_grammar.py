@@ -0,0 +1,45 @@
+from unittest import TestCase
+from atomc.lexer.token import Code
+from atomc.syntactic_analyzer.grammar import first_sets, follow_sets, nullable_rules, conflicts, ll1_table
+from atomc.syntactic_analyzer.parser_generator import ParserGenerator, generated_path
+
+
+class Test(TestCase):
+    def test_first_sets(self):
+        assert first_sets["typeBase"] == {Code.INT, Code.DOUBLE, Code.CHAR, Code.STRUCT}
+        assert first_sets["fnDef"] == first_sets["typeBase"] | {Code.VOID}
+        assert first_sets["expr"] == {Code.ID, Code.CT_INT, Code.CT_REAL, Code.CT_CHAR, Code.CT_STRING, Code.LPAR,
+                                      Code.SUB, Code.NOT}
+        assert first_sets["stm"] == first_sets["expr"] | {Code.LACC, Code.IF, Code.WHILE, Code.FOR, Code.BREAK,
+                                                          Code.RETURN, Code.SEMICOLON}
+
+    def test_follow_sets(self):
+        assert "exprAddAux" in nullable_rules and "exprAdd" not in nullable_rules
+        assert follow_sets["arrayDecl"] == {Code.SEMICOLON, Code.RPAR, Code.COMMA}
+        assert {Code.RPAR, Code.RBRACKET, Code.COMMA, Code.SEMICOLON} <= follow_sets["expr"]
+        assert Code.ASSIGN in follow_sets["exprUnary"] and Code.ASSIGN not in follow_sets["exprOr"]
+
+    def test_prediction_tables(self):
+        assert ll1_table("stm")[Code.WHILE] == 2
+        assert ll1_table("exprAddAux")[Code.RPAR] == 1
+
+        # the only rules which need more lookahead than one token
+        assert conflicts("exprCast") == {Code.LPAR: [0, 1]}
+        assert set(conflicts("exprAssign")) == first_sets["exprUnary"]
+
+        with self.assertRaises(ValueError):
+            ll1_table("exprCast")
+
+    def test_parser_generator(self):
+        generator = ParserGenerator()
+
+        # generated_parser.py was generated again after the last change of atomc.grammar
+        assert generator.generate() == open(generated_path).read()
+
+        assert generator.report() == [
+            "exprAssign: FIRST / FIRST conflict on CT_CHAR, CT_INT, CT_REAL, CT_STRING, ID, LPAR, NOT, SUB, "
+            "resolved by left-corner factoring on exprUnary",
+            "exprCast: FIRST / FIRST conflict on LPAR, resolved by 2 tokens of lookahead",
+            "stm: FIRST / FOLLOW conflict on ELSE, resolved by the longest match",
+            "unit: FIRST / FIRST conflict on CHAR, DOUBLE, INT, resolved by 3 tokens of lookahead",
+            "unit: FIRST / FIRST conflict on STRUCT, resolved by 4 tokens of lookahead"]
@@ -1,6 +1,11 @@
+import io
+import pathlib
 from unittest import TestCase
-from atomc.lexer.lexer import tokenize
-from atomc.lexer.token import Token
+from atomc.lexer.incremental_lexer import relex
+from atomc.lexer.lexer import tokenize, tokenize_packed, tokenize_parallel, tokenize_recovering, find_split_points
+from atomc.lexer.lexical_error_exception import LexicalErrorException, InvalidRealNumberException
+from atomc.lexer.symbol_pool import SymbolPool
+from atomc.lexer.token import Token, unset
 from atomc.lexer.token import Code
 
 
@@ -13,3 +18,103 @@ class Test(TestCase):
         file.close()
 
         assert tokens == actual_tokens
+
+    def test_tokenize_comment_at_eof(self):
+        tokens = tokenize(io.StringIO("a // comment without newline"))
+
+        assert tokens == [Token(Code.ID, "a", 1), Token(Code.END, None, 1)]
+
+    def test_tokenize_sources(self):
+        file = open("atomc/resources/test5.c")
+        tokens = tokenize(file)
+        file.close()
+
+        # a path, the source text, and raw bytes all give the same tokens as the file object
+        assert tokenize(pathlib.Path("atomc/resources/test5.c")) == tokens
+        assert tokenize(pathlib.Path("atomc/resources/test5.c").read_text()) == tokens
+        assert tokenize(pathlib.Path("atomc/resources/test5.c").read_bytes()) == tokens
+
+    def test_tokenize_packed(self):
+        tokens = tokenize(pathlib.Path("atomc/resources/test5.c"))
+        stream = tokenize_packed(pathlib.Path("atomc/resources/test5.c"))
+
+        assert len(stream) == len(tokens)
+        assert list(stream) == tokens
+
+    def test_lazy_values(self):
+        source = "abc 12 3.5 'c'"
+        tokens = tokenize(source)
+
+        # the tokens only know the span of their lexeme until the value is needed
+        assert [source[tk.start:tk.end] for tk in tokens] == ["abc", "12", "3.5", "'c'", ""]
+        assert tokens[1].value == 12 and tokens[2].value == 3.5
+
+        stream = tokenize_packed(source)
+        assert stream.values[1] is unset
+        assert stream.value(1) == 12 and stream.values[1] == 12
+
+    def test_symbol_pool(self):
+        pool = SymbolPool()
+        tokens = tokenize('int a; a = b + a; puts("a");', pool)
+
+        # every occurrence of a name carries the same symbol id, keywords and other tokens carry none
+        assert tokens[0].symbol is None
+        assert tokens[1].symbol == tokens[3].symbol == tokens[7].symbol != tokens[5].symbol
+        assert pool.text(tokens[1].symbol) == "a" and pool.text(tokens[11].symbol) == '"a"'
+
+        stream = tokenize_packed('int a; a = b + a; puts("a");', pool)
+        assert [stream.symbol(index) for index in range(len(stream))] == [tk.symbol for tk in tokens]
+
+    def test_relex(self):
+        source = pathlib.Path("atomc/resources/test3.c").read_text()
+
+        # an edit inside an identifier, a new line, an edit which opens a comment, one inside a string, a deletion
+        edits = [(10, 2, "xyz"), (40, 0, "\n\n"), (60, 1, "/*"), (source.index('"') + 1, 0, "s"), (20, 30, ""),
+                 (len(source), 0, " int x;")]
+        for offset, deleted, inserted in edits:
+            pool = SymbolPool()
+            old_tokens = tokenize(source, pool)
+            old_spans = [(tk.source, tk.start, tk.end, tk.line) for tk in old_tokens]
+            tokens, text = relex(old_tokens, source, offset, deleted, inserted, pool)
+
+            # the old tokens are still the tokens of the old source
+            assert [(tk.source, tk.start, tk.end, tk.line) for tk in old_tokens] == old_spans
+
+            assert text == source[:offset] + inserted + source[offset + deleted:]
+            expected = tokenize(text, SymbolPool())
+            assert tokens == expected
+            assert [(tk.start, tk.end) for tk in tokens] == [(tk.start, tk.end) for tk in expected]
+
+    def test_tokenize_parallel(self):
+        source = pathlib.Path("atomc/resources/test3.c").read_text() * 100
+
+        # small chunks, so the source really is split, also at lines with strings, chars and comments
+        assert len(find_split_points(source, 8, 256)) == 7
+
+        expected = tokenize(source)
+        tokens = tokenize_parallel(source, workers=8, min_chunk_size=256)
+
+        assert tokens == expected
+        assert [(tk.start, tk.end, tk.symbol) for tk in tokens] == [(tk.start, tk.end, tk.symbol) for tk in expected]
+
+    def test_tokenize_recovering(self):
+        tokens, errors = tokenize_recovering('int a = 1.x;\nb = 3e; $c = 2;\nputs("abc')
+
+        # every error is reported, and the lexer goes on after it
+        assert [(type(error), error.line, error.column) for error in errors] == [
+            (InvalidRealNumberException, 1, 11), (LexicalErrorException, 2, 7),
+            (LexicalErrorException, 2, 9), (LexicalErrorException, 3, 10)]
+        assert [tk.code for tk in tokens][-8:] == [Code.SEMICOLON, Code.ID, Code.ASSIGN, Code.CT_INT, Code.SEMICOLON,
+                                                   Code.ID, Code.LPAR, Code.END]
+
+        # without errors, the result is the same as tokenize()'s
+        assert tokenize_recovering("int a;") == (tokenize("int a;"), [])
+
+    def test_tokenize_runs(self):
+        name = "long_identifier_" * 50
+        tokens = tokenize("\n\n\t  %s = 1234567890;  // %s\n\"%s\n\"\n12.5e10 x" % (name, name, name))
+
+        # whole runs of identifier chars, digits, whitespace, comments and string chars are skipped at once
+        assert [(tk.code, tk.value, tk.line) for tk in tokens] == [
+            (Code.ID, name, 3), (Code.ASSIGN, None, 3), (Code.CT_INT, 1234567890, 3), (Code.SEMICOLON, None, 3),
+            (Code.CT_STRING, '"%s\n"' % name, 4), (Code.CT_REAL, 12.5e10, 5), (Code.ID, "x", 5), (Code.END, None, 5)]
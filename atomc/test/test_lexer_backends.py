@@ -0,0 +1,60 @@
+import contextlib
+import glob
+import io
+import random
+from unittest import TestCase, skipIf
+from atomc.lexer.lexer import tokenize, tokenize_packed
+from atomc.lexer.lexical_error_exception import LexicalErrorException
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# pieces of source the generated corpus is made of: valid tokens, the prefixes of the multi-char ones, and chars which
+# are lexical errors, so both backends are also compared on their errors
+pieces = ["a", "_b1", "while", "int", "1", "2.5", "3E-2", "1.", "1e", "1e+", ".5", '"s\n"', '"', "'c'", "'\n'", "'",
+          "''", " ", "\t", "\r", "\n", "//", "x\n", "/", "(", ")", "[", "]", "{", "}", ",", ";", "&&", "&", "||", "|",
+          "=", "==", "!", "!=", "<", "<=", ">", ">=", "+", "-", "*", "\0", "$", "é"]
+
+
+# the outcome of lexing source with a backend: the tokens with their spans and symbols, or the error, and the output
+def lex(source: str, backend: str, packed: bool = False):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            tokens = tokenize_packed(source, backend=backend) if packed else tokenize(source, backend=backend)
+            result = [(tk.code, tk.value, tk.line, tk.start, tk.end, tk.symbol) for tk in tokens]
+        except LexicalErrorException as exc:
+            result = type(exc)
+
+    return result, output.getvalue()
+
+
+# the sources both backends are compared on: the resources, and a generated corpus
+def corpus():
+    for path in sorted(glob.glob("atomc/resources/*.c")):
+        yield open(path).read()
+
+    generator = random.Random(12)
+    for _ in range(2000):
+        yield "".join(generator.choice(pieces) for _ in range(generator.randrange(1, 30)))
+
+
+class Test(TestCase):
+    def test_regex_backend(self):
+        for source in corpus():
+            assert lex(source, "regex") == lex(source, "automaton"), repr(source)
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_backend(self):
+        for source in corpus():
+            assert lex(source, "numpy", True) == lex(source, "automaton", True), repr(source)
+
+        # the numpy backend only builds TokenStreams
+        with self.assertRaises(ValueError):
+            tokenize("int a;", backend="numpy")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            tokenize("int a;", backend="lalr")
@@ -0,0 +1,76 @@
+import os
+import pathlib
+import tempfile
+from unittest import TestCase
+from atomc.lexer.lexer import tokenize
+from atomc.lexer.symbol_pool import SymbolPool
+from atomc.lexer.token_cache import TokenCache
+
+
+class Test(TestCase):
+    def test_token_cache(self):
+        source = pathlib.Path("atomc/resources/test3.c").read_text()
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TokenCache(directory)
+
+            # the first call lexes and stores the tokens, the second one loads them
+            for _ in range(2):
+                pool = SymbolPool()
+                stream = cache.tokenize(source, pool)
+
+                assert list(stream) == tokenize(source)
+                assert [stream.symbol(index) for index in range(len(stream))] == \
+                       [tk.symbol for tk in tokenize(source, SymbolPool())]
+                assert os.listdir(directory) == [os.path.basename(cache.path(source))]
+
+    def test_token_cache_directory(self):
+        source = pathlib.Path("atomc/resources/test3.c").read_text()
+
+        # without a directory, a file is cached next to it, wherever the cache is used from
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory, "test3.c")
+            path.write_text(source)
+            cache = TokenCache()
+
+            assert list(cache.tokenize(path)) == tokenize(source)
+            assert os.listdir(os.path.join(directory, "__atomccache__")) == \
+                   [os.path.basename(cache.path(source, directory))]
+
+    def test_token_cache_corrupt_file(self):
+        source = pathlib.Path("atomc/resources/test5.c").read_text()
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TokenCache(directory)
+            cache.tokenize(source)
+
+            # a truncated file, then a file with a flipped byte
+            path = cache.path(source)
+            data = pathlib.Path(path).read_bytes()
+            for corrupt in [data[:len(data) // 2], data[:-1] + bytes([data[-1] ^ 1])]:
+                pathlib.Path(path).write_bytes(corrupt)
+
+                assert list(cache.tokenize(source)) == tokenize(source)
+                assert pathlib.Path(path).read_bytes() == data
+
+    def test_token_cache_eviction(self):
+        sources = ["int a%d;" % index for index in range(5)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TokenCache(directory)
+            cache.tokenize(sources[0])
+
+            # room for three files, all of the same size
+            cache.max_size = 3 * os.path.getsize(cache.path(sources[0]))
+
+            # the files get increasing use times, the 4th one evicts the 1st
+            for index, source in enumerate(sources[:4]):
+                cache.tokenize(source)
+                os.utime(cache.path(source), (index, index))
+
+            # a hit makes the 2nd one the most recently used, so the 5th one evicts the 3rd
+            cache.tokenize(sources[1])
+            cache.tokenize(sources[4])
+
+            assert sorted(os.listdir(directory)) == sorted(os.path.basename(cache.path(sources[index]))
+                                                           for index in [1, 3, 4])
@@ -0,0 +1,66 @@
+import glob
+import io
+import os
+import threading
+from unittest import TestCase
+from atomc.lexer.lexer import tokenize, tokenize_packed
+from atomc.lexer.symbol_pool import SymbolPool
+from atomc.lexer.token import Token, Code
+from atomc.lexer.token_format import dump_tokens, load_tokens, TokenWriter, TokenReader
+
+
+class Test(TestCase):
+    def test_dump_load_tokens(self):
+        for path in sorted(glob.glob("atomc/resources/*.c")):
+            tokens = tokenize(open(path).read())
+
+            file = io.BytesIO()
+            dump_tokens(tokens, file, block_size=16)
+            file.seek(0)
+
+            assert load_tokens(file) == tokens
+
+        # a TokenStream can be dumped too, and the values keep their types
+        tokens = [Token(Code.CT_INT, 1 << 80, 1), Token(Code.CT_INT, -5, 1), Token(Code.CT_REAL, 0.1, 2),
+                  Token(Code.CT_CHAR, "'é'", 2), Token(Code.END, None, 3)]
+        for source in [tokenize_packed("int x = 12; double d = 1.5e3; puts(\"x\");"), tokens]:
+            file = io.BytesIO()
+            dump_tokens(source, file)
+            file.seek(0)
+
+            loaded = load_tokens(file)
+            assert loaded == list(source)
+            assert [type(tk.value) for tk in loaded] == [type(tk.value) for tk in source]
+
+    def test_token_stream_pipe(self):
+        source = open("atomc/resources/test6.c").read() * 20
+        tokens = tokenize(source)
+        read_end, write_end = os.pipe()
+
+        # the lexing stage writes the tokens to the pipe while the next stage reads them
+        def write_tokens():
+            with os.fdopen(write_end, "wb") as file:
+                writer = TokenWriter(file, block_size=64)
+                for token in tokens:
+                    writer.write(token)
+                writer.close()
+
+        writer_thread = threading.Thread(target=write_tokens)
+        writer_thread.start()
+
+        pool = SymbolPool()
+        with os.fdopen(read_end, "rb") as file:
+            loaded = list(TokenReader(file, pool))
+        writer_thread.join()
+
+        assert loaded == tokens
+        assert [tk.symbol for tk in loaded] == [tk.symbol for tk in tokenize(source, SymbolPool())]
+
+    def test_load_tokens_invalid(self):
+        with self.assertRaises(ValueError):
+            load_tokens(io.BytesIO(b"not tokens"))
+
+        file = io.BytesIO()
+        dump_tokens(tokenize("int a;"), file)
+        with self.assertRaises(ValueError):
+            load_tokens(io.BytesIO(file.getvalue()[:-4]))